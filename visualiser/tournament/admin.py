@@ -16,13 +16,14 @@
 
 from django.contrib import admin
 from django.db.models import Q
+from django.utils.translation import gettext as _
 
 from tournament.diplomacy import GameSet, GreatPower, SetPower, SupplyCentre
 from tournament.models import (Award, CentreCount, DBNCoverage, DrawProposal,
                                Game, GameImage, GamePlayer, Pool, Round,
                                RoundPlayer, SeederBias, Series,
                                SupplyCentreOwnership, Team, Tournament,
-                               TournamentPlayer)
+                               TournamentPlayer, update_scores_for_games)
 from tournament.players import (Player, PlayerAward, PlayerGameResult,
                                 PlayerRanking, PlayerTitle,
                                 PlayerTournamentRanking, WDDPlayer)
@@ -161,6 +162,12 @@ class GameAdmin(TournamentPermissionAdminMixin, admin.ModelAdmin):
     list_filter = ['the_round__tournament', 'name', 'is_finished']
     tournament_attr = 'the_round.tournament'
     ordering = ['the_round__tournament', 'name']
+    actions = ['rescore']
+
+    @admin.action(description=_('Recalculate scores for selected games'))
+    def rescore(self, request, queryset):
+        """Rescore the Games, then their Rounds and Tournaments just once each"""
+        update_scores_for_games(queryset.select_related('the_round__tournament', 'pool'))
 
 
 @admin.register(GameImage)
@@ -326,10 +333,17 @@ class TournamentAdmin(TournamentPermissionAdminMixin, admin.ModelAdmin):
               ('wdd_tournament_id', 'wdr_tournament_id'),
               'awards')
     ordering = ['-start_date']
+    actions = ['rescore']
 
     def get_tournament_for_permission(self, obj):
         return obj
 
+    @admin.action(description=_('Recalculate all scores for selected tournaments'))
+    def rescore(self, request, queryset):
+        """Rescore each Tournament in a single pass"""
+        for t in queryset:
+            t.rescore()
+
     def get_queryset(self, request):
         """Tournament IS the tournament — filter directly on its own fields."""
         qs = admin.ModelAdmin.get_queryset(self, request)
@@ -0,0 +1,109 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Solve the assignment problem - e.g. which player should play which power.
+"""
+
+import random
+
+
+def _hungarian(costs, num_cols):
+    """
+    Hungarian algorithm with potentials, O(rows^2 * cols).
+
+    costs is a list of rows, each a list of num_cols costs.
+    There must be no more rows than columns.
+    Returns a list with the column assigned to each row.
+    """
+    num_rows = len(costs)
+    inf = float('inf')
+    # Potentials for rows and columns, and the row assigned to each column.
+    # All are 1-based, with index 0 used as a sentinel
+    u = [0] * (num_rows + 1)
+    v = [0] * (num_cols + 1)
+    col_to_row = [0] * (num_cols + 1)
+    way = [0] * (num_cols + 1)
+    for row in range(1, num_rows + 1):
+        col_to_row[0] = row
+        col0 = 0
+        min_v = [inf] * (num_cols + 1)
+        used = [False] * (num_cols + 1)
+        while True:
+            used[col0] = True
+            row0 = col_to_row[col0]
+            row_costs = costs[row0 - 1]
+            delta = inf
+            col1 = 0
+            for col in range(1, num_cols + 1):
+                if used[col]:
+                    continue
+                cur = row_costs[col - 1] - u[row0] - v[col]
+                if cur < min_v[col]:
+                    min_v[col] = cur
+                    way[col] = col0
+                if min_v[col] < delta:
+                    delta = min_v[col]
+                    col1 = col
+            for col in range(num_cols + 1):
+                if used[col]:
+                    u[col_to_row[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_v[col] -= delta
+            col0 = col1
+            if col_to_row[col0] == 0:
+                break
+        # Follow the augmenting path back
+        while col0:
+            col1 = way[col0]
+            col_to_row[col0] = col_to_row[col1]
+            col0 = col1
+    result = [None] * num_rows
+    for col in range(1, num_cols + 1):
+        if col_to_row[col]:
+            result[col_to_row[col] - 1] = col - 1
+    return result
+
+
+def min_cost_assignment(costs, rng=random):
+    """
+    Find an assignment of rows to distinct columns with the lowest total cost.
+
+    costs is a list of rows, each a list of the cost of assigning that row to
+    each column. Every row must be the same length, and there must be no more
+    rows than columns.
+    If several assignments have the lowest cost, one is picked at random,
+    using rng.
+    Returns a list with the index of the column assigned to each row.
+    Raises ValueError if there are more rows than columns.
+    """
+    num_rows = len(costs)
+    if num_rows == 0:
+        return []
+    num_cols = len(costs[0])
+    if num_rows > num_cols:
+        raise ValueError(f'Cannot assign {num_rows} rows to {num_cols} columns')
+    # Shuffle the rows and columns so that ties are broken randomly
+    row_order = list(range(num_rows))
+    rng.shuffle(row_order)
+    col_order = list(range(num_cols))
+    rng.shuffle(col_order)
+    shuffled = [[costs[r][c] for c in col_order] for r in row_order]
+    result = [None] * num_rows
+    for r, c in zip(row_order, _hungarian(shuffled, num_cols)):
+        result[r] = col_order[c]
+    return result
@@ -22,14 +22,19 @@ from urllib.parse import urlunparse
 
 import matplotlib.pyplot as plt
 
+from django.core.cache import cache
 from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
 
 from tournament import backstabbr
 from tournament.forms import BackstabbrUrlForm
 
+# How long to keep graphs of backstabbr games, in seconds.
+# We can't tell when a game changes without reading it, so this is short
+GRAPH_CACHE_TIME = 60
 
 _power_to_fg = {
     'Austria': 'red',
@@ -81,12 +86,8 @@ def _dots(game):
     return retval
 
 
-def graph(request, game_type, game_number):
-    """
-    Just an SC graph for the specified game, as a PNG image
-
-    game_type should be either 'game' or 'sandbox'
-    """
+def _render_graph(game_type, game_number):
+    """Read the specified backstabbr game and draw its SC graph. Returns PNG data"""
     game_path = f'{game_type}/{game_number}'
     url = urlunparse(('https', backstabbr.BACKSTABBR_NETLOC, game_path, '', '', ''))
     try:
@@ -97,7 +98,7 @@ def graph(request, game_type, game_number):
     # Read the game history
     dots = _dots(g)
 
-    # TODO lots of overlap here with game_views.graph()
+    # TODO lots of overlap here with graphs.render_game_graph()
     with io.BytesIO() as f:
         # plot the SC counts
         fig, ax = plt.subplots()
@@ -113,9 +114,21 @@ def graph(request, game_type, game_number):
         ax.legend(loc='upper left')
         fig.suptitle(g.name)
         fig.savefig(f, format='png')
-        graphic = f.getvalue()
-    response = HttpResponse(graphic, content_type="image/png")
-    return response
+        return f.getvalue()
+
+
+def graph(request, game_type, game_number):
+    """
+    Just an SC graph for the specified game, as a PNG image
+
+    game_type should be either 'game' or 'sandbox'
+    """
+    key = f'graph-backstabbr-{game_type}-{game_number}-{get_language()}'
+    graphic = cache.get(key)
+    if graphic is None:
+        graphic = _render_graph(game_type, game_number)
+        cache.set(key, graphic, GRAPH_CACHE_TIME)
+    return HttpResponse(graphic, content_type="image/png")
 
 
 def game_sc_graph(request, game_number, sandbox):
@@ -0,0 +1,131 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Supply centre history of a Game, read from the database in bulk.
+"""
+
+from tournament.diplomacy import TOTAL_SCS, reference_data
+
+
+class BoardHistory:
+    """
+    The supply centre counts and ownerships of a single Game, for every year.
+
+    All the CentreCounts for the Game are read with one query when the
+    object is created, and all the SupplyCentreOwnerships with one more
+    query when they are first needed. They are held in dense grids, one
+    list per year, with an entry for every GreatPower or SupplyCentre
+    (None where there is no data), so pages that show the history of a
+    Game don't need a query per year, power or centre.
+    """
+
+    def __init__(self, game, powers=None, centres=None):
+        """
+        Read the CentreCounts for the Game.
+
+        powers and centres are optional lists of the GreatPowers and
+        SupplyCentres, defaulting to all of them. Rows follow their order.
+        Counts and ownerships for any powers not in powers are ignored.
+        """
+        self.game = game
+        if powers is None:
+            powers = list(reference_data.great_powers())
+        self.powers = powers
+        self._centres = centres
+        self._power_index = {p.pk: n for n, p in enumerate(powers)}
+        # Dict, keyed by year, of lists of centre counts in self.powers order
+        self._counts = {}
+        for year, power_id, count in game.centrecount_set.order_by().values_list('year', 'power_id', 'count'):
+            row = self._counts.setdefault(year, [None] * len(powers))
+            if power_id in self._power_index:
+                row[self._power_index[power_id]] = count
+        self._owners = None
+
+    @property
+    def centres(self):
+        """All the SupplyCentres, in the order of the ownership rows"""
+        if self._centres is None:
+            self._centres = list(reference_data.supply_centres())
+        return self._centres
+
+    def _read_ownerships(self):
+        """Read all the SupplyCentreOwnerships for the Game, if not already done"""
+        if self._owners is not None:
+            return
+        centre_index = {sc.pk: n for n, sc in enumerate(self.centres)}
+        # Dict, keyed by year, of lists of owning GreatPowers in self.centres order
+        self._owners = {}
+        for year, sc_id, owner_id in self.game.supplycentreownership_set.order_by().values_list('year',
+                                                                                                 'sc_id',
+                                                                                                 'owner_id'):
+            row = self._owners.setdefault(year, [None] * len(self.centres))
+            if owner_id in self._power_index:
+                row[centre_index[sc_id]] = self.powers[self._power_index[owner_id]]
+
+    def years(self):
+        """Sorted list of the years with any CentreCounts"""
+        return sorted(self._counts.keys())
+
+    def final_year(self):
+        """The last year with any CentreCounts, or None"""
+        return max(self._counts.keys(), default=None)
+
+    def counts(self, year):
+        """
+        List of the centre counts for the year, in self.powers order.
+
+        Entries are None for powers with no CentreCount.
+        """
+        return self._counts.get(year, [None] * len(self.powers))
+
+    def count(self, power, year):
+        """The centre count for the power in the year, or None"""
+        return self.counts(year)[self._power_index[power.pk]]
+
+    def neutrals(self, year):
+        """How many centres were neutral in the year? None if there are no CentreCounts for the year"""
+        if year not in self._counts:
+            return None
+        return TOTAL_SCS - sum(c for c in self._counts[year] if c is not None)
+
+    def ownership_years(self):
+        """Sorted list of the years with any SupplyCentreOwnerships"""
+        self._read_ownerships()
+        return sorted(self._owners.keys())
+
+    def has_ownerships(self, year):
+        """Are there any SupplyCentreOwnerships for the year?"""
+        self._read_ownerships()
+        return year in self._owners
+
+    def owners(self, year):
+        """
+        List of the owners of the centres in the year, in self.centres order.
+
+        Entries are None for centres with no SupplyCentreOwnership,
+        which usually means that they were neutral.
+        """
+        self._read_ownerships()
+        return self._owners.get(year, [None] * len(self.centres))
+
+    def owned_counts(self, year):
+        """List of the numbers of centres owned in the year, in self.powers order"""
+        result = [0] * len(self.powers)
+        for owner in self.owners(year):
+            if owner is not None:
+                result[self._power_index[owner.pk]] += 1
+        return result
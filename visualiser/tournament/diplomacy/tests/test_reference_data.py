@@ -0,0 +1,128 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from django.db import transaction
+from django.test import TestCase
+
+from ..models.game_set import GameSet
+from ..models.great_power import GreatPower
+from ..models.set_power import SetPower
+from ..models.supply_centre import SupplyCentre
+from ..utils import reference_data
+
+
+class ReferenceDataTests(TestCase):
+    fixtures = ['game_sets.json']
+
+    def test_great_powers(self):
+        self.assertEqual(list(reference_data.great_powers()), list(GreatPower.objects.all()))
+
+    def test_great_power_lookups(self):
+        austria = GreatPower.objects.get(abbreviation='A')
+        self.assertEqual(reference_data.great_power(pk=austria.pk), austria)
+        self.assertEqual(reference_data.great_power(abbreviation='A'), austria)
+        self.assertEqual(reference_data.great_power(abbreviation='a'), austria)
+        self.assertEqual(reference_data.great_power(name='Austria-Hungary'), austria)
+
+    def test_great_power_missing(self):
+        self.assertRaises(GreatPower.DoesNotExist, reference_data.great_power, name='Austria')
+
+    def test_great_power_bad_args(self):
+        self.assertRaises(TypeError, reference_data.great_power)
+        self.assertRaises(TypeError, reference_data.great_power, name='England', abbreviation='E')
+        self.assertRaises(TypeError, reference_data.great_power, colour='blue')
+
+    def test_supply_centres(self):
+        self.assertEqual(list(reference_data.supply_centres()), list(SupplyCentre.objects.all()))
+
+    def test_supply_centre_lookups(self):
+        stp = SupplyCentre.objects.get(name='St.Petersburg')
+        self.assertEqual(reference_data.supply_centre(pk=stp.pk), stp)
+        self.assertEqual(reference_data.supply_centre(abbreviation=stp.abbreviation.lower()), stp)
+        self.assertEqual(reference_data.supply_centre(name='St.Petersburg'), stp)
+        self.assertRaises(SupplyCentre.DoesNotExist, reference_data.supply_centre, abbreviation='XXX')
+
+    def test_initial_centres(self):
+        for power in reference_data.great_powers():
+            self.assertEqual(list(reference_data.initial_centres(power)),
+                             list(SupplyCentre.objects.filter(initial_owner=power)))
+            self.assertEqual(len(reference_data.initial_centres(power)), power.starting_centres)
+
+    def test_game_set_lookups(self):
+        gs = GameSet.objects.get(name='Avalon Hill')
+        self.assertEqual(reference_data.game_set(pk=gs.pk), gs)
+        self.assertEqual(reference_data.game_set(name='Avalon Hill'), gs)
+        self.assertRaises(GameSet.DoesNotExist, reference_data.game_set, name='Risk')
+
+    def test_set_powers(self):
+        gs = GameSet.objects.get(name='Avalon Hill')
+        expected = list(gs.setpower_set.order_by('power__name'))
+        self.assertEqual(reference_data.set_powers(gs), expected)
+        self.assertEqual(reference_data.set_powers(gs.pk), expected)
+        england = GreatPower.objects.get(abbreviation='E')
+        self.assertEqual(reference_data.set_power(gs, england), gs.setpower_set.get(power=england))
+
+    def test_set_power_missing(self):
+        gs = GameSet.objects.create(name='Empty')
+        self.assertEqual(reference_data.set_powers(gs), [])
+        self.assertRaises(SetPower.DoesNotExist,
+                          reference_data.set_power,
+                          gs,
+                          GreatPower.objects.get(abbreviation='E'))
+
+    def test_no_queries(self):
+        reference_data.great_powers()
+        gs = GameSet.objects.get(name='Avalon Hill')
+        with self.assertNumQueries(0):
+            reference_data.great_power(abbreviation='F')
+            reference_data.supply_centre(name='Paris')
+            for sp in reference_data.set_powers(gs):
+                str(sp)
+
+    def test_save_invalidates(self):
+        reference_data.great_powers()
+        gs = GameSet.objects.create(name='New Set')
+        self.assertEqual(reference_data.game_set(name='New Set'), gs)
+        sp = SetPower.objects.create(the_set=gs,
+                                     power=GreatPower.objects.get(abbreviation='G'),
+                                     colour='black')
+        self.assertEqual(reference_data.set_powers(gs), [sp])
+        sp.delete()
+        self.assertEqual(reference_data.set_powers(gs), [])
+
+    def test_rolled_back_data_not_used(self):
+        class RollBack(Exception):
+            pass
+
+        with self.assertRaises(RollBack):
+            with transaction.atomic():
+                GameSet.objects.create(name='Doomed Set')
+                reference_data.game_set(name='Doomed Set')
+                raise RollBack
+        self.assertRaises(GameSet.DoesNotExist, reference_data.game_set, name='Doomed Set')
+
+    def test_read_in_transaction_uses_cache(self):
+        reference_data.great_powers()
+        with transaction.atomic():
+            with self.assertNumQueries(0):
+                reference_data.great_power(abbreviation='F')
+
+    def test_commit_clears_cache(self):
+        reference_data.great_powers()
+        with self.captureOnCommitCallbacks(execute=True):
+            gs = GameSet.objects.create(name='Committed Set')
+        self.assertIsNone(reference_data._data)
+        self.assertEqual(reference_data.game_set(name='Committed Set'), gs)
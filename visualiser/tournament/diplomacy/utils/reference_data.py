@@ -0,0 +1,234 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Process-wide cache of the GreatPowers, SupplyCentres, GameSets and SetPowers.
+
+These come from fixtures and almost never change, but are needed on nearly
+every request. They are read from the database when first needed, and again
+after a change to any of them is committed.
+
+A transaction that has changed any of them reads its own copy, which is only
+used within that transaction, in case it is rolled back.
+"""
+
+import threading
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..models.game_set import GameSet
+from ..models.great_power import GreatPower
+from ..models.set_power import SetPower
+from ..models.supply_centre import SupplyCentre
+
+# The committed data, shared by all threads
+_data = None
+# Increased whenever _data is cleared
+_generation = 0
+_data_lock = threading.Lock()
+# Each thread's copy of the data seen by a transaction that has changed it
+_local = threading.local()
+
+
+class _ReferenceData:
+    """All the reference data, read from the database, with indexes for lookups"""
+
+    def __init__(self, changes=()):
+        # The uncommitted changes included in the data
+        self.changes = changes
+        self.powers = tuple(GreatPower.objects.all())
+        self.powers_by_id = {p.pk: p for p in self.powers}
+        self.powers_by_abbreviation = {p.abbreviation.upper(): p for p in self.powers}
+        self.powers_by_name = {p.name: p for p in self.powers}
+        self.centres = tuple(SupplyCentre.objects.all())
+        self.centres_by_id = {sc.pk: sc for sc in self.centres}
+        self.centres_by_abbreviation = {sc.abbreviation.upper(): sc for sc in self.centres}
+        self.centres_by_name = {sc.name: sc for sc in self.centres}
+        self.initial_centres = {p.pk: tuple(sc for sc in self.centres if sc.initial_owner_id == p.pk)
+                                for p in self.powers}
+        self.sets = tuple(GameSet.objects.order_by('pk'))
+        self.sets_by_id = {s.pk: s for s in self.sets}
+        self.sets_by_name = {s.name: s for s in self.sets}
+        # Dict, keyed by GameSet id, of lists of SetPowers in power order
+        self.set_powers = {s.pk: [] for s in self.sets}
+        for sp in SetPower.objects.order_by('power__name'):
+            # Share the cached objects, so following the relations doesn't need a query
+            sp.the_set = self.sets_by_id[sp.the_set_id]
+            sp.power = self.powers_by_id[sp.power_id]
+            self.set_powers[sp.the_set_id].append(sp)
+
+
+class _Change:
+    """
+    on_commit() callback for one change to the reference data.
+
+    Django discards it if the change is rolled back, so the ones still waiting
+    are the changes visible in the current transaction.
+    """
+
+    def __init__(self):
+        _local.changes = getattr(_local, 'changes', ()) + (self,)
+
+    def __call__(self):
+        _local.changes = tuple(c for c in getattr(_local, 'changes', ()) if c is not self)
+        _local.data = None
+        clear_reference_data()
+
+
+def _uncommitted_changes():
+    """Tuple of the _Changes made in the current transaction"""
+    changes = getattr(_local, 'changes', ())
+    if not changes:
+        # Nothing to look for
+        return ()
+    if connection.in_atomic_block:
+        waiting = {id(func) for _, func, _ in connection.run_on_commit}
+        changes = tuple(c for c in changes if id(c) in waiting)
+    else:
+        changes = ()
+    # Forget any that were rolled back
+    _local.changes = changes
+    return changes
+
+
+def _reference_data():
+    """Return the cached reference data, reading it if necessary"""
+    global _data
+    changes = _uncommitted_changes()
+    if changes:
+        # Only this transaction can see its changes
+        data = getattr(_local, 'data', None)
+        if (data is None) or (data.changes != changes):
+            data = _local.data = _ReferenceData(changes)
+        return data
+    data = _data
+    if data is None:
+        generation = _generation
+        data = _ReferenceData()
+        with _data_lock:
+            # Don't keep it if a change was committed while it was being read
+            if generation == _generation:
+                _data = data
+    return data
+
+
+@receiver(post_save, sender=GreatPower)
+@receiver(post_save, sender=SupplyCentre)
+@receiver(post_save, sender=GameSet)
+@receiver(post_save, sender=SetPower)
+@receiver(post_delete, sender=GreatPower)
+@receiver(post_delete, sender=SupplyCentre)
+@receiver(post_delete, sender=GameSet)
+@receiver(post_delete, sender=SetPower)
+def _reference_data_changed(**kwargs):
+    """Read the data again once the change is committed"""
+    transaction.on_commit(_Change())
+
+
+def clear_reference_data():
+    """Forget all the cached committed reference data"""
+    global _data, _generation
+    with _data_lock:
+        _data = None
+        _generation += 1
+
+
+def _lookup(model, indexes, **kwargs):
+    """Find an object by exactly one of the keys in indexes, or raise model.DoesNotExist"""
+    if (len(kwargs) != 1) or not set(kwargs).issubset(indexes):
+        raise TypeError('Exactly one of %s must be specified' % ', '.join(indexes))
+    key, value = kwargs.popitem()
+    try:
+        return indexes[key](value)
+    except KeyError as e:
+        raise model.DoesNotExist(f'{model.__name__} with {key} {value}') from e
+
+
+def great_powers():
+    """Tuple of all the GreatPowers, in name order"""
+    return _reference_data().powers
+
+
+def great_power(**kwargs):
+    """
+    Return the GreatPower with the specified pk, abbreviation or name.
+
+    Abbreviations are not case-sensitive.
+    Raises GreatPower.DoesNotExist if there is no such GreatPower.
+    """
+    data = _reference_data()
+    return _lookup(GreatPower,
+                   {'pk': lambda v: data.powers_by_id[v],
+                    'abbreviation': lambda v: data.powers_by_abbreviation[v.upper()],
+                    'name': lambda v: data.powers_by_name[v]},
+                   **kwargs)
+
+
+def supply_centres():
+    """Tuple of all the SupplyCentres, in name order"""
+    return _reference_data().centres
+
+
+def supply_centre(**kwargs):
+    """
+    Return the SupplyCentre with the specified pk, abbreviation or name.
+
+    Abbreviations are not case-sensitive.
+    Raises SupplyCentre.DoesNotExist if there is no such SupplyCentre.
+    """
+    data = _reference_data()
+    return _lookup(SupplyCentre,
+                   {'pk': lambda v: data.centres_by_id[v],
+                    'abbreviation': lambda v: data.centres_by_abbreviation[v.upper()],
+                    'name': lambda v: data.centres_by_name[v]},
+                   **kwargs)
+
+
+def initial_centres(power):
+    """Tuple of the SupplyCentres that the GreatPower starts the game owning"""
+    return _reference_data().initial_centres.get(power.pk, ())
+
+
+def game_set(**kwargs):
+    """
+    Return the GameSet with the specified pk or name.
+
+    Raises GameSet.DoesNotExist if there is no such GameSet.
+    """
+    data = _reference_data()
+    return _lookup(GameSet,
+                   {'pk': lambda v: data.sets_by_id[v],
+                    'name': lambda v: data.sets_by_name[v]},
+                   **kwargs)
+
+
+def set_powers(the_set):
+    """List of the SetPowers of the GameSet (or GameSet pk), in power name order"""
+    return list(_reference_data().set_powers.get(getattr(the_set, 'pk', the_set), []))
+
+
+def set_power(the_set, power):
+    """
+    Return the SetPower for the GreatPower in the GameSet (or GameSet pk).
+
+    Raises SetPower.DoesNotExist if the GameSet doesn't include the GreatPower.
+    """
+    for sp in _reference_data().set_powers.get(getattr(the_set, 'pk', the_set), []):
+        if sp.power_id == power.pk:
+            return sp
+    raise SetPower.DoesNotExist(f'{power} in GameSet {the_set}')
@@ -1,4 +1,5 @@
 from .g_scoring_systems import G_SCORING_SYSTEMS
+from .game_batch import GameBatch
 from .game_scoring_system import GameScoringSystem
 from .game_state import DotCountUnknown, GameState, InvalidYear
 from .simple_game_state import InvalidState, SimpleGameState
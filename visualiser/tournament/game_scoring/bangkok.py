@@ -17,6 +17,8 @@
 """
 This module contains a class that implements the Bangkok scoring system.
 """
+import numpy as np
+
 from django.utils.translation import gettext as _
 
 from tournament.diplomacy import FIRST_YEAR
@@ -113,3 +115,24 @@ class GScoringBangkok(GameScoringSystem):
             for p in all_powers:
                 retval[p] += 12 * shares[p] / total_shares
         return retval
+
+    def batch_scores(self, batch):
+        """
+        Return an array, of shape (games, powers), of scores.
+        """
+        dots = batch.final_counts
+        leader_scs = dots.max(axis=1, keepdims=True)
+        # Shares for domination bonus
+        shares = np.select([dots == leader_scs, dots == leader_scs - 1, dots == leader_scs - 2],
+                           [self.top_shares, self.one_away_shares, self.two_away_shares],
+                           0)
+        retval = np.where(dots == 0,
+                          dots + 0.3 * (batch.elimination_years - FIRST_YEAR),
+                          dots + 3)
+        # Now add in the domination bonus
+        retval = retval + 12 * shares / shares.sum(axis=1, keepdims=True)
+        # In a solo, everyone else gets points per centre
+        soloed = batch.soloers >= 0
+        retval[soloed] = self.loser_points_per_dot * dots[soloed]
+        retval[soloed, batch.soloers[soloed]] = self.soloer_points
+        return self._score_incomplete_games(batch, retval)
@@ -19,10 +19,13 @@ This module contains a class that implements the Carnage scoring systems.
 """
 from operator import itemgetter
 
+import numpy as np
+
 from django.utils.translation import gettext as _
 
 from tournament.diplomacy import TOTAL_SCS
 
+from .game_batch import rank_points
 from .game_scoring_system import GameScoringSystem
 from .utils import _adjust_rank_score, _sorted_scores
 
@@ -142,3 +145,31 @@ class GScoringCarnage(GameScoringSystem):
         for i, (p, c) in enumerate(dummys):
             retval[p] = rank_pts[i]
         return _sorted_scores(retval, state)
+
+    def batch_scores(self, batch):
+        """
+        Return an array, of shape (games, powers), of scores.
+        """
+        dots = batch.final_counts
+        if self.dead_equal:
+            retval = dots + rank_points(dots, self.position_pts)
+        else:
+            alive = dots > 0
+            # Alive powers are ranked by centre count
+            retval = self.points_per_dot * dots + rank_points(dots, self.position_pts, mask=alive)
+            # Give the leader additional points per centre ahead
+            sorted_dots = np.sort(np.where(alive, dots, 0), axis=1)
+            lead = sorted_dots[:, -1] - sorted_dots[:, -2]
+            leader = dots.argmax(axis=1)
+            retval[np.arange(batch.num_games), leader] += lead * self.pts_per_dot_lead
+            # Dead powers are ranked by when they were eliminated, after all the live powers
+            dead_pts = rank_points(batch.elimination_years,
+                                   self.position_pts,
+                                   mask=~alive,
+                                   offset=alive.sum(axis=1))
+            retval = np.where(alive, retval, dead_pts)
+        # Solos are special
+        soloed = batch.soloers >= 0
+        retval[soloed] = self.loss_pts
+        retval[soloed, batch.soloers[soloed]] = self.solo_pts
+        return self._score_incomplete_games(batch, retval)
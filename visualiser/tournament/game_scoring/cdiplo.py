@@ -19,10 +19,13 @@ This module contains a class that implements the C-Diplo scoring systems.
 """
 from operator import itemgetter
 
+import numpy as np
+
 from django.utils.translation import gettext as _
 
 from tournament.diplomacy import WINNING_SCS
 
+from .game_batch import rank_points
 from .game_scoring_system import GameScoringSystem
 from .utils import _adjust_rank_score, _sorted_scores
 
@@ -91,3 +94,15 @@ class GScoringCDiplo(GameScoringSystem):
             else:
                 retval[p] = self.played_pts + c + rank_pts[i]
         return _sorted_scores(retval, state)
+
+    def batch_scores(self, batch):
+        """
+        Return an array, of shape (games, powers), of scores.
+        """
+        dots = batch.final_counts
+        retval = self.played_pts + dots + rank_points(dots, self.position_pts)
+        # Note that a concession doesn't count as a solo here
+        soloed = dots.max(axis=1) >= WINNING_SCS
+        retval[soloed] = self.loss_pts
+        retval[soloed[:, np.newaxis] & (dots >= WINNING_SCS)] = self.soloer_pts
+        return self._score_incomplete_games(batch, retval)
@@ -0,0 +1,239 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module contains the GameBatch class, used to score many games at once.
+"""
+
+import numpy as np
+
+from tournament.diplomacy import FIRST_YEAR, WINNING_SCS
+
+from .game_state import DotCountUnknown, GameState, InvalidYear
+
+# Value in GameBatch.sc_counts for a count that isn't known
+UNKNOWN = -1
+
+
+class GameBatch:
+    """
+    A number of games, for scoring together.
+
+    The supply centre counts for all the games are held in a single array,
+    of shape (games, years, powers), so that scoring systems can score
+    every game at once with array operations.
+    """
+
+    def __init__(self, powers, sc_counts, first_year=FIRST_YEAR - 1, final_years=None, draws=None):
+        """
+        Create a GameBatch from an array of supply centre counts.
+
+        powers should be a list of the powers, in the order of the last axis of sc_counts.
+        sc_counts should be an array of ints, of shape (games, years, powers),
+        with UNKNOWN for any count that isn't known.
+        first_year is the year corresponding to the first entry of the years axis.
+        final_years is an optional sequence of the final year of each game.
+        By default, the last year with any known counts is used.
+        draws is an optional sequence, with one entry per game, of either None or
+        a 2-tuple of year and list of powers for a passed draw vote or concession.
+        """
+        self.powers = list(powers)
+        self.sc_counts = np.asarray(sc_counts, dtype=int)
+        self.first_year = first_year
+        num_games, num_years, _ = self.sc_counts.shape
+        games = np.arange(num_games)
+        if final_years is None:
+            known = (self.sc_counts != UNKNOWN).any(axis=2)
+            final_years = first_year + num_years - 1 - known[:, ::-1].argmax(axis=1)
+        self.final_years = np.asarray(final_years, dtype=int)
+        # Array of shape (games, powers)
+        self.final_counts = self.sc_counts[games, self.final_years - first_year]
+        # Games where not all the final counts are known.
+        # These can't be scored from the arrays, so are scored one at a time
+        self.incomplete = (self.final_counts == UNKNOWN).any(axis=1)
+        # Year each power was eliminated, or zero if it is still alive
+        years = first_year + np.arange(num_years)
+        zero = (self.sc_counts == 0) & (years[np.newaxis, :, np.newaxis] <= self.final_years[:, np.newaxis, np.newaxis])
+        self.elimination_years = np.where(zero.any(axis=1), first_year + zero.argmax(axis=1), 0)
+        if draws is None:
+            draws = [None] * num_games
+        self.draws = list(draws)
+        # Index of the power that soloed or was conceded to, or -1
+        top = self.final_counts.argmax(axis=1)
+        soloed = self.final_counts[games, top] >= WINNING_SCS
+        self.soloers = np.where(soloed, top, -1)
+        # Year of the solo or concession, or zero
+        self.solo_years = np.where(soloed, self.final_years, 0)
+        for g, draw in enumerate(self.draws):
+            if (draw is None) or soloed[g]:
+                continue
+            year, draw_powers = draw
+            if len(draw_powers) == 1:
+                self.soloers[g] = self.powers.index(draw_powers[0])
+                self.solo_years[g] = year
+        self._states = None
+
+    @classmethod
+    def from_states(cls, states):
+        """
+        Create a GameBatch from a sequence of GameState objects.
+
+        The GameStates themselves are used to score games with systems that
+        can't score a whole batch at once, and to determine solos.
+        """
+        states = list(states)
+        powers = list(states[0].all_powers())
+        first_year = FIRST_YEAR - 1
+        final_years = [s.last_full_year() for s in states]
+        counts = np.full((len(states), max(final_years) - first_year + 1, len(powers)), UNKNOWN)
+        for g, s in enumerate(states):
+            for year in range(first_year, final_years[g] + 1):
+                for i, p in enumerate(powers):
+                    try:
+                        counts[g, year - first_year, i] = s.dot_count(p, year)
+                    except (DotCountUnknown, InvalidYear):
+                        pass
+            # Not every GameState knows the counts for every year
+            for i, p in enumerate(powers):
+                if counts[g, final_years[g] - first_year, i] == 0:
+                    year = s.year_eliminated(p)
+                    if year is not None:
+                        counts[g, year - first_year, i] = 0
+        batch = cls(powers, counts, first_year, final_years)
+        for g, s in enumerate(states):
+            soloer = s.soloer()
+            batch.soloers[g] = -1 if soloer is None else powers.index(soloer)
+            solo_year = s.solo_year()
+            batch.solo_years[g] = 0 if solo_year is None else solo_year
+        batch._states = states
+        return batch
+
+    @property
+    def num_games(self):
+        """Number of games in the batch"""
+        return len(self.final_years)
+
+    def state(self, game):
+        """Returns a GameState for the specified game (an index into the batch)."""
+        if self._states is not None:
+            return self._states[game]
+        return _BatchGameState(self, game)
+
+    def score_dicts(self, scores):
+        """
+        Convert an array of scores, of shape (games, powers), to dicts.
+
+        Returns a list, with one entry per game, of dicts, indexed by power, of scores.
+        """
+        return [dict(zip(self.powers, row)) for row in np.asarray(scores).tolist()]
+
+
+class _BatchGameState(GameState):
+    """
+    A single game of a GameBatch.
+    """
+
+    def __init__(self, batch, game):
+        self.batch = batch
+        self.game = game
+        self.final_year = int(batch.final_years[game])
+        self.final_counts = batch.final_counts[game].tolist()
+
+    def all_powers(self):
+        return self.batch.powers
+
+    def soloer(self):
+        soloer = self.batch.soloers[self.game]
+        if soloer < 0:
+            return None
+        return self.batch.powers[soloer]
+
+    def survivors(self):
+        return [p for p, c in zip(self.batch.powers, self.final_counts) if c > 0]
+
+    def powers_in_draw(self):
+        draw = self.batch.draws[self.game]
+        if draw is not None:
+            return draw[1]
+        return self.survivors()
+
+    def solo_year(self):
+        solo_year = int(self.batch.solo_years[self.game])
+        return solo_year or None
+
+    def num_powers_with(self, centres):
+        return self.final_counts.count(centres)
+
+    def highest_dot_count(self):
+        return max(self.final_counts)
+
+    def dot_count(self, power, year=None):
+        i = self.batch.powers.index(power)
+        if year is None:
+            if self.final_counts[i] == UNKNOWN:
+                raise DotCountUnknown(f'{power} in {self.final_year}')
+            return self.final_counts[i]
+        if (year < self.batch.first_year) or (year > self.final_year):
+            raise InvalidYear(year)
+        count = int(self.batch.sc_counts[self.game, year - self.batch.first_year, i])
+        if count == UNKNOWN:
+            raise DotCountUnknown(f'{power} in {year}')
+        return count
+
+    def year_eliminated(self, power):
+        year = int(self.batch.elimination_years[self.game, self.batch.powers.index(power)])
+        return year or None
+
+    def last_full_year(self):
+        return self.final_year
+
+
+def rank_points(values, position_points, mask=None, offset=None):
+    """
+    Allocate points for rank, for a number of games at once.
+
+    values is an array of shape (games, powers). Higher values rank higher.
+    position_points is a list of points for each position, from first place to last.
+    mask is an optional boolean array of shape (games, powers).
+    If provided, only those powers are ranked (among themselves) and the others get zero.
+    offset is an optional array of shape (games,) of the position of the first
+    ranked power in each game.
+    Powers with equal values share the points for their positions evenly,
+    as with utils._adjust_rank_score().
+    Returns an array of shape (games, powers) of points.
+    """
+    values = np.asarray(values)
+    num_games, num_powers = values.shape
+    if mask is None:
+        mask = np.ones(values.shape, dtype=bool)
+    mask = np.asarray(mask, dtype=bool)
+    if offset is None:
+        offset = np.zeros(num_games, dtype=int)
+    offset = np.asarray(offset, dtype=int)
+    # Pad the position points with zeroes
+    pts = np.zeros(2 * num_powers, dtype=float)
+    pts[:len(position_points)] = position_points[:2 * num_powers]
+    # How many ranked powers are ahead of, or tied with, each power?
+    v = values[:, :, np.newaxis]
+    others = values[:, np.newaxis, :]
+    others_mask = mask[:, np.newaxis, :]
+    ahead = ((others > v) & others_mask).sum(axis=2) + offset[:, np.newaxis]
+    tied = ((others == v) & others_mask).sum(axis=2)
+    # Sum the points for the positions they share
+    positions = np.arange(2 * num_powers)[np.newaxis, np.newaxis, :]
+    shared = (positions >= ahead[:, :, np.newaxis]) & (positions < (ahead + tied)[:, :, np.newaxis])
+    total = (shared * pts).sum(axis=2)
+    return np.where(mask, total / np.maximum(tied, 1), 0.0)
@@ -19,6 +19,8 @@ This module contains the GameScoringSystem abstract base class
 """
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext as _
@@ -47,6 +49,34 @@ class GameScoringSystem(ABC):
         """
         raise NotImplementedError
 
+    def batch_scores(self, batch):
+        """
+        Takes a GameBatch object.
+
+        Returns an array, of shape (games, powers), of scores.
+        By default, this just calls scores() for each game in turn.
+        Systems that can score every game at once should override it,
+        and use _score_incomplete_games() for games with unknown final counts.
+        """
+        retval = np.zeros((batch.num_games, len(batch.powers)))
+        return self._score_games(batch, retval, range(batch.num_games))
+
+    def _score_games(self, batch, retval, games):
+        """Score the specified games of the GameBatch one at a time, into retval"""
+        for g in games:
+            scores = self.scores(batch.state(g))
+            retval[g] = [scores[p] for p in batch.powers]
+        return retval
+
+    def _score_incomplete_games(self, batch, retval):
+        """
+        Re-score any games in the GameBatch where not all the final counts are known.
+
+        The array scores for those games are meaningless, so they are scored
+        one at a time, exactly as scores() would score them.
+        """
+        return self._score_games(batch, retval, np.flatnonzero(batch.incomplete))
+
     @property
     def slug(self):
         """Slug for the system"""
@@ -17,6 +17,8 @@
 """
 This module contains a class that implements the Sum Of Squares scoring system.
 """
+import numpy as np
+
 from django.utils.translation import gettext as _
 
 from .game_scoring_system import GameScoringSystem
@@ -52,3 +54,15 @@ class GScoringSumOfSquares(GameScoringSystem):
             return retval_solo
         _normalise_scores(retval)
         return retval
+
+    def batch_scores(self, batch):
+        """
+        Return an array, of shape (games, powers), of scores.
+        """
+        squares = batch.final_counts * batch.final_counts
+        retval = squares * 100.0 / squares.sum(axis=1, keepdims=True)
+        # Soloers get 100, everyone else zero
+        soloed = batch.soloers >= 0
+        retval[soloed] = 0.0
+        retval[soloed, batch.soloers[soloed]] = 100.0
+        return self._score_incomplete_games(batch, retval)
@@ -0,0 +1,110 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Generate random, but legal, games of Diplomacy for testing and benchmarking.
+"""
+
+import random
+
+from tournament.diplomacy import FIRST_YEAR, TOTAL_SCS, WINNING_SCS
+
+from .sc_chart_game_state import SCChartGameState
+from .simple_game_state import SimpleGameState
+
+# Number of centres each power starts with, if not specified
+DEFAULT_STARTING_CENTRES = 3
+
+
+def random_sc_chart(powers, rng, starting_centres=None, max_year=FIRST_YEAR + 14):
+    """
+    Generate the supply centre chart of a random game.
+
+    powers should be an iterable of the Great Powers.
+    rng should be a random.Random.
+    starting_centres is an optional dict, keyed by power, of ints.
+    The game ends at a random year no later than max_year, or when a power soloes.
+    Returns a dict, keyed by year, of dicts, keyed by power, of ints.
+    """
+    powers = list(powers)
+    if starting_centres is None:
+        starting_centres = {p: DEFAULT_STARTING_CENTRES for p in powers}
+    counts = {p: starting_centres[p] for p in powers}
+    chart = {FIRST_YEAR - 1: dict(counts)}
+    final_year = rng.randint(FIRST_YEAR + 4, max_year)
+    for year in range(FIRST_YEAR, final_year + 1):
+        # Neutral centres get picked up
+        neutrals = TOTAL_SCS - sum(counts.values())
+        alive = [p for p in powers if counts[p]]
+        rng.shuffle(alive)
+        for p in alive:
+            gain = rng.randint(0, min(2, neutrals))
+            counts[p] += gain
+            neutrals -= gain
+        # And centres change hands, mostly to the stronger powers
+        for _ in range(rng.randint(0, 4)):
+            alive = [p for p in powers if counts[p]]
+            if len(alive) < 2:
+                break
+            winner = rng.choices(alive, weights=[counts[p] for p in alive])[0]
+            loser = rng.choice([p for p in alive if p != winner])
+            lost = min(counts[loser], rng.randint(1, 3))
+            counts[winner] += lost
+            counts[loser] -= lost
+        chart[year] = dict(counts)
+        if max(counts.values()) >= WINNING_SCS:
+            break
+    return chart
+
+
+def random_game_state(powers, rng, starting_centres=None, max_year=FIRST_YEAR + 14):
+    """
+    Generate a random GameState.
+
+    Half the time, this will be an SCChartGameState with the full SC chart.
+    Otherwise, it will be a SimpleGameState, and may include a draw or concession.
+    """
+    chart = random_sc_chart(powers, rng, starting_centres, max_year)
+    if rng.random() < 0.5:
+        return SCChartGameState(powers=list(powers), sc_counts=chart)
+    final_year = max(chart)
+    sc_counts = chart[final_year]
+    elimination_years = {}
+    for p, c in sc_counts.items():
+        if c == 0:
+            elimination_years[p] = min(y for y, counts in chart.items() if counts[p] == 0)
+    draw = None
+    survivors = sorted((p for p, c in sc_counts.items() if c), key=lambda p: sc_counts[p], reverse=True)
+    if (max(sc_counts.values()) < WINNING_SCS) and (rng.random() < 0.4):
+        if rng.random() < 0.1:
+            # Concession to the board-top
+            draw = survivors[:1]
+        else:
+            draw = survivors[:rng.randint(min(2, len(survivors)), len(survivors))]
+    return SimpleGameState(sc_counts=sc_counts,
+                           final_year=final_year,
+                           elimination_years=elimination_years,
+                           draw=draw)
+
+
+def random_game_states(num_games, powers, seed=None, starting_centres=None):
+    """
+    Generate a list of num_games random GameStates.
+
+    The same seed will always generate the same games.
+    """
+    rng = random.Random(seed)
+    return [random_game_state(powers, rng, starting_centres) for _ in range(num_games)]
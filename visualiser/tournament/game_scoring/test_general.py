@@ -22,6 +22,8 @@ from tournament.diplomacy import GreatPower
 from tournament.models import find_game_scoring_system
 
 from .g_scoring_systems import G_SCORING_SYSTEMS
+from .game_batch import UNKNOWN, GameBatch, rank_points
+from .game_state import DotCountUnknown
 from .sc_chart_game_state import InvalidState, SCChartGameState
 from .simple_game_state import SimpleGameState
 
@@ -55,6 +57,25 @@ def check_score_for_state(self, state, system_name, expected_scores, expected_to
     if expected_total is not None:
         self.assertAlmostEqual(sum(scores.values()), expected_total)
     check_score_order(self, scores)
+    check_batch_scores_for_state(self, state, system)
+
+
+def check_batch_scores_for_state(self, state, system):
+    """
+    Check that scoring a GameBatch gives the same scores as scoring each game separately.
+
+    The state is included in the batch twice, along with the SC chart of another game.
+    """
+    other = SCChartGameState(powers=list(state.all_powers()),
+                             sc_counts={1901: {p: 4 if i % 2 else 5 for i, p in enumerate(state.all_powers())}})
+    batch = GameBatch.from_states([state, other, state])
+    scores = batch.score_dicts(system.batch_scores(batch))
+    self.assertEqual(3, len(scores))
+    for g, s in zip([state, other, state], scores):
+        expected = system.scores(g)
+        for p in state.all_powers():
+            with self.subTest(batch_power=p):
+                self.assertAlmostEqual(s[p], expected[p])
 
 
 class GameScoringTests(TestCase):
@@ -188,6 +209,46 @@ class GameScoringTests(TestCase):
                 self.assertEqual(s, 0)
         self.assertEqual(sum(scores.values()), 80)
 
+    def test_rank_points_ties(self):
+        """rank_points() with tied values"""
+        points = rank_points([[10, 8, 8, 0], [1, 2, 3, 4]], [7, 5, 3, 1])
+        self.assertEqual(points.tolist(), [[7, 4, 4, 1], [1, 3, 5, 7]])
+
+    def test_rank_points_mask(self):
+        """rank_points() with a mask and offset"""
+        points = rank_points([[10, 8, 8, 0]],
+                             [7, 5, 3, 1],
+                             mask=[[False, True, True, True]],
+                             offset=[1])
+        self.assertEqual(points.tolist(), [[0, 4, 4, 1]])
+
+    def test_batch_partial_final_year(self):
+        """batch_scores() with a game where not all the final year's counts have been entered"""
+        powers = [self.austria, self.england, self.france,
+                  self.germany, self.italy, self.russia, self.turkey]
+        complete = [[3, 3, 3, 4, 3, 3, 3], [4, 5, 2, 6, 3, 5, 9]]
+        # France's count for 1902 is missing
+        partial = [[3, 3, 3, 4, 3, 3, 3], [4, 5, UNKNOWN, 6, 3, 5, 9]]
+        batch = GameBatch(powers, [complete, partial], first_year=1901)
+        self.assertEqual(batch.incomplete.tolist(), [False, True])
+        self.assertRaises(DotCountUnknown, batch.state(1).dot_count, self.france)
+        for system in G_SCORING_SYSTEMS:
+            with self.subTest(system=system.name):
+                try:
+                    expected = system.scores(batch.state(1))
+                except DotCountUnknown:
+                    # The batch should fail in the same way
+                    self.assertRaises(DotCountUnknown, system.batch_scores, batch)
+                    continue
+                scores = batch.score_dicts(system.batch_scores(batch))
+                for g, s in enumerate(scores):
+                    if g:
+                        e = expected
+                    else:
+                        e = system.scores(batch.state(g))
+                    for p in powers:
+                        self.assertAlmostEqual(s[p], e[p])
+
     # description for all G_SCORING_SYSTEMS
     def test_description(self):
         """Description of every system in G_SCORING_SYSTEMS"""
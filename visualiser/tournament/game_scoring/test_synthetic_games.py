@@ -0,0 +1,69 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import random
+
+from django.test import TestCase
+
+from tournament.diplomacy import FIRST_YEAR, TOTAL_SCS, WINNING_SCS, GreatPower
+
+from .g_scoring_systems import G_SCORING_SYSTEMS
+from .synthetic_games import random_game_states, random_sc_chart
+
+
+class SyntheticGamesTests(TestCase):
+    """
+    Test the random game generator
+    """
+    fixtures = ['game_sets.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.powers = list(GreatPower.objects.all())
+
+    def test_random_sc_chart_legal(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            chart = random_sc_chart(self.powers, rng)
+            years = sorted(chart)
+            self.assertEqual(years, list(range(FIRST_YEAR - 1, years[-1] + 1)))
+            for y in years:
+                with self.subTest(year=y):
+                    self.assertLessEqual(sum(chart[y].values()), TOTAL_SCS)
+                    if y > years[0]:
+                        for p in self.powers:
+                            # Once eliminated, always eliminated
+                            if chart[y - 1][p] == 0:
+                                self.assertEqual(chart[y][p], 0)
+                    if y < years[-1]:
+                        # Game ends with a solo
+                        self.assertLess(max(chart[y].values()), WINNING_SCS)
+
+    def test_random_game_states_repeatable(self):
+        states1 = random_game_states(20, self.powers, seed=42)
+        states2 = random_game_states(20, self.powers, seed=42)
+        for s1, s2 in zip(states1, states2):
+            self.assertEqual(s1.last_full_year(), s2.last_full_year())
+            self.assertEqual(s1.soloer(), s2.soloer())
+            for p in self.powers:
+                self.assertEqual(s1.dot_count(p), s2.dot_count(p))
+
+    def test_random_game_states_scorable(self):
+        states = random_game_states(50, self.powers, seed=3)
+        for system in G_SCORING_SYSTEMS:
+            with self.subTest(system=system.name):
+                for s in states:
+                    self.assertEqual(len(system.scores(s)), len(self.powers))
@@ -17,6 +17,8 @@
 """
 This module contains a class that implements the Tribute scoring system.
 """
+import numpy as np
+
 from django.utils.translation import gettext as _
 
 from .game_scoring_system import GameScoringSystem
@@ -70,3 +72,29 @@ class GScoringTribute(GameScoringSystem):
             elif dots:
                 retval[p] -= bonus_per_survivor
         return retval
+
+    def batch_scores(self, batch):
+        """
+        Return an array, of shape (games, powers), of scores.
+        """
+        dots = batch.final_counts
+        alive = dots > 0
+        num_survivors = alive.sum(axis=1, keepdims=True)
+        survival_points = 66 / num_survivors
+        leader_scs = dots.max(axis=1, keepdims=True)
+        leaders = dots == leader_scs
+        num_leaders = leaders.sum(axis=1, keepdims=True)
+        bonus_per_survivor = np.where(leader_scs > 6,
+                                      np.minimum(survival_points, leader_scs - 6),
+                                      0)
+        # 1 point per dot, plus the survival points
+        retval = dots + np.where(alive, survival_points, 0.0)
+        # Leader(s) gets tribute from all the rest
+        retval = np.where(leaders,
+                          retval + bonus_per_survivor * (num_survivors - num_leaders) / num_leaders,
+                          np.where(alive, retval - bonus_per_survivor, retval))
+        # Soloer gets 100, everyone else zero
+        soloed = batch.soloers >= 0
+        retval[soloed] = 0.0
+        retval[soloed, batch.soloers[soloed]] = 100.0
+        return self._score_incomplete_games(batch, retval)
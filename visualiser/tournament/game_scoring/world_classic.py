@@ -17,6 +17,8 @@
 """
 This module contains a class that implements the World Classic and Summer Classic scoring systems.
 """
+import numpy as np
+
 from django.utils.translation import gettext as _
 
 from tournament.diplomacy import FIRST_YEAR
@@ -89,3 +91,28 @@ class GScoringWorldClassic(GameScoringSystem):
                     # Split the topper bonus between all toppers
                     retval[p] += 48 / num_leaders
         return retval
+
+    def batch_scores(self, batch):
+        """
+        Return an array, of shape (games, powers), of scores.
+        """
+        dots = batch.final_counts
+        leader_scs = dots.max(axis=1, keepdims=True)
+        leaders = dots == leader_scs
+        num_leaders = leaders.sum(axis=1, keepdims=True)
+        # 10 points per SC, 30 for surviving
+        retval = 10.0 * dots + 30
+        # 48 split between board toppers
+        topper_bonus = 48 / num_leaders
+        if self.no_3ways:
+            # Topper bonus is void if 3 or more people share the top
+            topper_bonus = np.where(num_leaders < 3, topper_bonus, 0.0)
+        retval = np.where(leaders, retval + topper_bonus, retval)
+        # Scoring a soloed game is different
+        soloed = batch.soloers >= 0
+        # Everyone else does still get survival points up to the solo year
+        retval[soloed] = (batch.solo_years[soloed] - FIRST_YEAR)[:, np.newaxis]
+        retval[soloed, batch.soloers[soloed]] = 420
+        # 1 point per year survived if eliminated, regardless of the game result
+        retval = np.where(dots == 0, batch.elimination_years - FIRST_YEAR, retval)
+        return self._score_incomplete_games(batch, retval)
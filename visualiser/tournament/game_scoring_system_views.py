@@ -23,7 +23,7 @@ from operator import attrgetter
 from django.http import Http404
 from django.shortcuts import render
 
-from tournament.diplomacy import GreatPower
+from tournament.diplomacy import reference_data
 from tournament.game_scoring import (G_SCORING_SYSTEMS, DotCountUnknown,
                                      SimpleGameState)
 
@@ -53,7 +53,7 @@ def _create_state(params):
     n = 0
 
     # Map to Great Powers
-    for p, c in zip(GreatPower.objects.all(), params['sc_counts']):
+    for p, c in zip(reference_data.great_powers(), params['sc_counts']):
         sc_counts[p] = c
         if c == 0:
             elimination_years[p] = params['elimination_years'][n]
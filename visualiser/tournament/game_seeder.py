@@ -20,14 +20,24 @@ Assign players to Diplomacy games in a tournament setting.
 
 import copy
 import itertools
+import logging
+import math
 import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 #No auto until python 3.6
 #from enum import Enum, auto
 from enum import Enum
 from operator import itemgetter
 
+import numpy as np
+
 from django.utils.translation import gettext as _
 
+from tournament.assignment import min_cost_assignment
+
+logger = logging.getLogger(__name__)
+
 
 class InvalidPlayer(Exception):
     """A player is invalid in some way (unknown, already present, etc)."""
@@ -71,6 +81,31 @@ class _AssignmentFailed(Exception):
     pass
 
 
+# GameSeeder used by each worker process for parallel BOARD seeding
+_worker_seeder = None
+
+
+def _init_board_worker(seeder):
+    """Process pool initializer. Saves the GameSeeder for _board_seed_worker()."""
+    global _worker_seeder
+    _worker_seeder = seeder
+
+
+def _board_seed_worker(players, include_these_games, optimise_swaps, seed):
+    """
+    Run a single BOARD seeding start in a worker process.
+
+    Returns a 2-tuple of (seeding, fitness), or None if the start failed.
+    """
+    try:
+        return _worker_seeder._board_seed_games_once(players,
+                                                     include_these_games,
+                                                     optimise_swaps,
+                                                     random.Random(seed))
+    except _AssignmentFailed:
+        return None
+
+
 class SeedMethod(Enum):
     """
     Method to use to seed games
@@ -79,24 +114,26 @@ class SeedMethod(Enum):
              and pick the best
     EXHAUSTIVE - try every possible seeding and pick the best (slow)
     BOARD - board-first heuristic assignment plus swap improvements
+    ANNEAL - random assignment plus simulated annealing of swaps,
+             for a fixed time or number of swaps
     """
     #RANDOM = auto()
     #EXHAUSTIVE = auto()
     RANDOM = 1
     EXHAUSTIVE = 2
     BOARD = 3
+    ANNEAL = 4
 
 
 class GameSeeder:
     """
     Assigns Diplomacy players to games to minimise the number of people they play again.
 
-    Three algorithms are supported:
+    Four algorithms are supported:
     EXHAUSTIVE
-        Try every possible seeding. This will take a long time with many
-        players.
-        It may also exhaust memory. Definitely not recommended for 28 players,
-        and may well not work with 21.
+        Search every possible seeding, abandoning partial seedings that are
+        already worse than the best found. This finds the best seeding, but
+        can take a long time with many players.
     RANDOM
         Initially assigns players at random to games, then tries swapping
         players at random between games.
@@ -105,6 +142,11 @@ class GameSeeder:
     BOARD
         Assign players board-by-board using a constrained badness heuristic,
         then repeatedly improve by swapping player pairs between boards.
+    ANNEAL
+        Initially assigns players at random to games, then uses simulated
+        annealing - swaps that make the seeding worse are sometimes kept,
+        to escape from local optima. The search runs for a specified time
+        or number of swaps.
     In all cases, a fitness measure is used to determine the best candidate
     seeding.
     """
@@ -112,7 +154,11 @@ class GameSeeder:
                  powers,
                  seed_method,
                  starts=1,
-                 iterations=1000):
+                 iterations=1000,
+                 workers=1,
+                 time_limit=None,
+                 random_seed=None,
+                 progress=None):
         """
         Create a GameSeeder object
 
@@ -122,28 +168,63 @@ class GameSeeder:
             RANDOM - pick sets of players at random
             EXHAUSTIVE - try every possible seeding
             BOARD - board-first heuristic assignment and local optimisation
+            ANNEAL - simulated annealing
         starts is the number of initial seedings to generate. Not used with
-        EXHAUSTIVE seed_method.
+        EXHAUSTIVE or ANNEAL seed_methods.
         iterations is the number of times to modify each initial seeding in an
-        attempt to improve it. Not used with EXHAUSTIVE or BOARD seed_methods.
+        attempt to improve it. Not used with EXHAUSTIVE or BOARD seed_methods,
+        nor with ANNEAL if there is a time_limit.
+        The remaining parameters are only used with BOARD seed_method,
+        except for time_limit which is also used with EXHAUSTIVE and ANNEAL,
+        and random_seed which is also used with ANNEAL:
+        workers is the number of processes to spread the starts over.
+        time_limit is the maximum number of seconds to spend seeding (None for
+        no limit). At least one start will always be completed, and
+        EXHAUSTIVE will return the best seeding found so far.
+        ANNEAL will spend the whole time_limit searching, unless it finds a
+        perfect seeding.
+        random_seed, if not None, makes each start repeatable - start n uses
+        random_seed + n to seed its random number generator.
+        progress, if not None, is called from time to time with the best
+        fitness score found so far. If it returns True, seeding stops and the
+        best seeding found so far is used.
         """
         self.games_played = False
+        self.progress = progress
         self.seed_method = seed_method
         if seed_method in (SeedMethod.RANDOM, SeedMethod.BOARD):
             self.starts = starts
-        if seed_method in (SeedMethod.RANDOM,):
+        if seed_method in (SeedMethod.RANDOM, SeedMethod.ANNEAL):
             self.iterations = iterations
+        if seed_method in (SeedMethod.BOARD,):
+            self.workers = workers
+        if seed_method in (SeedMethod.BOARD, SeedMethod.ANNEAL):
+            self.random_seed = random_seed
+        if seed_method in (SeedMethod.BOARD, SeedMethod.EXHAUSTIVE, SeedMethod.ANNEAL):
+            self.time_limit = time_limit
+        # List of (seconds, fitness) 2-tuples recorded by the last ANNEAL seeding
+        self.fitness_trajectory = []
         # List of players to use to seed games
         self.players = []
+        self.powers = powers
+        self.num_powers = len(powers)
+        self._init_history()
+        # List of tuples of the players in each previously-played game
+        self._played_games = []
+
+    def _init_history(self):
+        """Set up the (empty) record of shared games and powers played"""
         # Dict, keyed by player, of dicts, keyed by (other) player,
         # of integer counts of shared games
         self.games_played_matrix = {}
-        self.powers = powers
-        self.num_powers = len(powers)
         # Dict, keyed by player, of dicts, keyed by power,
         # of integer counts of games the player has played that power
         self.powers_played = {}
 
+    def _known_player(self, player):
+        """Returns True if the player has been added"""
+        return player in self.games_played_matrix
+
     def add_player(self, player):
         """
         Add a player to take into account.
@@ -151,7 +232,7 @@ class GameSeeder:
         Player is assumed to have played no games.
         Can raise InvalidPlayer if the player is already present.
         """
-        if player in self.games_played_matrix:
+        if self._known_player(player):
             raise InvalidPlayer(str(player))
         self.players.append(player)
         self.games_played_matrix[player] = {}
@@ -207,8 +288,47 @@ class GameSeeder:
         # Check that each power is only present once
         if len(set([power for player, power in game])) != self.num_powers:
             raise PowersNotUnique()
+        self._record_played_game(game)
+        self._played_games.append(tuple(player for player, _ in game))
+
+    def _record_played_game(self, game):
+        """
+        Add a checked previously-played game to the record of shared games and powers played.
+
+        game is a set of (player, power) 2-tuples.
+        Can raise InvalidPlayer if any player is unknown.
+        """
         self._add_played_game(game, self.games_played_matrix)
 
+    def add_shared_games(self, player1, player2, count):
+        """
+        Add a number of previously-played games shared by two players.
+
+        This is an alternative to add_played_game() when only a summary of
+        the games is available. It doesn't record which players each game
+        contained, so EXHAUSTIVE seeding can't use these games to estimate
+        the fitness of partial seedings, and will be slower.
+        Can raise InvalidPlayer if any player is unknown.
+        Raises InvalidPlayerPairing if player1 == player2.
+        """
+        self._add_bias(player1, player2, count)
+
+    def add_power_games(self, player, power, count):
+        """
+        Add a number of previously-played games in which a player played a power.
+
+        This is an alternative to add_played_game() when only a summary of
+        the games is available.
+        Can raise InvalidPlayer if the player is unknown.
+        """
+        if not self._known_player(player):
+            raise InvalidPlayer(str(player))
+        self._record_power_games(player, power, count)
+
+    def _record_power_games(self, player, power, count):
+        """Add to the record of how often a known player has played a power"""
+        self.powers_played[player][power] += count
+
     def _add_bias(self, player1, player2, weight):
         """
         Add a bias to take into account.
@@ -228,10 +348,16 @@ class GameSeeder:
             raise InvalidPlayerPairing(str(player1))
         if weight == 0:
             raise InvalidWeight(str(weight))
-        if player1 not in self.games_played_matrix:
+        if not self._known_player(player1):
             raise InvalidPlayer(str(player1))
-        if player2 not in self.games_played_matrix:
+        if not self._known_player(player2):
             raise InvalidPlayer(str(player2))
+        self._record_bias(player1, player2, weight)
+        # fitness is now meaningful
+        self.games_played = True
+
+    def _record_bias(self, player1, player2, weight):
+        """Add a checked bias between two known players to the record of shared games"""
         try:
             self.games_played_matrix[player1][player2] += weight
         except KeyError:
@@ -240,8 +366,6 @@ class GameSeeder:
             self.games_played_matrix[player2][player1] += weight
         except KeyError:
             self.games_played_matrix[player2][player1] = weight
-        # fitness is now meaningful
-        self.games_played = True
 
     # This is the value used by add_bias()
     # It represents the number of games the two players will be assumed to have played together
@@ -276,53 +400,23 @@ class GameSeeder:
             f += self.powers_played[player][power]
         return f
 
-    def _assign_some_powers(self, players, powers):
-        """
-        Returns a list of sets of (player, power) 2-tuples.
-
-        This is the set of all possible games with that player and power list.
-        """
-        assert len(players) == len(powers)
-        # If there's just one player left, there's only one possible game
-        if len(players) == 1:
-            pair = (players[0], powers[0])
-            game = set()
-            game.add(pair)
-            result = []
-            result.append(game)
-            return result
-        result = []
-        player = players.pop(0)
-        for power in powers:
-            pair = (player, power)
-            powers2 = powers.copy()
-            powers2.remove(power)
-            for game in self._assign_some_powers(players.copy(), powers2):
-                game.add(pair)
-                result.append(game)
-        return result
-
     def _assign_powers(self, game):
         """
         Returns a 2-tuple containing a set of (player, power) 2-tuples and a list of "issues".
 
         game is a set of players.
+        Powers are assigned to minimise the total number of times that
+        players have previously played their assigned power.
         """
-        # Try every combination of power assignments in a random order,
-        # and keep the best
-        best_fitness = 99999
         player_list = list(game)
         power_list = list(self.powers)
-        random.shuffle(player_list)
-        games = self._assign_some_powers(player_list, power_list)
-        for g in games:
-            score = self._power_fitness(g)
-            if score < best_fitness:
-                best_fitness = score
-                best_result = g
-            if best_fitness == 0:
-                # This is as good as it gets - no player has played this power before
-                break
+        costs = [[self.powers_played[player][power] for power in power_list] for player in player_list]
+        assignment = min_cost_assignment(costs)
+        best_result = set()
+        best_fitness = 0
+        for player, costs_row, n in zip(player_list, costs, assignment):
+            best_result.add((player, power_list[n]))
+            best_fitness += costs_row[n]
         issues = []
         if best_fitness > 0:
             issues.append(_('Game has %(num)d player(s) who have already played their power') % {'num': best_fitness})
@@ -440,6 +534,24 @@ class GameSeeder:
                         break
         return best_set, best_fitness
 
+    @staticmethod
+    def _together_delta(together, p, others, change):
+        """
+        Add change to the count of games this seeding p shares with each of others.
+
+        Returns the resulting change in fitness score.
+        """
+        delta = 0
+        for q in others:
+            pair = (p, q) if p < q else (q, p)
+            count = together.get(pair, 0)
+            if change > 0:
+                delta += 2 * count ** 2
+            else:
+                delta -= 2 * (count - 1) ** 2
+            together[pair] = count + change
+        return delta
+
     def _assign_players_wrapper(self, players):
         """
         Wrapper that just keeps calling _assign_players_to_games_randomly() until it succeeds.
@@ -457,13 +569,15 @@ class GameSeeder:
     def _board_seed_games_once(self,
                                players,
                                include_these_games=False,
-                               optimise_swaps=True):
+                               optimise_swaps=True,
+                               rng=random):
         """
         Assign players to boards using a board-first badness heuristic.
 
         players is a list that can contain duplicates when players are
         doubling up. Duplicates are treated as distinct entries, but two
         entries representing the same player are never allowed in one board.
+        rng is the random number generator to use.
         """
         num_boards = len(players) // self.num_powers
         entry_players = list(players)
@@ -539,7 +653,7 @@ class GameSeeder:
                 ]) == min_options
             ]
 
-            chosen_entry = random.choice(set2)
+            chosen_entry = rng.choice(set2)
             possible_boards = [
                 b_idx for b_idx, board in enumerate(boards)
                 if (
@@ -553,7 +667,7 @@ class GameSeeder:
 
             freest = min(len(boards[b_idx]) for b_idx in possible_boards)
             restricted_boards = [b_idx for b_idx in possible_boards if len(boards[b_idx]) == freest]
-            board_choice = random.choice(restricted_boards)
+            board_choice = rng.choice(restricted_boards)
 
             boards[board_choice].append(chosen_entry)
             board_player_sets[board_choice].add(entry_players[chosen_entry])
@@ -659,6 +773,99 @@ class GameSeeder:
             best_games = entries_to_games(best_entries)
         return best_games, best_fitness
 
+    def _report_progress(self, fitness):
+        """
+        Pass the best fitness score so far to the progress callback, if any.
+
+        Returns True if seeding should stop.
+        """
+        if self.progress is None:
+            return False
+        return bool(self.progress(fitness))
+
+    def _start_seed(self, n):
+        """Returns the seed to use for the random number generator for start n"""
+        if self.random_seed is None:
+            return None
+        return self.random_seed + n
+
+    def _indexed_copy(self):
+        """
+        Returns a copy of this GameSeeder with players and powers replaced by integers.
+
+        Player n is self.players[n], and power n is self.powers[n].
+        The copy can be pickled regardless of what is used for players and powers.
+        """
+        player_index = {p: n for n, p in enumerate(self.players)}
+        power_index = {p: n for n, p in enumerate(self.powers)}
+        seeder = GameSeeder(list(range(self.num_powers)),
+                            SeedMethod.BOARD,
+                            starts=self.starts)
+        seeder.players = list(range(len(self.players)))
+        seeder.games_played = self.games_played
+        seeder._played_games = [tuple(player_index[p] for p in game) for game in self._played_games]
+        for p, counts in self.games_played_matrix.items():
+            seeder.games_played_matrix[player_index[p]] = {player_index[q]: c for q, c in counts.items()}
+        for p, counts in self.powers_played.items():
+            seeder.powers_played[player_index[p]] = {power_index[q]: c for q, c in counts.items()}
+        return seeder
+
+    def _serial_board_starts(self, players, starts, include_these_games, optimise_swaps):
+        """
+        Generator yielding the result of each BOARD seeding start in turn.
+
+        Yields (seeding, fitness) 2-tuples, or None for a failed start.
+        """
+        for n in range(starts):
+            try:
+                yield self._board_seed_games_once(players,
+                                                  include_these_games,
+                                                  optimise_swaps,
+                                                  random.Random(self._start_seed(n)))
+            except _AssignmentFailed:
+                yield None
+
+    def _parallel_board_starts(self, players, starts, include_these_games, optimise_swaps, deadline):
+        """
+        Generator yielding the results of BOARD seeding starts run in a process pool.
+
+        Yields (seeding, fitness) 2-tuples, or None for a failed start,
+        in the order in which they complete.
+        Stops yielding at deadline, once at least one start has succeeded.
+        Any outstanding starts are cancelled when the generator is closed.
+        """
+        player_index = {p: n for n, p in enumerate(self.players)}
+        entries = [player_index[p] for p in players]
+        executor = ProcessPoolExecutor(max_workers=min(self.workers, starts),
+                                       initializer=_init_board_worker,
+                                       initargs=(self._indexed_copy(),))
+        try:
+            pending = {executor.submit(_board_seed_worker,
+                                       entries,
+                                       include_these_games,
+                                       optimise_swaps,
+                                       self._start_seed(n))
+                       for n in range(starts)}
+            succeeded = False
+            while pending:
+                timeout = None
+                if succeeded and (deadline is not None):
+                    timeout = max(0, deadline - time.monotonic())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # Out of time
+                    return
+                for f in done:
+                    result = f.result()
+                    if result is None:
+                        yield None
+                        continue
+                    succeeded = True
+                    seeding, fitness = result
+                    yield [set(self.players[n] for n in game) for game in seeding], fitness
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _seed_games_board(self, omitting_players, players_doubling_up):
         """
         Generate seedings using the board-first heuristic method.
@@ -673,68 +880,400 @@ class GameSeeder:
         if self.games_played or (len(players_doubling_up) > 1):
             starts = self.starts
 
+        deadline = None
+        if self.time_limit is not None:
+            deadline = time.monotonic() + self.time_limit
         include_these_games = (len(players_doubling_up) > 1)
         optimise_swaps = self.games_played or include_these_games
         best_seeding = None
         best_fitness = None
 
-        for n in range(starts):
-            try:
-                seeding, fitness = self._board_seed_games_once(players,
-                                                               include_these_games,
-                                                               optimise_swaps)
-            except _AssignmentFailed as e:
-                continue
-            if (best_fitness is None) or (fitness < best_fitness):
-                best_seeding = seeding
-                best_fitness = fitness
-            if best_fitness == 0:
-                # This is as good as it gets, so no point continuing
-                break
+        if (self.workers > 1) and (starts > 1):
+            results = self._parallel_board_starts(players,
+                                                  starts,
+                                                  include_these_games,
+                                                  optimise_swaps,
+                                                  deadline)
+        else:
+            results = self._serial_board_starts(players,
+                                                starts,
+                                                include_these_games,
+                                                optimise_swaps)
+        n = 0
+        try:
+            for result in results:
+                n += 1
+                if result is not None:
+                    seeding, fitness = result
+                    if (best_fitness is None) or (fitness < best_fitness):
+                        best_seeding = seeding
+                        best_fitness = fitness
+                    if best_fitness == 0:
+                        # This is as good as it gets, so no point continuing
+                        break
+                    if self._report_progress(best_fitness):
+                        break
+                if ((best_fitness is not None)
+                        and (deadline is not None)
+                        and (time.monotonic() >= deadline)):
+                    # Out of time
+                    break
+        finally:
+            results.close()
 
-        print(f'With Board seeding, starts={self.starts}, best fitness score is {best_fitness} in {n+1} seedings')
+        logger.debug('With Board seeding, starts=%d, best fitness score is %s in %d seedings',
+                     self.starts, best_fitness, n)
 
         if best_fitness is None:
             raise ImpossibleToSeed(f"Tried {starts} times, and didn't find a valid seeding. doublers={players_doubling_up}, games_played={self.games_played_matrix}")
 
         return best_seeding, best_fitness
 
-    def _all_possible_seedings(self, players):
+    # Number of random swaps used to pick the starting temperature for ANNEAL seeding
+    _ANNEAL_SAMPLES = 100
+
+    # Final temperature for ANNEAL seeding, as a fraction of the starting temperature
+    _ANNEAL_COOLING = 0.001
+
+    # Number of swaps between calls to the progress callback for ANNEAL seeding
+    _ANNEAL_PROGRESS_SWAPS = 10000
+
+    def _pair_squares(self):
         """
-        Returns a list of all possible seedings (each being a list of sets of players).
+        Returns the squares of the number of games each pair of players has shared.
 
-        It will also include seedings with the same games in different orders.
-        Note that this will take a long time for large numbers of players.
-        Raises _AssignmentFailed if no valid games can be formed from the
-        specified players.
+        The result is a list of lists, indexed by position in self.players.
         """
-        if len(set(players)) < self.num_powers:
-            # We've ended up with a group of players that we can't make a valid game from
-            raise _AssignmentFailed(f"{len(set(players))} players is fewer than the {self.num_powers} needed")
-        if len(players) == self.num_powers:
-            # With this number of players, there is exactly one possible game,
-            # and therefore exactly one possible seeding
-            return [[set(players)]]
-        res = []
-        # Go through all possible combinations for the first game:
-        for t in itertools.combinations(players, self.num_powers):
-            game = set(t)
-            if len(game) != self.num_powers:
-                # Can't have any players playing themselves
-                continue
-            # Make a copy of players, and remove the players in game
-            p2 = players.copy()
-            for p in game:
-                p2.remove(p)
-            # Now we can create each possible set that includes this game
-            try:
-                for s in self._all_possible_seedings(p2):
-                    s.append(game)
-                    res.append(s)
-            except _AssignmentFailed:
-                # No possible valid games with the remaining players
+        player_index = {p: n for n, p in enumerate(self.players)}
+        squares = [[0] * len(self.players) for _ in self.players]
+        for p, counts in self.games_played_matrix.items():
+            row = squares[player_index[p]]
+            for q, c in counts.items():
+                row[player_index[q]] = c ** 2
+        return squares
+
+    def _random_boards(self, entries, rng):
+        """
+        Assign player indices to boards at random.
+
+        entries is a list of player indices that can contain duplicates when
+        players are doubling up. Two copies of one player are never put on
+        one board.
+        Returns a list of lists of player indices.
+        """
+        entries = list(entries)
+        while True:
+            rng.shuffle(entries)
+            boards = [entries[n:n + self.num_powers] for n in range(0, len(entries), self.num_powers)]
+            if all(len(set(board)) == len(board) for board in boards):
+                return boards
+
+    def _seed_games_anneal(self, omitting_players, players_doubling_up):
+        """
+        Generate a seeding using simulated annealing.
+
+        Starts from a random seeding, then repeatedly tries swapping a random
+        player between two random games. Swaps that improve the fitness score
+        are always kept. Swaps that make it worse are kept with a probability
+        that falls as the temperature falls, from the start to the end of the
+        time_limit (or of the iterations, if there is no time limit).
+        Records a (seconds, fitness) 2-tuple in self.fitness_trajectory
+        each time the best fitness score improves.
+        Returns a 2-tuple of (best seeding, fitness).
+        """
+        self.fitness_trajectory = []
+        players = self._player_pool(omitting_players, players_doubling_up)
+        if not players:
+            return [], 0
+        start = time.monotonic()
+        rng = random.Random(self.random_seed)
+        include_these_games = (len(players_doubling_up) > 1)
+        player_index = {p: n for n, p in enumerate(self.players)}
+        boards = self._random_boards([player_index[p] for p in players], rng)
+        # Doubler and seeder biases are already included in the squares
+        squares = self._pair_squares()
+        together = {} if include_these_games else None
+        fitness = 0
+        for board in boards:
+            for p1, p2 in itertools.combinations(board, 2):
+                # Each pair appears twice in _fitness_score()
+                fitness += 2 * squares[p1][p2]
+                if include_these_games:
+                    fitness += self._together_delta(together, p1, [p2], 1)
+
+        def random_swap():
+            """Returns (board1, index1, board2, index2) for a random valid swap, or None"""
+            b1, b2 = rng.sample(boards, 2)
+            # Pick a player from each game that isn't also playing the other
+            choices1 = [i for i, p in enumerate(b1) if p not in b2]
+            choices2 = [i for i, p in enumerate(b2) if p not in b1]
+            if not choices1 or not choices2:
+                return None
+            return b1, rng.choice(choices1), b2, rng.choice(choices2)
+
+        def swap_delta(b1, i1, b2, i2):
+            """Returns the change in fitness score, ignoring these games, from a swap"""
+            row1 = squares[b1[i1]]
+            row2 = squares[b2[i2]]
+            rest1 = b1[:i1] + b1[i1 + 1:]
+            rest2 = b2[:i2] + b2[i2 + 1:]
+            return 2 * (sum(row2[q] - row1[q] for q in rest1)
+                        + sum(row1[q] - row2[q] for q in rest2))
+
+        def together_deltas(b1, i1, b2, i2, change):
+            """Update together for a swap (change=1) or to undo one (change=-1)"""
+            p1 = b1[i1]
+            p2 = b2[i2]
+            rest1 = b1[:i1] + b1[i1 + 1:]
+            rest2 = b2[:i2] + b2[i2 + 1:]
+            return (self._together_delta(together, p1, rest1, -change)
+                    + self._together_delta(together, p2, rest1, change)
+                    + self._together_delta(together, p2, rest2, -change)
+                    + self._together_delta(together, p1, rest2, change))
+
+        # Start hot enough that a typical worsening swap is kept half the time
+        worse = []
+        if len(boards) >= 2:
+            for _ in range(self._ANNEAL_SAMPLES):
+                swap = random_swap()
+                if swap is not None:
+                    delta = swap_delta(*swap)
+                    if delta > 0:
+                        worse.append(delta)
+        if worse:
+            start_temperature = sum(worse) / len(worse) / math.log(2)
+        else:
+            start_temperature = 1.0
+
+        best_boards = [board.copy() for board in boards]
+        best_fitness = fitness
+        self.fitness_trajectory.append((time.monotonic() - start, best_fitness))
+        n = 0
+        # There's nothing to do if we only have one game
+        while (len(boards) >= 2) and (best_fitness > 0):
+            if self.time_limit is None:
+                if n >= self.iterations:
+                    break
+                fraction = n / self.iterations
+            else:
+                elapsed = time.monotonic() - start
+                if elapsed >= self.time_limit:
+                    break
+                fraction = elapsed / self.time_limit
+            if (n % self._ANNEAL_PROGRESS_SWAPS == 0) and self._report_progress(best_fitness):
+                break
+            n += 1
+            swap = random_swap()
+            if swap is None:
                 continue
-        return res
+            delta = swap_delta(*swap)
+            if include_these_games:
+                delta += together_deltas(*swap, 1)
+            temperature = start_temperature * self._ANNEAL_COOLING ** fraction
+            if (delta <= 0) or (rng.random() < math.exp(-delta / temperature)):
+                b1, i1, b2, i2 = swap
+                b1[i1], b2[i2] = b2[i2], b1[i1]
+                fitness += delta
+                if fitness < best_fitness:
+                    best_fitness = fitness
+                    best_boards = [board.copy() for board in boards]
+                    self.fitness_trajectory.append((time.monotonic() - start, best_fitness))
+            elif include_these_games:
+                together_deltas(*swap, -1)
+
+        logger.debug('With Anneal seeding, time_limit=%s and iterations=%s, best fitness score is %s after %d swaps',
+                     self.time_limit, self.iterations, best_fitness, n)
+        return [set(self.players[i] for i in board) for board in best_boards], best_fitness
+
+    def _exhaustive_seedings(self, players, include_these_games=False, deadline=None):
+        """
+        Branch-and-bound search of every possible seeding.
+
+        players is a list that can contain duplicates when players are
+        doubling up.
+        Generator yielding (seeding, fitness) 2-tuples, each with a better
+        fitness than the one before, so the last one is the best seeding.
+        Each seeding is a list of sets of players.
+        Seedings that only differ in the order of their games, or of the
+        players within a game, are only considered once, because games are
+        filled in order of players' positions in players, starting with the
+        first player not yet in a game. A partial seeding is abandoned as soon
+        as its fitness, plus a lower bound for the players still to be added,
+        is no better than the best found so far, starting with a single BOARD
+        seeding.
+        If deadline (a time.monotonic() value) is provided, the search stops
+        then, once at least one seeding has been found.
+        Yields nothing if no valid seeding exists.
+        """
+        # Work with indices into the list of unique players,
+        # and the number of games each still needs to be added to
+        unique_players = list(dict.fromkeys(players))
+        num_players = len(unique_players)
+        remaining = [players.count(p) for p in unique_players]
+        num_games = len(players) // self.num_powers
+        # Fitness contribution of each pair of players sharing a game
+        pair_fitness = [[0] * num_players for _ in range(num_players)]
+        for i, p in enumerate(unique_players):
+            for j, q in enumerate(unique_players):
+                if i != j:
+                    pair_fitness[i][j] = 2 * self.games_played_matrix[p].get(q, 0) ** 2
+        # Number of games in this seeding each pair of players shares.
+        # Only needed for players in more than one game
+        together = [[0] * num_players for _ in range(num_players)]
+        games = []
+        best_fitness = None
+        # Remaining players from each previously-played game, for the lower bound.
+        # Negative biases would invalidate the bound, so don't use it then
+        player_index = {p: i for i, p in enumerate(unique_players)}
+        group_remaining = []
+        player_groups = [[] for _ in range(num_players)]
+        if all(count >= 0 for p in unique_players for count in self.games_played_matrix[p].values()):
+            for game in self._played_games:
+                indices = [player_index[p] for p in game if p in player_index]
+                if len(indices) > 1:
+                    for i in indices:
+                        player_groups[i].append(len(group_remaining))
+                    group_remaining.append(sum(remaining[i] for i in indices))
+
+        def lower_bound(games_left):
+            """
+            Lower bound for the fitness of the players not yet in games.
+
+            Spreading the remaining players from a previously-played game as
+            evenly as possible over the remaining games gives the fewest pairs
+            of them that can share a game, and every such pair adds at least 2.
+            """
+            bound = 0
+            for count in group_remaining:
+                q, r = divmod(count, games_left)
+                bound += r * (q + 1) * q + (games_left - r) * q * (q - 1)
+            return bound
+
+        def feasible(games_left):
+            """Can the remaining players be put into games_left games?"""
+            available = [r for r in remaining if r]
+            return (len(available) >= self.num_powers) and (max(available) <= games_left)
+
+        def pair_weight(i, j):
+            """Fitness added by players i and j sharing a game"""
+            if include_these_games:
+                return pair_fitness[i][j] + 2 * together[i][j] ** 2
+            return pair_fitness[i][j]
+
+        def candidate_games(game, others, fitness, limit, result, row_sums=None):
+            """
+            Find every way to fill game from others, adding fitness less than limit.
+
+            Appends (fitness increase, game) 2-tuples to result.
+            If row_sums is provided, the remaining players will all be in
+            either this game or one more game. In that case, the fitness
+            increase includes the other game, which is calculated as the
+            total weight of all the pairs, minus the weights of the pairs
+            split between the two games.
+            row_sums is then a 2-tuple of the total weight of all the pairs
+            and a list of the total weight of the pairs including each player.
+            """
+            needed = self.num_powers - len(game)
+            for n in range(len(others) - needed + 1):
+                i = others[n]
+                f = fitness
+                for j in game:
+                    f += pair_weight(i, j)
+                if (limit is not None) and (f >= limit):
+                    continue
+                game.append(i)
+                if needed > 1:
+                    candidate_games(game, others[n + 1:], f, limit, result, row_sums)
+                elif row_sums is None:
+                    result.append((f, tuple(game)))
+                else:
+                    total, rows = row_sums
+                    both = total + 2 * f - sum(rows[j] for j in game)
+                    if (limit is None) or (both < limit):
+                        result.append((both, tuple(game)))
+                game.pop()
+
+        def update_counts(game, change):
+            """Remove change from the counts of remaining players for the players in game"""
+            for i in game:
+                remaining[i] -= change
+                for g in player_groups[i]:
+                    group_remaining[g] -= change
+                if include_these_games:
+                    for j in game:
+                        if i != j:
+                            together[i][j] += change
+
+        def out_of_time():
+            return (deadline is not None) and (best_fitness is not None) and (time.monotonic() >= deadline)
+
+        def next_game(fitness):
+            """Add every possible next game to the seeding so far"""
+            nonlocal best_fitness
+            games_left = num_games - len(games)
+            if games_left == 0:
+                best_fitness = fitness
+                yield [set(unique_players[i] for i in game) for game in games], fitness
+                return
+            if (best_fitness is not None) and (fitness + lower_bound(games_left) >= best_fitness):
+                return
+            if not feasible(games_left):
+                return
+            players_left = [i for i in range(num_players) if remaining[i]]
+            # The first remaining player always goes in the next game
+            first = players_left[0]
+            row_sums = None
+            if (games_left == 2) and (len(players_left) == 2 * self.num_powers):
+                # The last game is just the players not in this one
+                rows = [0] * num_players
+                for i in players_left:
+                    rows[i] = sum(pair_weight(i, j) for j in players_left if j != i)
+                row_sums = (sum(rows) // 2, rows)
+            candidates = []
+            candidate_games([first],
+                            players_left[1:],
+                            0,
+                            None if best_fitness is None else best_fitness - fitness,
+                            candidates,
+                            row_sums)
+            # Try the best-looking games first, so we find a good seeding sooner
+            candidates.sort(key=itemgetter(0))
+            for f, game in candidates:
+                if (best_fitness is not None) and (fitness + f >= best_fitness):
+                    # This and every later candidate are no improvement
+                    break
+                if row_sums is not None:
+                    last_game = tuple(i for i in players_left if i not in game)
+                    games.append(game)
+                    games.append(last_game)
+                    best_fitness = fitness + f
+                    yield [set(unique_players[i] for i in g) for g in games], best_fitness
+                    games.pop()
+                    games.pop()
+                    # The first candidate is the best
+                    break
+                update_counts(game, 1)
+                games.append(game)
+                yield from next_game(fitness + f)
+                games.pop()
+                update_counts(game, -1)
+                if (best_fitness == 0) or out_of_time():
+                    # This is as good as it gets, or we're out of time
+                    return
+
+        if not players:
+            yield [], 0
+            return
+        # Start with a quick seeding, to give us something to beat
+        try:
+            seeding, fitness = self._board_seed_games_once(players, include_these_games)
+        except _AssignmentFailed:
+            pass
+        else:
+            best_fitness = fitness
+            yield seeding, fitness
+        if best_fitness != 0:
+            yield from next_game(0)
 
     def _player_pool(self, omitting_players, players_doubling_up):
         """
@@ -847,6 +1386,9 @@ class GameSeeder:
             if self.seed_method == SeedMethod.BOARD:
                 seedings = [self._seed_games_board(omitting_players,
                                                    players_doubling_up)]
+            elif self.seed_method == SeedMethod.ANNEAL:
+                seedings = [self._seed_games_anneal(omitting_players,
+                                                    players_doubling_up)]
             elif ((not self.games_played) and (len(players_doubling_up) < 2)) or (self.seed_method == SeedMethod.RANDOM):
                 seedings = []
                 # No point generating multiples if they're all equally good
@@ -861,28 +1403,255 @@ class GameSeeder:
                     if candidate[1] == 0:
                         # Perfect random seeding found; no need to evaluate more starts.
                         break
+                    if self._report_progress(min(f for _, f in seedings)):
+                        break
             else:  # self.seed_method == SeedMethod.EXHAUSTIVE
                 players = self._player_pool(omitting_players, players_doubling_up)
+                deadline = None
+                if self.time_limit is not None:
+                    deadline = time.monotonic() + self.time_limit
                 seedings = []
-                try:
-                    for s in self._all_possible_seedings(players):
-                        fitness = self._set_fitness(s, include_these_games=(len(players_doubling_up) > 1))
-                        seedings.append((s, fitness))
-                except _AssignmentFailed as e:
-                    # Remove temporary bias
-                    self._add_bias_for_doublers(players_doubling_up, add=False)
-                    raise ImpossibleToSeed from e
+                for seeding in self._exhaustive_seedings(players,
+                                                         include_these_games=(len(players_doubling_up) > 1),
+                                                         deadline=deadline):
+                    seedings.append(seeding)
+                    # Each seeding is better than the one before
+                    if self._report_progress(seeding[1]):
+                        break
+                if not seedings:
+                    raise ImpossibleToSeed(f'No valid seeding of {len(players)} players')
             # Sort them by fitness
             seedings.sort(key=itemgetter(1))
             if self.seed_method == SeedMethod.RANDOM:
                 bg_str = f'With Random seeding, starts={self.starts} and iterations={self.iterations}'
             elif self.seed_method == SeedMethod.EXHAUSTIVE:
                 bg_str = 'With Exhaustive seeding'
-            if self.seed_method != SeedMethod.BOARD:
-                # The stats for BOARD seeding were already printed
-                print(f'{bg_str}, best fitness score is {seedings[0][1]} in {len(seedings)} seedings')
+            if self.seed_method not in (SeedMethod.BOARD, SeedMethod.ANNEAL):
+                # The stats for BOARD and ANNEAL seeding were already logged
+                logger.debug('%s, best fitness score is %s in %d seedings', bg_str, seedings[0][1], len(seedings))
         finally:
             # Remove temporary bias
             self._add_bias_for_doublers(players_doubling_up, add=False)
         # Return the best (we don't care if multiple seedings are equally good)
         return seedings[0][0]
+
+
+class ArrayGameSeeder(GameSeeder):
+    """
+    GameSeeder that keeps its history in NumPy arrays.
+
+    Players and powers are mapped to integer indices, and the number of
+    games played by each pair of players and of each player with each power
+    are stored in arrays. Fitness scores are calculated from the arrays,
+    and the RANDOM method scores each swap by the change in fitness it causes,
+    rather than recalculating the fitness of the whole seeding.
+    games_played_matrix and powers_played are read-only, and are built from
+    the arrays when needed by the code shared with GameSeeder.
+    The interface and results are otherwise identical to GameSeeder.
+    """
+    def _init_history(self):
+        """Set up the (empty) arrays of shared games and powers played"""
+        # Dict, keyed by player, of index into the arrays
+        self._player_index = {}
+        # Dict, keyed by power, of index into _power_counts columns
+        self._power_index = {p: n for n, p in enumerate(self.powers)}
+        # Square array of counts of shared games (including biases),
+        # indexed by player index. May have spare capacity
+        self._pair_counts = np.zeros((0, 0), dtype=np.int64)
+        # Array of counts of games each player has played each power
+        self._power_counts = np.zeros((0, self.num_powers), dtype=np.int64)
+        # games_played_matrix and powers_played, if built since the arrays last changed
+        self._history_dicts = None
+
+    @property
+    def games_played_matrix(self):
+        """Dict, keyed by player, of dicts, keyed by (other) player, of non-zero counts of shared games"""
+        return self._build_history_dicts()[0]
+
+    @property
+    def powers_played(self):
+        """Dict, keyed by player, of dicts, keyed by power, of counts of games the player has played that power"""
+        return self._build_history_dicts()[1]
+
+    def _build_history_dicts(self):
+        """Returns a 2-tuple of games_played_matrix and powers_played, built from the arrays"""
+        if self._history_dicts is None:
+            n = len(self.players)
+            matrix = {}
+            for i, p in enumerate(self.players):
+                row = self._pair_counts[i, :n]
+                matrix[p] = {self.players[j]: int(row[j]) for j in np.flatnonzero(row)}
+            powers_played = {p: dict(zip(self.powers, self._power_counts[i].tolist()))
+                             for i, p in enumerate(self.players)}
+            self._history_dicts = (matrix, powers_played)
+        return self._history_dicts
+
+    def _known_player(self, player):
+        """Returns True if the player has been added"""
+        return player in self._player_index
+
+    def add_player(self, player):
+        """
+        Add a player to take into account.
+
+        Player is assumed to have played no games.
+        Can raise InvalidPlayer if the player is already present.
+        """
+        if self._known_player(player):
+            raise InvalidPlayer(str(player))
+        self.players.append(player)
+        n = len(self._player_index)
+        self._player_index[player] = n
+        capacity = len(self._pair_counts)
+        if n >= capacity:
+            # Grow the arrays, doubling their capacity
+            capacity = max(2 * capacity, 8)
+            pair_counts = np.zeros((capacity, capacity), dtype=np.int64)
+            pair_counts[:n, :n] = self._pair_counts[:n, :n]
+            self._pair_counts = pair_counts
+            power_counts = np.zeros((capacity, self.num_powers), dtype=np.int64)
+            power_counts[:n] = self._power_counts[:n]
+            self._power_counts = power_counts
+        self._history_dicts = None
+
+    def _indices(self, players):
+        """Returns a list of the indices of the specified players"""
+        return [self._player_index[p] for p in players]
+
+    def _record_played_game(self, game):
+        """
+        Add a checked previously-played game to the arrays.
+
+        See GameSeeder._record_played_game().
+        """
+        for player, _ in game:
+            if not self._known_player(player):
+                raise InvalidPlayer(str(player))
+        players = self._indices(player for player, _ in game)
+        powers = [self._power_index[power] for _, power in game]
+        self._pair_counts[np.ix_(players, players)] += 1
+        # Players don't play themselves
+        self._pair_counts[players, players] -= 1
+        self._power_counts[players, powers] += 1
+        self._history_dicts = None
+        self.games_played = True
+
+    def _record_power_games(self, player, power, count):
+        """Add to the array of how often a known player has played a power"""
+        self._power_counts[self._player_index[player], self._power_index[power]] += count
+        self._history_dicts = None
+
+    def _record_bias(self, player1, player2, weight):
+        """Add a checked bias between two known players to the array of shared games"""
+        i = self._player_index[player1]
+        j = self._player_index[player2]
+        self._pair_counts[i, j] += weight
+        self._pair_counts[j, i] += weight
+        self._history_dicts = None
+
+    def _power_fitness(self, game):
+        """
+        Returns a fitness score (0-??) for a game. Lower is better.
+
+        In this case, a game is a set of (player, power) 2-tuples.
+        The value returned is the sum of the number of times each player has
+        previously played the specified power.
+        """
+        players = self._indices(player for player, _ in game)
+        powers = [self._power_index[power] for _, power in game]
+        return int(self._power_counts[players, powers].sum())
+
+    def _fitness_score(self, game, games_played_matrix=None):
+        """
+        Returns a fitness score (0-??) for a game. Lower is better.
+
+        See GameSeeder._fitness_score().
+        """
+        if (games_played_matrix is not None) and (games_played_matrix is not self.games_played_matrix):
+            return super()._fitness_score(game, games_played_matrix)
+        players = self._indices(game)
+        return int((self._pair_counts[np.ix_(players, players)] ** 2).sum())
+
+    def _boards_fitness(self, boards, include_these_games):
+        """
+        Calculate a total fitness score for a seeding expressed as lists of player indices.
+
+        Returns a 2-tuple of the fitness score and, if include_these_games
+        is True, a dict, keyed by 2-tuples of player indices (lowest first),
+        of the number of these games that each pair of players share
+        (otherwise None).
+        """
+        fitness = 0
+        together = {} if include_these_games else None
+        for board in boards:
+            fitness += int((self._pair_counts[np.ix_(board, board)] ** 2).sum())
+            if include_these_games:
+                for pair in itertools.combinations(sorted(board), 2):
+                    count = together.get(pair, 0)
+                    # Each pair appears twice in _fitness_score()
+                    fitness += 2 * count ** 2
+                    together[pair] = count + 1
+        return fitness, together
+
+    def _set_fitness(self, games, include_these_games=False):
+        """
+        Calculate a total fitness score for this set of games.
+
+        See GameSeeder._set_fitness().
+        """
+        fitness, _ = self._boards_fitness([self._indices(g) for g in games], include_these_games)
+        return fitness
+
+    def _pair_squares(self):
+        """
+        Returns the squares of the number of games each pair of players has shared.
+
+        See GameSeeder._pair_squares().
+        """
+        n = len(self.players)
+        return (self._pair_counts[:n, :n] ** 2).tolist()
+
+    def _improve_fitness(self, games, include_these_games=False):
+        """
+        Try to modify a list of games to find a better set.
+
+        See GameSeeder._improve_fitness().
+        """
+        boards = [self._indices(g) for g in games]
+        n = len(self.players)
+        squares = self._pair_counts[:n, :n] ** 2
+        fitness, together = self._boards_fitness(boards, include_these_games)
+        best_boards = [board.copy() for board in boards]
+        best_fitness = fitness
+        # There's nothing to do if we only have one game
+        if len(boards) >= 2:
+            # The more iterations, the better the result, but the longer it takes
+            for _ in range(self.iterations):
+                # Try swapping a random player between two random games
+                b1, b2 = random.sample(boards, 2)
+                # Pick a player from each game that isn't also playing the other
+                i1 = random.choice([i for i, p in enumerate(b1) if p not in b2])
+                i2 = random.choice([i for i, p in enumerate(b2) if p not in b1])
+                p1 = b1[i1]
+                p2 = b2[i2]
+                rest1 = b1[:i1] + b1[i1 + 1:]
+                rest2 = b2[:i2] + b2[i2 + 1:]
+                # Each pair appears twice in _fitness_score()
+                fitness += 2 * int(squares[p2, rest1].sum()
+                                   - squares[p1, rest1].sum()
+                                   + squares[p1, rest2].sum()
+                                   - squares[p2, rest2].sum())
+                if include_these_games:
+                    fitness += self._together_delta(together, p1, rest1, -1)
+                    fitness += self._together_delta(together, p2, rest1, 1)
+                    fitness += self._together_delta(together, p2, rest2, -1)
+                    fitness += self._together_delta(together, p1, rest2, 1)
+                b1[i1] = p2
+                b2[i2] = p1
+                if fitness < best_fitness:
+                    best_fitness = fitness
+                    best_boards = [board.copy() for board in boards]
+                    if best_fitness == 0:
+                        # A perfect score cannot be improved further.
+                        break
+        return [set(self.players[i] for i in board) for board in best_boards], best_fitness
@@ -18,10 +18,9 @@
 Game Views for the Diplomacy Tournament Visualiser.
 """
 
-import io
-
-import matplotlib.figure as figure
+from asgiref.sync import sync_to_async
 
+from django.conf import settings
 from django.contrib.auth.decorators import permission_required
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -34,18 +33,21 @@ from django.shortcuts import render
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
-from tournament import backstabbr, webdip
+from tournament import backstabbr, graphs, live, webdip
+from tournament.board_history import BoardHistory
 from tournament.diplomacy import (FIRST_YEAR, TOTAL_SCS, GreatPower,
-                                  SupplyCentre)
+                                  SupplyCentre, reference_data)
 from tournament.forms import (BaseSCCountFormset, BaseSCOwnerFormset,
                               DeathYearForm, DrawForm, GameEndedForm,
                               GameImageForm, SCCountForm, SCOwnerForm)
 from tournament.models import (CentreCount, DrawProposal, Game, GamePlayer,
                                SCOwnershipsNotFound, Seasons,
-                               SupplyCentreOwnership)
+                               SupplyCentreOwnership, deferred_score_updates)
 from tournament.news import news
 from tournament.round_views import create_games
-from tournament.tournament_views import (get_modifiable_tournament_or_404,
+from tournament.tournament_views import (add_live_url, conditional_view,
+                                         event_stream, game_etag,
+                                         get_modifiable_tournament_or_404,
                                          get_visible_tournament_or_404)
 
 # Redirect times are specified in seconds
@@ -66,6 +68,7 @@ def get_game_or_404(tournament, game_name):
         raise Http404 from e
 
 
+@conditional_view(game_etag)
 def game_simple(request, tournament_id, game_name, template):
     """Just render the specified template with the game"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
@@ -90,6 +93,7 @@ def aar(request, tournament_id, game_name, player_id):
     return render(request, 'games/aar.html', context)
 
 
+@conditional_view(game_etag)
 def game_sc_owners(request,
                    tournament_id,
                    game_name,
@@ -101,34 +105,31 @@ def game_sc_owners(request,
     # No point in refreshing the page if the Game is over
     if g.is_finished and (redirect_url_name == 'game_sc_owners_refresh'):
         refresh = False
-    scs = SupplyCentre.objects.all()
-    scos = g.supplycentreownership_set.select_related('owner').order_by()
+    history = BoardHistory(g)
     # Create a list of years that have been played, starting with the most recent
-    years = g.years_played()
+    years = history.years()
     years.reverse()
-    context = {'game': g, 'centres': scs}
+    context = {'game': g, 'centres': history.centres}
     # If we don't have ownership data for the current year,
     # and we're refreshing to somewhere else, just move straight along
     this_year = years[0]
     if (refresh
             and redirect_url_name != 'game_sc_owners_refresh'
-            and not scos.filter(year=this_year).exists()):
+            and not history.has_ownerships(this_year)):
         context['rows'] = []
         context['refresh'] = True
         context['redirect_time'] = 0
         context['redirect_url'] = reverse(redirect_url_name,
                                           args=(tournament_id, game_name))
         return render(request, 'games/sc_owners.html', context)
-    set_powers = g.the_set.setpower_set.all()
     power_to_colour = {}
-    for o in set_powers.select_related('power'):
+    for o in reference_data.set_powers(g.the_set_id):
         power_to_colour[o.power] = o.colour
     # Create a list of rows, each with a year and each supply centre's owner
     rows = []
     issues = []
     for year in years:
-        yscos = scos.filter(year=year)
-        if not yscos:
+        if not history.has_ownerships(year):
             # This year we have no data
             no_data_str = '?'
         else:
@@ -136,19 +137,17 @@ def game_sc_owners(request,
             no_data_str = '-'
         row = []
         row.append(year)
-        for sc in scs:
-            try:
-                sco = yscos.get(sc=sc)
-            except SupplyCentreOwnership.DoesNotExist:
+        for owner in history.owners(year):
+            if owner is None:
                 # This is presumably because the centre was still neutral
                 row.append({'color': 'white', 'text': no_data_str})
             else:
-                row.append({'color': power_to_colour[sco.owner],
-                            'text': _(sco.owner.abbreviation)})
+                row.append({'color': power_to_colour[owner],
+                            'text': _(owner.abbreviation)})
         rows.append(row)
         #try:
         #    # Check for any problems, and add them to the list
-        #    issues += g.compare_sc_counts_and_ownerships(year)
+        #    issues += g.compare_sc_counts_and_ownerships(year, history)
         #except SCOwnershipsNotFound:
         #    # We have no ownership data for this year, which is fine
         #    pass
@@ -159,9 +158,11 @@ def game_sc_owners(request,
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name,
                                           args=(tournament_id, game_name))
+        add_live_url(context, redirect_url_name, 'game_sc_owners_refresh', tournament_id, game_name)
     return render(request, 'games/sc_owners.html', context)
 
 
+@conditional_view(game_etag)
 def game_sc_chart(request,
                   tournament_id,
                   game_name,
@@ -175,29 +176,22 @@ def game_sc_chart(request,
         refresh = False
     # Template relies on set_powers and ps having the same ordering
     # TODO Sort alphabetically by translated power.name
-    set_powers = g.the_set.setpower_set.order_by('power__name').select_related('power')
+    set_powers = reference_data.set_powers(g.the_set_id)
     ps = g.gameplayer_set.order_by('power__name')
     # We might have GamePlayers but without powers assigned
     if ps.first() and not ps.first().power:
         # Just pass an empty list to the template
         ps = []
-    scs = g.centrecount_set.order_by()
+    history = BoardHistory(g, powers=[sp.power for sp in set_powers])
     # Create a list of years that have been played, starting with the most recent
-    years = g.years_played()
+    years = history.years()
     years.reverse()
     # Create a list of rows, each with a year and each power's SC count
     rows = []
     for year in years:
-        yscs = scs.filter(year=year)
-        row = []
-        row.append(year)
-        for sp in set_powers:
-            try:
-                sc = yscs.get(power=sp.power)
-                row.append(sc.count)
-            except CentreCount.DoesNotExist:
-                row.append('?')
-        neutrals = g.neutrals(year)
+        row = [year]
+        row += ['?' if count is None else count for count in history.counts(year)]
+        neutrals = history.neutrals(year)
         if neutrals == TOTAL_SCS:
             neutrals = '?'
         row.append(neutrals)
@@ -208,58 +202,31 @@ def game_sc_chart(request,
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name,
                                           args=(tournament_id, game_name))
+        add_live_url(context, redirect_url_name, 'game_sc_chart_refresh', tournament_id, game_name)
     return render(request, 'games/sc_count.html', context)
 
 
-def _map_to_fg(colour):
-    """
-    Map the (background) colours of SetPower to colours suitable for foregound (on a white background)
-    """
-    MAP = {'grey': 'black',
-           'white': 'grey'}
-    return MAP.get(colour, colour)
-
-
-def _graph_end_year(game):
-    """Determine a suitable end for the X-axis of the graph for the game"""
-    if game.is_finished:
-        return game.final_year()
-    if game.the_round.final_year:
-        return game.the_round.final_year
-    if game.final_year() > 1907:
-        return game.final_year()
-    return 1907
-
-
+@conditional_view(game_etag)
 def graph(request,
           tournament_id,
           game_name):
     """Just an SC centre graph for the specified game, as a PNG image"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
     g = get_game_or_404(t, game_name)
-    with io.BytesIO() as f:
-        # plot the SC counts
-        fig = figure.Figure()
-        ax = fig.subplots()
-        for power in GreatPower.objects.all():
-            colour = _map_to_fg(g.the_set.setpower_set.get(power=power).colour)
-            year_dots = [(cc.year, cc.count) for cc in g.centrecount_set.filter(power=power).order_by('year')]
-            # X-axis is year, y-axis is SC count. Colour by power
-            ax.plot([y for y, c in year_dots],
-                    [c for y, c in year_dots],
-                    label=_(power.name),
-                    color=colour,
-                    linewidth=2)
-        ax.axis([1900, _graph_end_year(g), 0, 18])
-        ax.set_xlabel(_('Year'))
-        ax.set_ylabel(_('Centres'))
-        ax.legend(loc='upper left')
-        fig.savefig(f, format='png')
-        graphic = f.getvalue()
-    response = HttpResponse(graphic, content_type="image/png")
-    return response
+    return HttpResponse(graphs.game_graph(g), content_type="image/png")
+
+
+@conditional_view(game_etag)
+def graph_data(request,
+               tournament_id,
+               game_name):
+    """The data for the SC graph for the specified game, as JSON, for the browser to draw"""
+    t = get_visible_tournament_or_404(tournament_id, request.user)
+    g = get_game_or_404(t, game_name)
+    return HttpResponse(graphs.game_graph_json(g), content_type='application/json')
 
 
+@conditional_view(game_etag)
 def game_sc_graph(request,
                   tournament_id,
                   game_name,
@@ -271,12 +238,14 @@ def game_sc_graph(request,
     # No point in refreshing the page if the Game is over
     if g.is_finished and (redirect_url_name == 'game_sc_graph_refresh'):
         refresh = False
-    context = {'game': g}
+    context = {'game': g,
+               'draw_in_browser': settings.DRAW_GRAPHS_IN_BROWSER}
     if refresh:
         context['refresh'] = True
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name,
                                           args=(tournament_id, game_name))
+        add_live_url(context, redirect_url_name, 'game_sc_graph_refresh', tournament_id, game_name)
     return render(request, 'games/sc_graph.html', context)
 
 
@@ -293,6 +262,16 @@ def _blank_row_num(queryset, final_year):
     return years_to_go
 
 
+async def game_events(request, tournament_id, game_name):
+    """Server-sent events telling display screens that a game has changed"""
+    def get_game():
+        t = get_visible_tournament_or_404(tournament_id, request.user)
+        return get_game_or_404(t, game_name)
+
+    g = await sync_to_async(get_game)()
+    return event_stream(live.game_channel(g.pk))
+
+
 @permission_required('tournament.change_game')
 def change_game(request, tournament_id, game_name):
     """Provide a form to change a single game"""
@@ -302,6 +281,7 @@ def change_game(request, tournament_id, game_name):
 
 
 @permission_required('tournament.add_centrecount')
+@deferred_score_updates()
 def sc_owners(request, tournament_id, game_name):
     """Provide a form to enter SC ownership for a game"""
     t = get_modifiable_tournament_or_404(tournament_id, request.user)
@@ -329,7 +309,7 @@ def sc_owners(request, tournament_id, game_name):
                 with transaction.atomic():
                     for name, value in form.cleaned_data.items():
                         try:
-                            dot = SupplyCentre.objects.get(name=name)
+                            dot = reference_data.supply_centre(name=name)
                         except SupplyCentre.DoesNotExist:
                             continue
                         if value is None:
@@ -362,6 +342,7 @@ def sc_owners(request, tournament_id, game_name):
 
 
 @permission_required('tournament.add_centrecount')
+@deferred_score_updates()
 def sc_counts(request, tournament_id, game_name):
     """Provide a form to enter SC counts for a game"""
     t = get_modifiable_tournament_or_404(tournament_id, request.user)
@@ -401,7 +382,7 @@ def sc_counts(request, tournament_id, game_name):
                                     # No SC count provided for this GreatPower
                                     continue
                                 try:
-                                    power = GreatPower.objects.get(name=name)
+                                    power = reference_data.great_power(name=name)
                                 except GreatPower.DoesNotExist:
                                     continue
                                 # Can't use update_or_create() because we need to call full_clean()
@@ -430,7 +411,7 @@ def sc_counts(request, tournament_id, game_name):
                         if value is None:
                             continue
                         try:
-                            power = GreatPower.objects.get(name=name)
+                            power = reference_data.great_power(name=name)
                         except GreatPower.DoesNotExist:
                             continue
                         try:
@@ -707,9 +688,9 @@ def _bs_ownerships_to_sco(game, year, sc_ownership):
     """
     for k, v in sc_ownership.items():
         # Map k to SupplyCentre (assuming backstabbr.DOTS match SupplyCentre abbreviations)
-        sc = SupplyCentre.objects.get(abbreviation__iexact=k)
+        sc = reference_data.supply_centre(abbreviation=k)
         # Map v to GreatPower (assuming that backstabbr.POWERS all start with the appropriate abbreviation)
-        power = GreatPower.objects.get(abbreviation=v[0])
+        power = reference_data.great_power(abbreviation=v[0])
         SupplyCentreOwnership.objects.update_or_create(game=game,
                                                        year=year,
                                                        sc=sc,
@@ -723,7 +704,7 @@ def _sc_counts_to_cc(game, year, sc_counts):
     with transaction.atomic():
         for k, v in sc_counts.items():
             # Map k to GreatPower (assuming that backstabbr.POWERS and webdip.POWERS all start with the appropriate abbreviation)
-            power = GreatPower.objects.get(abbreviation=k[0])
+            power = reference_data.great_power(abbreviation=k[0])
             CentreCount.objects.update_or_create(power=power,
                                                  game=game,
                                                  year=year,
@@ -817,6 +798,7 @@ def _scrape_webdip(request, tournament, game, webdip_game):
 
 
 @permission_required('tournament.add_centrecount')
+@deferred_score_updates()
 def scrape_external_site(request, tournament_id, game_name):
     """Import CentreCounts from another site"""
     t = get_modifiable_tournament_or_404(tournament_id, request.user)
@@ -844,25 +826,28 @@ def scrape_external_site(request, tournament_id, game_name):
     raise Http404('External site is not backstabbr or webdiplomacy')
 
 
+@conditional_view(game_etag)
 def api(request, version, tournament_id, game_name):
     """JSON API to retrieve data"""
     if version != 1:
         raise Http404(f'Invalid API version {version}')
     t = get_visible_tournament_or_404(tournament_id, request.user)
     g = get_game_or_404(t, game_name)
+    history = BoardHistory(g)
     sc_chart = {}
     sc_owners = {}
-    for year in g.years_played():
+    for year in history.years():
         sc_chart[year] = {}
-        for sc in g.centrecount_set.filter(year=year).order_by():
-            sc_chart[year][sc.power.name] = sc.count
-        scos = g.supplycentreownership_set.filter(year=year)
-        if scos:
+        for power, count in zip(history.powers, history.counts(year)):
+            if count is not None:
+                sc_chart[year][power.name] = count
+        if history.has_ownerships(year):
             sc_owners[year] = {}
-            for power in GreatPower.objects.all():
+            for power in history.powers:
                 sc_owners[year][power.name] = []
-            for sco in scos:
-                sc_owners[year][sco.owner.name].append(sco.sc.name)
+            for sc, owner in zip(history.centres, history.owners(year)):
+                if owner is not None:
+                    sc_owners[year][owner.name].append(sc.name)
     # include any passed DrawProposal
     dp = g.passed_draw()
     if dp:
@@ -0,0 +1,256 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Supply Centre graphs for Games and score graphs for Tournaments.
+
+Drawing a graph with matplotlib is slow, and display screens ask for the
+same graph over and over, so rendered PNGs are kept in Django's default cache.
+The data behind each graph can also be fetched as JSON, for the browser to
+draw it instead, and that is cached too.
+The cache keys include the data version and the language, so a graph is
+drawn again after any change to the data it shows.
+"""
+
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.figure as figure
+import matplotlib.pyplot as plt
+import matplotlib.ticker as ticker
+from matplotlib.colors import to_hex
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.dispatch import receiver
+from django.utils import translation
+from django.utils.translation import gettext as _
+
+from tournament.board_history import BoardHistory
+from tournament.diplomacy import reference_data
+from tournament.models import (Game, GameVersion, Tournament,
+                               TournamentVersion, data_versions_changed)
+
+# How long to keep rendered graphs, in seconds
+GRAPH_CACHE_TIME = 24 * 60 * 60
+
+# Thread pool to draw graphs in the background, created when first needed
+_graph_pool = None
+_graph_pool_lock = threading.Lock()
+
+
+def _map_to_fg(colour):
+    """
+    Map the (background) colours of SetPower to colours suitable for foregound (on a white background)
+    """
+    MAP = {'grey': 'black',
+           'white': 'grey'}
+    return MAP.get(colour, colour)
+
+
+def _graph_end_year(game):
+    """Determine a suitable end for the X-axis of the graph for the game"""
+    if game.is_finished:
+        return game.final_year()
+    if game.the_round.final_year:
+        return game.the_round.final_year
+    if game.final_year() > 1907:
+        return game.final_year()
+    return 1907
+
+
+def game_graph_data(game):
+    """
+    Return the series for the SC count graph for the Game.
+
+    Returns a dict with the x-axis values (years), axis limits and labels,
+    and a list of series, one per GreatPower, each with a label, a colour,
+    and a list of values matching the x-axis values (None where there is no count).
+    """
+    colours = {sp.power_id: _map_to_fg(sp.colour) for sp in reference_data.set_powers(game.the_set_id)}
+    history = BoardHistory(game)
+    years = history.years()
+    series = []
+    for power in history.powers:
+        series.append({'label': _(power.name),
+                       'colour': colours.get(power.pk),
+                       'values': [history.count(power, year) for year in years]})
+    return {'x': years,
+            'x_min': 1900,
+            'x_max': _graph_end_year(game),
+            'y_max': 18,
+            'x_label': _('Year'),
+            'y_label': _('Centres'),
+            'series': series}
+
+
+def tournament_graph_data(tournament):
+    """
+    Return the series for the score graph for the Tournament.
+
+    As for game_graph_data(), with the x-axis values being round numbers
+    and one series per player.
+    """
+    rounds = tournament.round_set.all()
+    all_scores = {}
+    for tp in tournament.tournamentplayer_set.order_by('player').select_related('player'):
+        all_scores[tp.player] = [None] * len(rounds)
+    max_score = 0.0
+    standings = tournament.standings()
+    for n, r in enumerate(rounds):
+        if r.show_scores():
+            for p, (rank, score) in standings.get(r, {}).items():
+                all_scores[p][n] = score
+                if rank == 1:
+                    max_score = score
+    # This gives us 40 distinct colors
+    colours = [to_hex(c) for c in plt.get_cmap('tab20b').colors + plt.get_cmap('tab20c').colors]
+    series = []
+    for n, (player, scores) in enumerate(all_scores.items()):
+        series.append({'label': str(player),
+                       'colour': colours[n % len(colours)],
+                       'values': scores})
+    return {'x': list(range(1, len(rounds) + 1)),
+            'x_min': 1,
+            'x_max': len(rounds),
+            'y_max': max_score,
+            'x_label': _('Round'),
+            'y_label': _('Score'),
+            'series': series}
+
+
+def _render_graph(data, **legend_kwargs):
+    """Draw a graph of the data from game_graph_data() or tournament_graph_data(). Returns PNG data"""
+    with io.BytesIO() as f:
+        fig = figure.Figure()
+        ax = fig.subplots()
+        for s in data['series']:
+            # Leave out the gaps, joining up the values either side
+            points = [(x, v) for x, v in zip(data['x'], s['values']) if v is not None]
+            ax.plot([x for x, v in points],
+                    [v for x, v in points],
+                    label=s['label'],
+                    color=s['colour'],
+                    linewidth=2)
+        ax.axis([data['x_min'], data['x_max'], 0, data['y_max']])
+        # Ticks at whole numbers
+        ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
+        ax.set_xlabel(data['x_label'])
+        ax.set_ylabel(data['y_label'])
+        ax.legend(**legend_kwargs)
+        # Save it, auto-expanding the area to include the legend
+        fig.savefig(f, format='png', bbox_inches='tight')
+        return f.getvalue()
+
+
+def render_game_graph(game):
+    """Draw the SC count graph for the Game. Returns PNG data"""
+    return _render_graph(game_graph_data(game), loc='upper left')
+
+
+def render_tournament_graph(tournament):
+    """Draw the score graph for the Tournament. Returns PNG data"""
+    # Place the legend to the right of the graph
+    return _render_graph(tournament_graph_data(tournament), bbox_to_anchor=(1.04, 1), borderaxespad=0)
+
+
+def _cached(key, create):
+    """Return the value cached with the specified key, calling create() to create it if needed"""
+    value = cache.get(key)
+    if value is None:
+        value = create()
+        cache.set(key, value, GRAPH_CACHE_TIME)
+    return value
+
+
+def _game_key(kind, game):
+    """Cache key for something derived from the Game's data, in the current language"""
+    # The end of the X-axis can come from the Round, so the Tournament's version matters too.
+    # Versions must be read before the data, so nothing is ever cached as newer than it is
+    tv = TournamentVersion.for_tournament(game.the_round.tournament_id)
+    gv = GameVersion.for_game(game.the_round.tournament_id, game.name)
+    return f'{kind}-game-{game.pk}-{tv.version}.{gv.version}-{translation.get_language()}'
+
+
+def _tournament_key(kind, tournament):
+    """Cache key for something derived from the Tournament's data, in the current language"""
+    tv = TournamentVersion.for_tournament(tournament.pk)
+    return f'{kind}-tournament-{tournament.pk}-{tv.version}-{translation.get_language()}'
+
+
+def game_graph(game):
+    """
+    Return the SC count graph for the Game, as PNG data.
+
+    The graph is drawn only if it isn't already in the cache.
+    """
+    return _cached(_game_key('graph', game), lambda: render_game_graph(game))
+
+
+def tournament_graph(tournament):
+    """
+    Return the score graph for the Tournament, as PNG data.
+
+    The graph is drawn only if it isn't already in the cache.
+    """
+    return _cached(_tournament_key('graph', tournament), lambda: render_tournament_graph(tournament))
+
+
+def game_graph_json(game):
+    """Return game_graph_data() for the Game as JSON, from the cache if possible"""
+    return _cached(_game_key('graph-data', game), lambda: json.dumps(game_graph_data(game)))
+
+
+def tournament_graph_json(tournament):
+    """Return tournament_graph_data() for the Tournament as JSON, from the cache if possible"""
+    return _cached(_tournament_key('graph-data', tournament),
+                   lambda: json.dumps(tournament_graph_data(tournament)))
+
+
+def _prerender_graphs(tournament_ids, game_ids):
+    """Draw the graphs for the specified Tournaments and Games, in the default language"""
+    try:
+        # Use the language that LocaleMiddleware would pick when the browser doesn't specify one
+        with translation.override(translation.get_supported_language_variant(settings.LANGUAGE_CODE)):
+            for g in Game.objects.filter(pk__in=game_ids).select_related('the_round', 'the_set'):
+                game_graph(g)
+                game_graph_json(g)
+            for t in Tournament.objects.filter(pk__in=tournament_ids):
+                tournament_graph(t)
+                tournament_graph_json(t)
+    finally:
+        # Each thread has its own database connection
+        connection.close()
+
+
+def _graph_thread_pool():
+    """Returns the thread pool used to draw graphs in the background"""
+    global _graph_pool
+    with _graph_pool_lock:
+        if _graph_pool is None:
+            _graph_pool = ThreadPoolExecutor(max_workers=settings.GRAPH_PRERENDER_WORKERS,
+                                             thread_name_prefix='graphs')
+        return _graph_pool
+
+
+@receiver(data_versions_changed)
+def _prerender_changed_graphs(sender, tournament_ids, game_ids, **kwargs):
+    """Draw the graphs for changed Tournaments and Games in the background, if configured to"""
+    if settings.GRAPH_PRERENDER_WORKERS:
+        _graph_thread_pool().submit(_prerender_graphs, set(tournament_ids), set(game_ids))
@@ -0,0 +1,102 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Live updates for display screens.
+
+Pages that would otherwise reload themselves on a timer instead listen
+for server-sent events on a channel for their Tournament or Game, and
+only reload when something on that channel has changed.
+
+Listeners are held in-process, so a change is only pushed to screens
+connected to the same server process that saved it.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+
+# Seconds between comments sent to keep idle connections open
+KEEPALIVE_TIME = 30
+
+# Set of (event loop, asyncio.Event) 2-tuples, keyed by channel name
+_listeners = defaultdict(set)
+_listeners_lock = threading.Lock()
+
+
+def tournament_channel(tournament_id):
+    """Name of the channel for changes to a Tournament"""
+    return f'tournament-{tournament_id}'
+
+
+def game_channel(game_id):
+    """Name of the channel for changes to a Game"""
+    return f'game-{game_id}'
+
+
+def publish(*channels):
+    """
+    Wake every listener on the specified channels
+
+    Changes should only be published once they have been committed.
+    """
+    with _listeners_lock:
+        targets = set()
+        for channel in channels:
+            targets |= _listeners.get(channel, set())
+    for loop, event in targets:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The listener's event loop has been closed
+            pass
+
+
+def listener_count(channel):
+    """How many listeners are there on the channel?"""
+    with _listeners_lock:
+        return len(_listeners.get(channel, ()))
+
+
+async def events(channel, keepalive_time=KEEPALIVE_TIME):
+    """
+    Asynchronous generator of server-sent events for a channel.
+
+    Yields a 'change' event whenever the channel is published to.
+    Changes that happen while an event is being sent are combined into one.
+    Yields a comment every keepalive_time seconds when nothing has changed.
+    Runs until the client disconnects.
+    """
+    loop = asyncio.get_running_loop()
+    listener = (loop, asyncio.Event())
+    with _listeners_lock:
+        _listeners[channel].add(listener)
+    try:
+        # Tell the client how long to wait before reconnecting, in milliseconds
+        yield f'retry: {keepalive_time * 1000}\n\n'
+        while True:
+            try:
+                await asyncio.wait_for(listener[1].wait(), keepalive_time)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            listener[1].clear()
+            yield f'event: change\ndata: {channel}\n\n'
+    finally:
+        with _listeners_lock:
+            _listeners[channel].discard(listener)
+            if not _listeners[channel]:
+                del _listeners[channel]
@@ -0,0 +1,42 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Management command to set the stored supply centre summary of existing GamePlayers.
+"""
+from django.core.management.base import BaseCommand
+
+from tournament.models import Game
+
+
+class Command(BaseCommand):
+    help = 'Sets the final supply centre count and elimination year stored in every GamePlayer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_ids',
+                            nargs='*',
+                            type=int,
+                            help='Only update Games in these Tournaments')
+
+    def handle(self, *args, **options):
+        games = Game.objects.order_by()
+        if options['tournament_ids']:
+            games = games.filter(the_round__tournament__in=options['tournament_ids'])
+        count = 0
+        for g in games.iterator():
+            g.update_gameplayer_sc_counts()
+            count += 1
+        self.stdout.write(f'Updated the GamePlayers of {count} games')
@@ -0,0 +1,250 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Management command to time every game and tournament scoring system.
+"""
+import json
+import platform
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from operator import attrgetter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tournament.diplomacy import GameSet, GreatPower
+from tournament.game_scoring import G_SCORING_SYSTEMS, GameBatch
+from tournament.game_scoring.synthetic_games import random_game_states
+from tournament.models import (NO_SCORING_SYSTEM_STR, T_SCORING_SYSTEMS, CentreCount,
+                               DrawSecrecy, Game, GamePlayer, Round, RoundPlayer,
+                               Tournament, TScoringWDC2025)
+from tournament.players import Player
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000]
+# TScoringWDC2025 needs four rounds
+NUM_ROUNDS = 4
+
+
+def _best_time(fn, repeat):
+    """Call fn() repeat times and return the fastest, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+
+class Command(BaseCommand):
+    help = 'Times every game and tournament scoring system, scoring randomly-generated games'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                            help='Numbers of games to score')
+        parser.add_argument('--tournament-sizes', nargs='+', type=int,
+                            help='Numbers of games in the tournaments to score (default is --sizes)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Number of timings to take of each, reporting the fastest')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed for the random game generator')
+        parser.add_argument('--system',
+                            help='Only time scoring systems whose name contains this string')
+        parser.add_argument('--skip-game', action='store_true',
+                            help="Don't time game scoring systems")
+        parser.add_argument('--skip-tournament', action='store_true',
+                            help="Don't time tournament scoring systems")
+        parser.add_argument('--output',
+                            help='File to write the JSON results to, instead of stdout')
+        parser.add_argument('--compare',
+                            help='JSON results file from an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.seed = options['seed']
+        self.system_filter = options['system']
+        powers = list(GreatPower.objects.all())
+        if not powers:
+            raise CommandError('No GreatPowers found')
+        self.powers = powers
+        self.starting_centres = {p: p.starting_centres for p in powers}
+        results = []
+        if not options['skip_game']:
+            for size in options['sizes']:
+                results += self._time_game_systems(size)
+        if not options['skip_tournament']:
+            for size in options['tournament_sizes'] or options['sizes']:
+                results += self._time_tournament_systems(size)
+        output = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'results': results,
+        }
+        text = json.dumps(output, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(text)
+        else:
+            self.stdout.write(text)
+        if options['compare']:
+            self._compare(options['compare'], results)
+
+    def _wanted(self, system):
+        """Should the specified scoring system be timed?"""
+        return (self.system_filter is None) or (self.system_filter in system.name)
+
+    def _result(self, kind, system, method, size, seconds):
+        return {
+            'kind': kind,
+            'system': str(system.name),
+            'method': method,
+            'games': size,
+            'seconds': seconds,
+        }
+
+    def _time_game_systems(self, size):
+        """Time scoring size random games with every GameScoringSystem"""
+        results = []
+        states = random_game_states(size, self.powers, self.seed, self.starting_centres)
+        batch = GameBatch.from_states(states)
+        for system in G_SCORING_SYSTEMS:
+            if not self._wanted(system):
+                continue
+
+            def score_each():
+                for s in states:
+                    system.scores(s)
+
+            results.append(self._result('game', system, 'scores', size,
+                                        _best_time(score_each, self.repeat)))
+            results.append(self._result('game', system, 'batch_scores', size,
+                                        _best_time(lambda: system.batch_scores(batch), self.repeat)))
+        return results
+
+    def _time_tournament_systems(self, size):
+        """Time scoring a tournament of size random games with every TournamentScoringSystem"""
+        results = []
+        with transaction.atomic():
+            t, rps = self._create_tournament(size)
+            round_players = RoundPlayer.objects.filter(the_round__tournament=t)
+            round_scores_saved = False
+            # Time the systems that use Game scores first, while the RoundPlayer scores are still zero
+            for system in sorted(T_SCORING_SYSTEMS, key=attrgetter('uses_round_scores')):
+                if not self._wanted(system):
+                    continue
+                if system.uses_round_scores and not round_scores_saved:
+                    RoundPlayer.objects.bulk_update(rps, ['score'])
+                    round_scores_saved = True
+                results.append(self._result('tournament', system, 'scores', size,
+                                            _best_time(lambda: system.scores(round_players), self.repeat)))
+                if isinstance(system, TScoringWDC2025):
+                    early_rps = round_players.exclude(the_round=t.round_numbered(NUM_ROUNDS))
+                    early_scores = system._early_scores(early_rps)
+                    # _top21() needs at least 22 players
+                    if len(early_scores) > 21:
+                        results.append(self._result('tournament', system, '_top21', size,
+                                                    _best_time(lambda: system._top21(early_scores, t), self.repeat)))
+            # Leave the database as we found it
+            transaction.set_rollback(True)
+        return results
+
+    def _create_tournament(self, num_games):
+        """
+        Create a Tournament with num_games random Games, spread over NUM_ROUNDS Rounds.
+
+        Everything but the Tournament uses bulk_create(), so none of the usual save() processing happens.
+        GamePlayer scores and centre counts are set directly from the randomly-generated game states.
+        Returns a 2-tuple of the Tournament and a list of RoundPlayers.
+        The RoundPlayers are saved with zero scores, as they would be for a tournament
+        that uses Game scores, but their score attributes are set to their round scores.
+        """
+        the_set = GameSet.objects.first()
+        if the_set is None:
+            raise CommandError('No GameSets found')
+        rng = random.Random(self.seed)
+        g_system = G_SCORING_SYSTEMS[0]
+        today = date.today()
+        t = Tournament.objects.create(name=f'Benchmark {num_games}',
+                                      start_date=today,
+                                      end_date=today,
+                                      tournament_scoring_system=T_SCORING_SYSTEMS[0].name,
+                                      round_scoring_system=NO_SCORING_SYSTEM_STR,
+                                      draw_secrecy=DrawSecrecy.SECRET)
+        start = datetime.now(timezone.utc)
+        rounds = Round.objects.bulk_create([Round(tournament=t,
+                                                  scoring_system=g_system.name,
+                                                  dias=True,
+                                                  start=start + timedelta(hours=n),
+                                                  round_number=n + 1)
+                                            for n in range(NUM_ROUNDS)])
+        games_per_round = [num_games // NUM_ROUNDS + (1 if n < num_games % NUM_ROUNDS else 0)
+                           for n in range(NUM_ROUNDS)]
+        num_players = len(self.powers) * max(games_per_round)
+        players = Player.objects.bulk_create([Player(first_name='Benchmark', last_name=f'Player {n}')
+                                              for n in range(num_players)])
+        games = []
+        for r, count in zip(rounds, games_per_round):
+            games += [Game(name=f'R{r.pk}G{n}', the_round=r, the_set=the_set) for n in range(count)]
+        games = Game.objects.bulk_create(games)
+        states = random_game_states(num_games, self.powers, self.seed, self.starting_centres)
+        rps = []
+        round_scores = []
+        gps = []
+        ccs = []
+        game_iter = iter(zip(games, states))
+        for r, count in zip(rounds, games_per_round):
+            rng.shuffle(players)
+            seated = iter(players)
+            for _ in range(count):
+                g, state = next(game_iter)
+                scores = g_system.scores(state)
+                for p in self.powers:
+                    player = next(seated)
+                    rps.append(RoundPlayer(player=player, the_round=r))
+                    round_scores.append(scores[p])
+                    year, dots = state.last_full_year(), state.dot_count(p)
+                    gps.append(GamePlayer(player=player,
+                                          game=g,
+                                          power=p,
+                                          score=scores[p],
+                                          final_scs=dots,
+                                          year_eliminated=year if dots == 0 else None))
+                    ccs.append(CentreCount(power=p, game=g, year=year, count=dots))
+        rps = RoundPlayer.objects.bulk_create(rps)
+        GamePlayer.objects.bulk_create(gps)
+        CentreCount.objects.bulk_create(ccs)
+        for rp, score in zip(rps, round_scores):
+            rp.score = score
+        return t, rps
+
+    def _compare(self, filename, results):
+        """Report how each result compares with the same measurement in an earlier run"""
+        with open(filename) as f:
+            earlier = json.load(f)['results']
+        old_times = {(r['kind'], r['system'], r['method'], r['games']): r['seconds'] for r in earlier}
+        for r in results:
+            key = (r['kind'], r['system'], r['method'], r['games'])
+            old = old_times.get(key)
+            if not old:
+                continue
+            self.stderr.write(f"{r['kind']:10} {r['system'][:50]:50} {r['method']:12} {r['games']:6} "
+                              f"{old:10.6f} -> {r['seconds']:10.6f} ({r['seconds'] / old:.2f}x)")
@@ -0,0 +1,202 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Management command to time every game seeding method, and record how good its seedings are.
+"""
+import io
+import json
+import platform
+import random
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.game_seeder import ArrayGameSeeder, GameSeeder, SeedMethod
+
+DEFAULT_SIZES = [21, 49, 105, 203, 350]
+DEFAULT_PRIOR_ROUNDS = [1, 4, 8]
+POWERS = ['A', 'E', 'F', 'G', 'I', 'R', 'T']
+TEAM_SIZE = 3
+
+
+class Command(BaseCommand):
+    help = 'Times every game seeding method, seeding randomly-generated tournaments, and reports the fitness of the seedings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                            help='Numbers of players in the tournaments to seed')
+        parser.add_argument('--prior-rounds', nargs='+', type=int, default=DEFAULT_PRIOR_ROUNDS,
+                            help='Numbers of rounds already played in the tournaments to seed')
+        parser.add_argument('--methods', nargs='+', choices=[m.name for m in SeedMethod],
+                            default=[m.name for m in SeedMethod],
+                            help='Seeding methods to time')
+        parser.add_argument('--array', action='store_true',
+                            help='Use ArrayGameSeeder rather than GameSeeder')
+        parser.add_argument('--starts', type=int, default=10,
+                            help='Number of starts for the RANDOM and BOARD methods')
+        parser.add_argument('--iterations', type=int, default=1000,
+                            help='Number of iterations for the RANDOM and ANNEAL methods')
+        parser.add_argument('--time-limit', type=float, default=10.0,
+                            help='Time limit in seconds for the EXHAUSTIVE, BOARD and ANNEAL methods')
+        parser.add_argument('--biases', type=int,
+                            help='Number of random pairs of players to keep apart (default is one per 20 players)')
+        parser.add_argument('--teams', type=int,
+                            help=f'Number of teams of {TEAM_SIZE} players to keep apart (default is one per 21 players)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed for the random tournament generator and the seeders')
+        parser.add_argument('--skip-memory', action='store_true',
+                            help="Don't measure peak memory use (which means seeding everything a second time)")
+        parser.add_argument('--output',
+                            help='File to write the JSON results to, instead of stdout')
+        parser.add_argument('--compare',
+                            help='JSON results file from an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.seed = options['seed']
+        self.seeder_class = ArrayGameSeeder if options['array'] else GameSeeder
+        if min(options['sizes']) < len(POWERS):
+            raise CommandError(f'Tournaments need at least {len(POWERS)} players')
+        results = []
+        for size in options['sizes']:
+            for prior_rounds in options['prior_rounds']:
+                for method in options['methods']:
+                    results.append(self._benchmark(size, prior_rounds, SeedMethod[method]))
+        output = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seeder': self.seeder_class.__name__,
+            'seed': self.seed,
+            'starts': options['starts'],
+            'iterations': options['iterations'],
+            'time_limit': options['time_limit'],
+            'results': results,
+        }
+        text = json.dumps(output, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(text)
+        else:
+            self.stdout.write(text)
+        if options['compare']:
+            self._compare(options['compare'], results)
+
+    def _benchmark(self, size, prior_rounds, method):
+        """Seed one round of a random tournament with the specified seeding method"""
+        sitters, doublers = self._sitters_and_doublers(size)
+        seeder, sitting, doubling = self._create_seeder(size, prior_rounds, method, sitters, doublers)
+        # Results should be repeatable, and unaffected by the seeders' printing
+        random.seed(self.seed)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            games = seeder.seed_games(omitting_players=sitting, players_doubling_up=doubling)
+            seconds = time.perf_counter() - start
+        fitness = int(seeder._set_fitness(games))
+        peak_memory = None
+        if not self.options['skip_memory']:
+            # tracemalloc slows everything down, so measure memory with a second identical seeding
+            seeder, sitting, doubling = self._create_seeder(size, prior_rounds, method, sitters, doublers)
+            random.seed(self.seed)
+            tracemalloc.start()
+            try:
+                with redirect_stdout(io.StringIO()):
+                    seeder.seed_games(omitting_players=sitting, players_doubling_up=doubling)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return {
+            'method': method.name,
+            'players': size,
+            'prior_rounds': prior_rounds,
+            'sitters': sitters,
+            'doublers': doublers,
+            'seconds': seconds,
+            'peak_memory': peak_memory,
+            'fitness': fitness,
+        }
+
+    def _sitters_and_doublers(self, size):
+        """
+        How many players should sit out or play two games, to get a whole number of boards.
+
+        Returns a 2-tuple of counts, at least one of which will be zero.
+        """
+        extra = size % len(POWERS)
+        if extra * 2 <= len(POWERS):
+            return extra, 0
+        return 0, len(POWERS) - extra
+
+    def _create_seeder(self, size, prior_rounds, method, sitters, doublers):
+        """
+        Create a seeder for a random tournament of size players with prior_rounds already played.
+
+        Some randomly-chosen pairs of players and teams are kept apart, and some randomly-chosen
+        players sat out of each earlier round.
+        Returns a 3-tuple of the seeder and the sets of players to sit out and to play two games.
+        """
+        options = self.options
+        rng = random.Random(f'{self.seed}-{size}-{prior_rounds}')
+        seeder = self.seeder_class(POWERS,
+                                   seed_method=method,
+                                   starts=options['starts'],
+                                   iterations=options['iterations'],
+                                   time_limit=options['time_limit'],
+                                   random_seed=self.seed)
+        players = [f'P{n}' for n in range(size)]
+        for p in players:
+            seeder.add_player(p)
+        for _ in range(prior_rounds):
+            rng.shuffle(players)
+            boards = size // len(POWERS)
+            for n in range(boards):
+                powers = POWERS[:]
+                rng.shuffle(powers)
+                seeder.add_played_game(set(zip(players[n * len(POWERS):(n + 1) * len(POWERS)], powers)))
+        pairs = set()
+        biases = size // 20 if options['biases'] is None else options['biases']
+        for _ in range(biases):
+            pairs.add(tuple(sorted(rng.sample(players, 2))))
+        rng.shuffle(players)
+        teams = size // 21 if options['teams'] is None else options['teams']
+        teams = min(teams, size // TEAM_SIZE)
+        for n in range(teams):
+            team = sorted(players[n * TEAM_SIZE:(n + 1) * TEAM_SIZE])
+            for i, p1 in enumerate(team):
+                for p2 in team[i + 1:]:
+                    pairs.add((p1, p2))
+        for p1, p2 in sorted(pairs):
+            seeder.add_bias(p1, p2)
+        rng.shuffle(players)
+        return seeder, set(players[:sitters]), set(players[sitters:sitters + doublers])
+
+    def _compare(self, filename, results):
+        """Report how each result compares with the same measurement in an earlier run"""
+        with open(filename) as f:
+            earlier = json.load(f)['results']
+        old_results = {(r['method'], r['players'], r['prior_rounds']): r for r in earlier}
+        for r in results:
+            old = old_results.get((r['method'], r['players'], r['prior_rounds']))
+            if not old:
+                continue
+            ratio = f"{r['seconds'] / old['seconds']:.2f}x" if old['seconds'] else '-'
+            self.stderr.write(f"{r['method']:10} {r['players']:4} {r['prior_rounds']:2} "
+                              f"{old['seconds']:10.4f} -> {r['seconds']:10.4f} ({ratio}) "
+                              f"fitness {old['fitness']:6} -> {r['fitness']:6}")
@@ -0,0 +1,41 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Management command to recalculate all the scores for one or more Tournaments.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.models import InvalidScoringSystem, Tournament
+
+
+class Command(BaseCommand):
+    help = 'Recalculates every Game, Round, and Tournament score for the specified Tournaments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_ids', nargs='+', type=int)
+
+    def handle(self, *args, **options):
+        for t_id in options['tournament_ids']:
+            try:
+                t = Tournament.objects.get(pk=t_id)
+            except Tournament.DoesNotExist:
+                raise CommandError(f'Tournament {t_id} does not exist')
+            try:
+                t.rescore()
+            except InvalidScoringSystem as e:
+                raise CommandError(f'Unable to rescore {t}: {e}')
+            self.stdout.write(f'Rescored {t}')
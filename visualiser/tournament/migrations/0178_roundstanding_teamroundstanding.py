@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0177_auto_20260805_1113'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoundStanding',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.player')),
+                ('the_round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.round', verbose_name='round')),
+            ],
+            options={
+                'ordering': ['the_round__start', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('the_round', 'player'), name='unique_standing_round_player')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamRoundStanding',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.team')),
+                ('the_round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.round', verbose_name='round')),
+            ],
+            options={
+                'ordering': ['the_round__start', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('the_round', 'team'), name='unique_standing_round_team')],
+            },
+        ),
+    ]
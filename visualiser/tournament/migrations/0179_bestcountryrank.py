@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0178_roundstanding_teamroundstanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BestCountryRank',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField()),
+                ('gameplayer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='best_country_rank', to='tournament.gameplayer')),
+                ('power', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tournament.greatpower')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.tournament')),
+            ],
+            options={
+                'ordering': ['tournament', 'power', 'rank', 'pk'],
+                'indexes': [models.Index(fields=['tournament', 'power', 'rank'], name='tournament__tournam_976688_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:45
+
+import django.core.validators
+import tournament.diplomacy.tasks.validate_max_supplycentres
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0179_bestcountryrank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameplayer',
+            name='final_scs',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Latest supply centre count', null=True, validators=[django.core.validators.MaxValueValidator(tournament.diplomacy.tasks.validate_max_supplycentres.num_supplycentres)]),
+        ),
+        migrations.AddField(
+            model_name='gameplayer',
+            name='year_eliminated',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Year in which the power was eliminated', null=True, validators=[django.core.validators.MinValueValidator(1901)]),
+        ),
+    ]
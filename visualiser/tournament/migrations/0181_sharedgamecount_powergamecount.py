@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0180_gameplayer_final_scs_year_eliminated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PowerGameCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveSmallIntegerField()),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tournament.tournamentplayer')),
+                ('power', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tournament.greatpower')),
+                ('the_round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.round', verbose_name='round')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('the_round', 'player', 'power'), name='unique_power_round_player')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SharedGameCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveSmallIntegerField()),
+                ('player1', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tournament.tournamentplayer')),
+                ('player2', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tournament.tournamentplayer')),
+                ('the_round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.round', verbose_name='round')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('the_round', 'player1', 'player2'), name='unique_shared_round_players')],
+            },
+        ),
+    ]
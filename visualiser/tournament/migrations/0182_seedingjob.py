@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0181_sharedgamecount_powergamecount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeedingJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('R', 'Running'), ('F', 'Finished'), ('X', 'Failed')], default='R', max_length=1)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('best_fitness', models.IntegerField(blank=True, help_text='Fitness score of the best seeding found so far. Lower is better', null=True)),
+                ('accept_requested', models.BooleanField(default=False, help_text='Set to stop seeding and use the best seeding found so far')),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('the_round', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='tournament.round', verbose_name='round')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0182_seedingjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameVersion',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='tournament.game')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TournamentVersion',
+            fields=[
+                ('tournament', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='tournament.tournament')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+def set_round_numbers(apps, schema_editor):
+    """Number the Rounds of each Tournament in start order"""
+    Round = apps.get_model('tournament', 'Round')
+    changed = []
+    number = {}
+    for r in Round.objects.order_by('tournament_id', 'start'):
+        number[r.tournament_id] = number.get(r.tournament_id, 0) + 1
+        r.round_number = number[r.tournament_id]
+        changed.append(r)
+    Round.objects.bulk_update(changed, ['round_number'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0183_tournamentversion_gameversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='round',
+            name='round_number',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(set_round_numbers, migrations.RunPython.noop),
+    ]
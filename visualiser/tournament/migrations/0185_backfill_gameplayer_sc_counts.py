@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:40
+
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def set_sc_summaries(apps, schema_editor):
+    """Set final_scs and year_eliminated for every GamePlayer with a power"""
+    CentreCount = apps.get_model('tournament', 'CentreCount')
+    GamePlayer = apps.get_model('tournament', 'GamePlayer')
+    # Dict, keyed by (game id, power id), of (final count, year eliminated) 2-tuples
+    summaries = defaultdict(lambda: (None, None))
+    for game_id, power_id, year, count in CentreCount.objects.order_by('year').values_list('game_id',
+                                                                                         'power_id',
+                                                                                         'year',
+                                                                                         'count').iterator():
+        year_eliminated = summaries[game_id, power_id][1]
+        if (count == 0) and (year_eliminated is None):
+            year_eliminated = year
+        summaries[game_id, power_id] = (count, year_eliminated)
+    changed = []
+    for gp in GamePlayer.objects.filter(power__isnull=False).only('game_id', 'power_id', 'final_scs', 'year_eliminated').iterator():
+        summary = summaries[gp.game_id, gp.power_id]
+        if (gp.final_scs, gp.year_eliminated) != summary:
+            gp.final_scs, gp.year_eliminated = summary
+            changed.append(gp)
+    GamePlayer.objects.bulk_update(changed, ['final_scs', 'year_eliminated'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0184_round_round_number'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_sc_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0185_backfill_gameplayer_sc_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seedingjob',
+            name='heartbeat',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When seeding last reported progress'),
+        ),
+    ]
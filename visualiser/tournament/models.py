@@ -21,11 +21,14 @@ import inspect
 import random
 import string
 import sys
+import threading
 import uuid
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 from datetime import date, timedelta
-from operator import countOf, itemgetter
+from itertools import combinations
+from operator import attrgetter, countOf, itemgetter
 from pathlib import Path
 
 from django.conf import settings
@@ -34,26 +37,28 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
 from django.db.models import F, Max, Q, Sum
-from django.db.models.signals import post_delete
-from django.db.models.functions import Coalesce, Rank
-from django.dispatch import receiver
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
 from django.urls import reverse
 from django.utils import timezone as django_timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 
-from tournament import backstabbr, webdip
+from tournament import backstabbr, live, webdip
+from tournament.assignment import min_cost_assignment
+from tournament.board_history import BoardHistory
 # validate_sc_count() and validate_ranking() are no longer used except by migrations
 from tournament.diplomacy import (FIRST_YEAR, TOTAL_SCS, WINNING_SCS, GameSet,
-                                  GreatPower, SupplyCentre,
+                                  GreatPower, SupplyCentre, reference_data,
                                   validate_max_greatpowers,
                                   validate_max_supplycentres,
                                   validate_preference_string, validate_ranking,
                                   validate_sc_count, validate_year,
                                   validate_year_including_start)
 from tournament.email import send_prefs_email
-from tournament.game_scoring import G_SCORING_SYSTEMS, GameScoringSystem
+from tournament.game_scoring import (G_SCORING_SYSTEMS, GameBatch,
+                                     GameScoringSystem)
 from tournament.players import (MASK_ALL_BG, MASK_ROUND_ENDPOINTS,
                                 MASK_SERIES_WINS, Player, add_player_bg)
 from tournament.tournament_game_state import TournamentGameState
@@ -108,6 +113,13 @@ class PowerAssignMethods(models.TextChoices):
     PREFERENCES = 'P', _('Using player preferences and ranking')
 
 
+class SeedingStatus(models.TextChoices):
+    """How far through seeding a Round's Games a SeedingJob is"""
+    RUNNING = 'R', _('Running')
+    FINISHED = 'F', _('Finished')
+    FAILED = 'X', _('Failed')
+
+
 class InvalidScoringSystem(Exception):
     """The specified scoring system name is not recognised"""
     pass
@@ -140,19 +152,367 @@ class InvalidPowerAssignmentMethod(Exception):
     pass
 
 
-def _save_score(obj, score):
+def _set_score(obj, score):
     """
-    Save a score in an object (Team, TournamentPlayer, RoundPlayer, or GamePlayer).
+    Set a score in an object (Team, TournamentPlayer, RoundPlayer, or GamePlayer).
 
     Always sets the calculated_score attribute.
     Also sets the score attribute if it equals calculated_score.
+    Does not save the object.
+    Returns True if either attribute was changed.
     """
-    fields=['calculated_score']
+    changed = obj.calculated_score != score
     if obj.calculated_score == obj.score:
         obj.score = score
-        fields.append('score')
     obj.calculated_score = score
-    obj.save(update_fields=fields)
+    return changed
+
+
+def _store_standings(model, key, rounds, standings):
+    """
+    Write any changed RoundStandings or TeamRoundStandings.
+
+    model is either RoundStanding or TeamRoundStanding, and key the name of
+    its player_id or team_id field.
+    rounds is a QuerySet of the Rounds whose standings are in standings.
+    standings is a list of unsaved model objects.
+    Existing rows that are unchanged are left alone, and those for anyone
+    not in standings are deleted.
+    """
+    existing = {(round_id, other_id): (pk, rank, score)
+                for pk, round_id, other_id, rank, score in model.objects.filter(the_round__in=rounds).values_list('pk',
+                                                                                                                'the_round_id',
+                                                                                                                key,
+                                                                                                                'rank',
+                                                                                                                'score')}
+    changed = []
+    for s in standings:
+        old = existing.pop((s.the_round_id, getattr(s, key)), None)
+        if (old is None) or (old[1:] != (s.rank, s.score)):
+            changed.append(s)
+    if existing:
+        model.objects.filter(pk__in=[pk for pk, _, _ in existing.values()]).delete()
+    if changed:
+        # Update in place, so that concurrent writers can't clash on the unique constraint
+        model.objects.bulk_create(changed,
+                                  update_conflicts=True,
+                                  unique_fields=['the_round', key.removesuffix('_id')],
+                                  update_fields=['rank', 'score'])
+
+
+def _standings_changed(tournament_id):
+    """
+    Note that something other than a score that a Tournament's standings depend on has changed.
+
+    Once the change is committed, the stored standings of the Tournament are updated.
+    Score changes update the standings directly.
+    """
+    pending = getattr(_pending_standings, 'ids', None)
+    if pending is None:
+        pending = _pending_standings.ids = set()
+    pending.add(tournament_id)
+    # All the changes in a transaction are handled by the first of these
+    transaction.on_commit(_update_changed_standings)
+
+
+def _update_changed_standings():
+    """Update the stored standings of Tournaments noted by _standings_changed()"""
+    pending = getattr(_pending_standings, 'ids', None)
+    _pending_standings.ids = None
+    if not pending:
+        return
+    for t in Tournament.objects.filter(pk__in=pending):
+        t._update_standings()
+
+
+def _best_countries_changed(tournament_id=None, game_id=None, power_id=None):
+    """
+    Note that something other than a rescore has changed the best countries of a Tournament.
+
+    Either tournament_id or game_id (of a Game in the Tournament) should be provided.
+    power_id is the GreatPower id whose results changed, or None if it could be any.
+    Once the change is committed, the stored BestCountryRanks are updated.
+    Rescoring Games updates them directly.
+    """
+    pending = getattr(_pending_best_countries, 'ids', None)
+    if pending is None:
+        pending = _pending_best_countries.ids = (defaultdict(set), defaultdict(set))
+    if tournament_id is not None:
+        pending[0][tournament_id].add(power_id)
+    else:
+        pending[1][game_id].add(power_id)
+    # All the changes in a transaction are handled by the first of these
+    transaction.on_commit(_update_changed_best_countries)
+
+
+def _update_changed_best_countries():
+    """Update the stored BestCountryRanks of Tournaments noted by _best_countries_changed()"""
+    pending = getattr(_pending_best_countries, 'ids', None)
+    _pending_best_countries.ids = None
+    if pending is None:
+        return
+    power_ids, game_power_ids = pending
+    if game_power_ids:
+        for game_id, tournament_id in Game.objects.filter(pk__in=game_power_ids).values_list('pk',
+                                                                                           'the_round__tournament_id'):
+            power_ids[tournament_id] |= game_power_ids[game_id]
+    for t in Tournament.objects.filter(pk__in=power_ids):
+        # None means any power
+        t._update_best_countries(None if None in power_ids[t.pk] else power_ids[t.pk])
+
+
+def _renumber_rounds(tournament_id):
+    """
+    Set round_number for all the Rounds of a Tournament, in start order.
+
+    Returns a dict, keyed by Round pk, of round numbers.
+    """
+    rounds = list(Round.objects.filter(tournament_id=tournament_id).order_by('start').only('round_number'))
+    changed = []
+    for n, r in enumerate(rounds, 1):
+        if r.round_number != n:
+            r.round_number = n
+            changed.append(r)
+    if changed:
+        Round.objects.bulk_update(changed, ['round_number'])
+    return {r.pk: r.round_number for r in rounds}
+
+
+# Tournaments and Games whose data has changed in the current transaction, per thread
+_pending_changes = threading.local()
+
+# Tournaments whose stored standings need updating once the current transaction commits
+_pending_standings = threading.local()
+
+# Tournaments and Games whose best countries need updating once the current transaction commits
+_pending_best_countries = threading.local()
+
+# Games whose GamePlayers' supply centre summaries need updating once the current transaction commits
+_pending_sc_counts = threading.local()
+
+# Sent once changes have been committed and the data versions increased,
+# with tournament_ids and game_ids, the sets of pks of the changed Tournaments and Games
+data_versions_changed = Signal()
+
+
+def _data_changed(tournament_id=None, game_id=None):
+    """
+    Note that data shown on a Tournament's or Game's pages has changed.
+
+    Once the change is committed, the TournamentVersion and GameVersion
+    are increased (a Game change also counts as a change to its Tournament),
+    and any display screens are told.
+    """
+    pending = getattr(_pending_changes, 'ids', None)
+    if pending is None:
+        pending = _pending_changes.ids = (set(), set())
+    if tournament_id is not None:
+        pending[0].add(tournament_id)
+    if game_id is not None:
+        pending[1].add(game_id)
+    # All the changes in a transaction are handled by the first of these
+    transaction.on_commit(_publish_data_changes)
+
+
+def _publish_data_changes():
+    """Increase the data versions of, and tell display screens about, changed Tournaments and Games"""
+    pending = getattr(_pending_changes, 'ids', None)
+    _pending_changes.ids = None
+    if pending is None:
+        return
+    tournament_ids, game_ids = pending
+    if game_ids:
+        tournament_ids |= set(Game.objects.filter(pk__in=game_ids).values_list('the_round__tournament_id',
+                                                                               flat=True))
+        GameVersion.objects.filter(game_id__in=game_ids).update(version=F('version') + 1)
+    TournamentVersion.objects.filter(tournament_id__in=tournament_ids).update(version=F('version') + 1)
+    live.publish(*[live.tournament_channel(pk) for pk in sorted(tournament_ids)],
+                 *[live.game_channel(pk) for pk in sorted(game_ids)])
+    data_versions_changed.send(sender=None, tournament_ids=tournament_ids, game_ids=game_ids)
+
+
+def _send_post_save_for_created(model, instances, using):
+    """Send post_save for instances inserted with bulk_create(), as save() would have"""
+    for instance in instances:
+        post_save.send(sender=model,
+                       instance=instance,
+                       created=True,
+                       update_fields=None,
+                       raw=False,
+                       using=using)
+
+
+# GamePlayer attributes written by the scoring code
+_GAMEPLAYER_SCORING_FIELDS = ['score', 'calculated_score', 'final_scs', 'year_eliminated']
+
+
+def _sc_summary(year_counts):
+    """
+    Summarise the supply centre counts of one power in one Game.
+
+    year_counts is an iterable of (year, count) 2-tuples, in year order.
+    Returns a 2-tuple of the latest count and the year of elimination.
+    Either can be None.
+    """
+    final_scs = None
+    year_eliminated = None
+    for year, count in year_counts:
+        final_scs = count
+        if (count == 0) and (year_eliminated is None):
+            year_eliminated = year
+    return final_scs, year_eliminated
+
+
+def _update_sc_summaries(gps, ccs):
+    """
+    Update the final_scs and year_eliminated attributes of GamePlayers, and save them.
+
+    gps is a QuerySet of GamePlayers.
+    ccs is a QuerySet of (at least) all the CentreCounts for their powers in their Games.
+    Returns a list of the GamePlayers that changed.
+    """
+    counts = defaultdict(list)
+    for game_id, power_id, year, count in ccs.order_by('year').values_list('game_id', 'power_id', 'year', 'count'):
+        counts[game_id, power_id].append((year, count))
+    changed_gps = []
+    for gp in gps.order_by().only('game_id', 'power_id', 'final_scs', 'year_eliminated'):
+        # A GamePlayer with no power has no CentreCounts
+        summary = _sc_summary(counts[gp.game_id, gp.power_id])
+        if (gp.final_scs, gp.year_eliminated) != summary:
+            gp.final_scs, gp.year_eliminated = summary
+            changed_gps.append(gp)
+    if changed_gps:
+        GamePlayer.objects.bulk_update(changed_gps, ['final_scs', 'year_eliminated'])
+    return changed_gps
+
+
+def _sc_counts_changed(game_id):
+    """
+    Note that the CentreCounts or GamePlayers of a Game have changed.
+
+    Once the change is committed, the final_scs and year_eliminated
+    attributes of the Game's GamePlayers are updated.
+    """
+    pending = getattr(_pending_sc_counts, 'ids', None)
+    if pending is None:
+        pending = _pending_sc_counts.ids = set()
+    pending.add(game_id)
+    # All the changes in a transaction are handled by the first of these
+    transaction.on_commit(_update_changed_sc_counts)
+
+
+def _update_changed_sc_counts():
+    """Update the supply centre summaries of the GamePlayers of Games noted by _sc_counts_changed()"""
+    pending = getattr(_pending_sc_counts, 'ids', None)
+    _pending_sc_counts.ids = None
+    if not pending:
+        return
+    changed_gps = _update_sc_summaries(GamePlayer.objects.filter(game_id__in=pending),
+                                       CentreCount.objects.filter(game_id__in=pending))
+    # bulk_update() doesn't send post_save
+    for game_id, power_id in {(gp.game_id, gp.power_id) for gp in changed_gps}:
+        _best_countries_changed(game_id=game_id, power_id=power_id)
+        _data_changed(game_id=game_id)
+
+
+# Games whose scores need recalculating, when score updates are deferred
+_deferred_scoring = threading.local()
+
+
+@contextmanager
+def deferred_score_updates():
+    """
+    Context manager to coalesce score recalculations.
+
+    Within the context, Game.update_scores() just notes that the Game needs
+    to be rescored. When the outermost context exits normally, all the noted
+    Games are rescored with a single call to update_scores_for_games(),
+    so entering lots of data for a Game (or for several Games) costs
+    just one Round and Tournament rescore.
+    Can be nested, and can also be used as a function decorator.
+    """
+    if getattr(_deferred_scoring, 'games', None) is not None:
+        # The outermost context will do the work
+        yield
+        return
+    _deferred_scoring.games = {}
+    try:
+        yield
+        games = _deferred_scoring.games
+    finally:
+        _deferred_scoring.games = None
+    update_scores_for_games(games.values())
+
+
+def update_scores_for_games(games):
+    """
+    Recalculate the scores for a number of Games, and propagate them.
+
+    games is an iterable of Games whose results may have changed.
+    GamePlayer scores and supply centre summaries are only recalculated for those Games.
+    RoundPlayer scores are then recalculated once for each affected Round,
+    and TournamentPlayer and Team scores once for each affected Tournament,
+    in each case just for the Players who played in those Games.
+    All the changed rows of each model are written with a single bulk_update().
+    Can raise InvalidScoringSystem.
+    """
+    games = list(games)
+    game_scores = _calc_scores_for_games(games)
+    changed_gps = []
+    # Players affected, keyed by Round
+    round_players = {}
+    # GreatPowers with changed results, keyed by Tournament
+    changed_powers = defaultdict(set)
+    for g in games:
+        gps, changed = g._update_gameplayer_scores(*game_scores[g])
+        changed_gps += changed
+        round_players.setdefault(g.the_round, set()).update(gp.player for gp in gps)
+        changed_powers[g.the_round.tournament].update(gp.power_id for gp in changed)
+    if changed_gps:
+        GamePlayer.objects.bulk_update(changed_gps, _GAMEPLAYER_SCORING_FIELDS)
+    # Players affected, keyed by Tournament, and the earliest affected Round of each
+    tournament_players = {}
+    first_rounds = {}
+    for r in sorted(round_players.keys(), key=attrgetter('start')):
+        players = round_players[r]
+        r._update_roundplayer_scores(players)
+        tournament_players.setdefault(r.tournament, set()).update(players)
+        first_rounds.setdefault(r.tournament, r)
+    for t, players in tournament_players.items():
+        if changed_powers[t]:
+            t._update_best_countries(changed_powers[t])
+        t.update_scores(players)
+        if any(r.is_team_round for r in round_players.keys() if r.tournament == t):
+            t.update_team_scores(players)
+        t._update_roundplayer_tournament_scores(players, first_rounds[t])
+        _data_changed(tournament_id=t.pk)
+    for g in games:
+        _data_changed(game_id=g.pk)
+
+
+def _calc_scores_for_games(games):
+    """
+    Calculate the scores for a list of Games.
+
+    All the Games in each Round are scored together, as a single GameBatch.
+    Returns a dict, keyed by Game, of 2-tuples of a dict, indexed by power,
+    of scores and the TournamentGameState that was scored.
+    Can raise InvalidScoringSystem.
+    """
+    retval = {}
+    if not games:
+        return retval
+    powers = list(reference_data.great_powers())
+    games_by_round = defaultdict(list)
+    for g in games:
+        games_by_round[g.the_round].append(g)
+    for r, round_games in games_by_round.items():
+        system = r.game_scoring_system_obj()
+        states = [TournamentGameState(g, powers=powers) for g in round_games]
+        batch = GameBatch.from_states(states)
+        for g, state, scores in zip(round_games, states, batch.score_dicts(system.batch_scores(batch))):
+            retval[g] = (g._scale_scores(scores), state)
+    return retval
 
 
 class RoundScoringSystem(ABC):
@@ -602,6 +962,7 @@ class TScoringSumGames(TournamentScoringSystem):
         If they have any non-zero round scores, count those as pseudo-games.
 
         Also updates score_dropped for all the GamePlayers and RoundPlayers examined.
+        Uses two queries, regardless of the number of players, plus any bulk updates.
         """
         t_scores = {}
         changed_rps = {}
@@ -624,22 +985,28 @@ class TScoringSumGames(TournamentScoringSystem):
             else:
                 mark_score_obj(score_obj, False)
 
+        # Fetch all the RoundPlayers and GamePlayers at once, and group them by player
+        player_rps = defaultdict(list)
+        for rp in round_players.select_related('player', 'the_round'):
+            player_rps[rp.player].append(rp)
+        player_gps = defaultdict(list)
+        gps = GamePlayer.objects.filter(player__in=round_players.values('player'),
+                                        game__the_round__in=round_players.values('the_round'))
+        for gp in gps.select_related('game__the_round'):
+            player_gps[gp.player_id].append(gp)
+
         # for each player who played any of the specified rounds
-        for p in Player.objects.filter(roundplayer__in=round_players).distinct():
+        for p, rps in player_rps.items():
             # All the scores to consider. Dict, keyed by score_obj (GamePlayer or RoundPlayer), of scores
             player_scores = {}
             # Find just the rounds they played
-            rps = list(round_players.filter(player=p).select_related('the_round'))
             roundplayer_by_round_id = {rp.the_round_id: rp for rp in rps}
-            rounds = []
             for rp in rps:
                 if self.residual_multiplier == 0.0:
                     # Assume the round score is dropped unless we find out otherwise
                     mark_score_obj(rp, True)
-                rounds.append(rp.the_round)
 
-            gps = list(GamePlayer.objects.filter(player=p,
-                                                 game__the_round__in=rounds).select_related('game__the_round'))
+            gps = [gp for gp in player_gps[p.pk] if gp.game.the_round_id in roundplayer_by_round_id]
             gp_round_ids = {gp.game.the_round_id for gp in gps}
 
             for rp in rps:
@@ -859,7 +1226,7 @@ def validate_vote_count(value):
     """
     Checks for a valid vote count
     """
-    if (value < 0) or (value > GreatPower.objects.count()):
+    if (value < 0) or (value > len(reference_data.great_powers())):
         raise ValidationError(_('%(value)d is not a valid vote count'),
                               params={'value': value})
 
@@ -1031,6 +1398,9 @@ class Tournament(models.Model):
                                          blank=True,
                                          help_text=_('Default GameSet used when seeding games for rounds'))
 
+    # Cache for ordered_rounds()
+    _ordered_rounds = None
+
     class Meta:
         ordering = ['-start_date']
         constraints = [
@@ -1083,6 +1453,7 @@ class Tournament(models.Model):
                 pass
             else:
                 self.update_scores()
+                self._update_roundplayer_tournament_scores()
 
     def get_absolute_url(self):
         """Returns the canonical URL for the object."""
@@ -1250,82 +1621,34 @@ class Tournament(models.Model):
         # There can be only one Pool per Tournament with determines_top_rankings set
         return Pool.objects.filter(the_round__tournament=self).filter(determines_top_rankings__isnull=False).first()
 
-    def positions_and_scores(self, after_round_num=None):
-        """
-        Returns the positions and scores of everyone registered, after a specified round ended.
+    def _top_pool_gameplayers(self, top_pool):
+        """Returns a list of the GamePlayers in top_pool, best first, or [] if top_pool is None"""
+        if top_pool is None:
+            return []
+        return list(GamePlayer.objects.filter(game__pool=top_pool).order_by('-score', 'tie_break_rank'))
 
-        If no round number is specified, it returns the "if all games ended now" results.
-        If the specified round is still in progress, it returns the "if all games in the round
-        ended now" results.
-        Returns a dict, keyed by player, of 2-tuples containing integer rankings
-          (1 for first place, etc) and float tournament scores.
-          Players who are flagged as unranked in the tournament get the special
-          place UNRANKED.
+    def _rank_scores(self, t_scores, unranked_player_ids, top_pool, top_gps):
         """
-        top_pool = self._top_pool()
+        Rank players by tournament score, allowing for any top board.
 
-        # Snapshot path: use database annotations for ranking when no top-board override is active.
-        if (after_round_num is not None) and (after_round_num < self.round_set.count()) and (top_pool is None):
-            round_ids = list(self.round_set.order_by('start').values_list('id', flat=True)[:after_round_num])
-            latest_snapshot_score = RoundPlayer.objects.filter(
-                the_round__in=round_ids,
-                player=models.OuterRef('player')
-            ).order_by('-the_round__start', '-the_round').values('tournament_score')[:1]
-
-            result = {}
-            unranked_tps = self.tournamentplayer_set.filter(unranked=True).select_related('player').annotate(
-                snapshot_score=Coalesce(models.Subquery(latest_snapshot_score), models.Value(0.0),
-                                        output_field=models.FloatField())
-            )
-            for tp in unranked_tps:
-                result[tp.player] = (Tournament.UNRANKED, tp.snapshot_score)
-
-            ranked_tps = self.tournamentplayer_set.filter(unranked=False).select_related('player').annotate(
-                snapshot_score=Coalesce(models.Subquery(latest_snapshot_score), models.Value(0.0),
-                                        output_field=models.FloatField())
-            ).annotate(
-                place=models.Window(expression=Rank(), order_by=F('snapshot_score').desc())
-            )
-            for tp in ranked_tps:
-                result[tp.player] = (tp.place, tp.snapshot_score)
-            return result
-
-        tp_rows = list(self.tournamentplayer_set.select_related('player').order_by())
-        player_map = {tp.player_id: tp.player for tp in tp_rows}
-        unranked_player_ids = {tp.player_id for tp in tp_rows if tp.unranked}
-
-        # Populate t_scores with a dict keyed by player id of scores
-        if (after_round_num is not None) and (after_round_num < self.round_set.count()):
-            t_scores = {}
-            for n, r in reversed(list(enumerate(self.round_set.order_by('start'),
-                                                start=1))[:after_round_num]):
-                #if n > after_round_num:
-                #    # Skip this round
-                #    continue
-                # Keep the score from the latest round
-                for player_id, tournament_score in r.roundplayer_set.values_list('player_id',
-                                                                                 'tournament_score').order_by():
-                    if player_id not in t_scores:
-                        t_scores[player_id] = tournament_score
-            # Anyone who hadn't yet played scores zero
-            for player_id in player_map:
-                if player_id not in t_scores:
-                    t_scores[player_id] = 0.0
-        else:
-            t_scores = {tp.player_id: tp.score for tp in tp_rows}
+        t_scores is a dict, keyed by player id, of tournament scores.
+        unranked_player_ids is a set of the ids of players who are flagged as unranked.
+        top_pool is the Pool with determines_top_rankings set, or None.
+        top_gps is the list returned by _top_pool_gameplayers(top_pool).
+        Returns a dict, keyed by player id, of (rank, score) 2-tuples.
+        """
+        t_scores = dict(t_scores)
         result = {}
         # First, deal with any unranked players
         for player_id in unranked_player_ids:
             # Take it out of scores and add it to result
-            result[player_map[player_id]] = (Tournament.UNRANKED, t_scores.pop(player_id))
+            result[player_id] = (Tournament.UNRANKED, t_scores.pop(player_id))
         # Figure out everyone's ranking
         # Start with first place
         rank = 1
         if top_pool is not None:
             # Some number of top board players get the top ranks
             # Starting with the player with the highest top board score
-            top_gps = GamePlayer.objects.filter(game__pool=top_pool).select_related('player').order_by('-score',
-                                                                                                         'tie_break_rank')
             last_score = None
             i = 0
             for gp in top_gps:
@@ -1339,13 +1662,43 @@ class Tournament(models.Model):
                         # Everyone else, including this player, is just ranked by Tournament score
                         break
                 # This player gets one of the top ranks
-                player = gp.player
-                result[player] = (rank, t_scores.pop(gp.player_id))
+                result[gp.player_id] = (rank, t_scores.pop(gp.player_id))
+        return result | add_ranks(t_scores, rank)
 
-        ranked = add_ranks(t_scores, rank)
-        ranked_players = {player_map[player_id]: rank_and_score
-                          for player_id, rank_and_score in ranked.items()}
-        return result | ranked_players
+    def positions_and_scores(self, after_round_num=None):
+        """
+        Returns the positions and scores of everyone registered, after a specified round ended.
+
+        If no round number is specified, it returns the "if all games ended now" results.
+        If the specified round is still in progress, it returns the "if all games in the round
+        ended now" results.
+        Results for earlier rounds are read from the stored RoundStandings.
+        Returns a dict, keyed by player, of 2-tuples containing integer rankings
+          (1 for first place, etc) and float tournament scores.
+          Players who are flagged as unranked in the tournament get the special
+          place UNRANKED.
+        """
+        if (after_round_num is not None) and (after_round_num > 0):
+            rounds = self.ordered_rounds()
+            if after_round_num < len(rounds):
+                return {rs.player: (rs.rank, rs.score)
+                        for rs in self._stored_standings(RoundStanding, rounds[after_round_num - 1])}
+
+        tp_rows = list(self.tournamentplayer_set.select_related('player').order_by())
+        player_map = {tp.player_id: tp.player for tp in tp_rows}
+        unranked_player_ids = {tp.player_id for tp in tp_rows if tp.unranked}
+        if after_round_num == 0:
+            # Everyone starts with zero
+            t_scores = {tp.player_id: 0.0 for tp in tp_rows}
+        else:
+            t_scores = {tp.player_id: tp.score for tp in tp_rows}
+        top_pool = self._top_pool()
+        ranked = self._rank_scores(t_scores,
+                                   unranked_player_ids,
+                                   top_pool,
+                                   self._top_pool_gameplayers(top_pool))
+        return {player_map[player_id]: rank_and_score
+                for player_id, rank_and_score in ranked.items()}
 
     def team_scores(self, after_round_num=None):
         """
@@ -1354,41 +1707,166 @@ class Tournament(models.Model):
         If no round number is specified, it returns the "if all games ended now" results.
         If the specified round is still in progress, it returns the "if all games in the round
         ended now" results.
+        Results for earlier rounds are read from the stored TeamRoundStandings.
         Return a dict, keyed by Team, of 2-tuples containing integer rankings
         (1 for first place, etc) and float team scores.
         """
-        t_scores = {}
-        if (after_round_num is not None) and (after_round_num < self.round_set.count()):
-            # Calculate the team scores after the specified round
+        if after_round_num == 0:
+            # All teams start with zero
+            return add_ranks({team: 0.0 for team in self.team_set.all()})
+        if after_round_num is not None:
+            rounds = self.ordered_rounds()
+            if after_round_num < len(rounds):
+                return {ts.team: (ts.rank, ts.score)
+                        for ts in self._stored_standings(TeamRoundStanding, rounds[after_round_num - 1])}
+        return add_ranks({team: team.score for team in self.team_set.all()})
+
+    def standings(self):
+        """
+        Returns the positions and scores of everyone registered, after each Round.
+
+        The standings after the last Round are the "if all games ended now" results.
+        Returns a dict, keyed by Round, of dicts as returned by positions_and_scores().
+        """
+        retval = {}
+        for rs in self._stored_standings(RoundStanding):
+            retval.setdefault(rs.the_round, {})[rs.player] = (rs.rank, rs.score)
+        return retval
+
+    def _team_standing_scores(self, rounds, teams):
+        """
+        Calculate team scores after each Round.
+
+        rounds is a list of all the Tournament's Rounds.
+        teams is a list of all the Tournament's Teams.
+        Returns a dict, keyed by Round id, of dicts, keyed by Team id, of scores.
+        """
+        if not teams:
+            return {}
+        teams_by_player = defaultdict(list)
+        for team_id, player_id in Team.players.through.objects.filter(team__tournament=self).values_list('team_id',
+                                                                                                         'player_id'):
+            teams_by_player[player_id].append(team_id)
+        gp_scores = defaultdict(list)
+        for round_id, player_id, score in GamePlayer.objects.filter(game__the_round__tournament=self,
+                                                                    game__the_round__is_team_round=True).values_list('game__the_round_id',
+                                                                                                                     'player_id',
+                                                                                                                     'score').order_by():
+            gp_scores[round_id].append((player_id, score))
+        retval = {}
+        # Game scores for each team so far
+        g_scores = {team.pk: [] for team in teams}
+        for n, r in enumerate(rounds, start=1):
+            if n == len(rounds):
+                retval[r.pk] = {team.pk: team.score for team in teams}
+                break
+            for player_id, score in gp_scores[r.pk]:
+                for team_id in teams_by_player[player_id]:
+                    g_scores[team_id].append(score)
             if self.num_games_in_team_score is None:
                 # Every team member's score counts
-                for team in self.team_set.all():
-                    t_scores[team] = 0.0
-                    for r in self.team_rounds().order_by('start'):
-                        if r.number() > after_round_num:
-                            break
-                        t_scores[team] += team.gameplayers().filter(game__the_round=r).aggregate(Sum('score'))['score__sum']
+                retval[r.pk] = {team_id: sum(scores) for team_id, scores in g_scores.items()}
             else:
-                # Find all the relevant game scores for each team
-                g_scores = {}
-                for team in self.team_set.all():
-                    for r in self.team_rounds().order_by('start'):
-                        if r.number() > after_round_num:
-                            break
-                        for gp in team.gameplayers().filter(game__the_round=r):
-                            g_scores.setdefault(team, []).append(gp.score)
-                # Now we can calculate the score for each team
-                for team in self.team_set.all():
-                    t_scores[team] = sum(s for s in sorted(g_scores[team],
-                                                           reverse=True)[:self.num_games_in_team_score])
-        else:
-            for team in self.team_set.all():
-                t_scores[team] = team.score
-        return add_ranks(t_scores)
+                retval[r.pk] = {team_id: sum(sorted(scores, reverse=True)[:self.num_games_in_team_score])
+                                for team_id, scores in g_scores.items()}
+        return retval
+
+    def _stored_standings(self, model, the_round=None):
+        """
+        Returns a list of stored standings.
+
+        model is either RoundStanding or TeamRoundStanding.
+        the_round is an optional Round to restrict the list to.
+        This never writes to the database. If the standings haven't been
+        stored yet (e.g. the Tournament hasn't been scored since it was created),
+        they are calculated without being stored.
+        """
+        related = 'team' if model is TeamRoundStanding else 'player'
+        standings = model.objects.filter(the_round__tournament=self).select_related('the_round', related)
+        if the_round is not None:
+            standings = standings.filter(the_round=the_round)
+        retval = list(standings)
+        if retval:
+            return retval
+        # Only worth calculating if someone could have a standing
+        if model is TeamRoundStanding:
+            if not self.team_set.exists():
+                return retval
+        elif not self.tournamentplayer_set.exists():
+            return retval
+        player_standings, team_standings = self._calc_standings()
+        retval = team_standings if model is TeamRoundStanding else player_standings
+        if the_round is not None:
+            retval = [s for s in retval if s.the_round == the_round]
+        return retval
+
+    def _calc_standings(self, first_round=None):
+        """
+        Calculate the positions and scores of everyone, and of every Team, after each Round.
+
+        Player scores after each Round come from the cached RoundPlayer.tournament_score,
+        so that should be up-to-date. Standings after the last Round use the current
+        TournamentPlayer and Team scores.
+        first_round is an optional Round. If provided, only standings after that Round
+        and later Rounds are calculated.
+        Returns a 2-tuple of lists of unsaved RoundStandings and TeamRoundStandings.
+        """
+        rounds = list(self.round_set.all())
+        tp_rows = list(self.tournamentplayer_set.select_related('player').order_by())
+        players = {tp.player_id: tp.player for tp in tp_rows}
+        unranked_player_ids = {tp.player_id for tp in tp_rows if tp.unranked}
+        top_pool = self._top_pool()
+        top_gps = self._top_pool_gameplayers(top_pool)
+        round_scores = defaultdict(dict)
+        for round_id, player_id, score in RoundPlayer.objects.filter(the_round__tournament=self).values_list('the_round_id',
+                                                                                                             'player_id',
+                                                                                                             'tournament_score').order_by():
+            round_scores[round_id][player_id] = score
+        # Anyone who hasn't yet played scores zero
+        t_scores = {tp.player_id: 0.0 for tp in tp_rows}
+        standings = []
+        for n, r in enumerate(rounds, start=1):
+            if n == len(rounds):
+                t_scores = {tp.player_id: tp.score for tp in tp_rows}
+            else:
+                # Keep the score from the latest round played
+                t_scores.update((player_id, score) for player_id, score in round_scores[r.pk].items()
+                                if player_id in t_scores)
+            if (first_round is not None) and (r.start < first_round.start):
+                continue
+            ranked = self._rank_scores(t_scores, unranked_player_ids, top_pool, top_gps)
+            standings += [RoundStanding(the_round=r, player=players[player_id], rank=rank, score=score)
+                          for player_id, (rank, score) in ranked.items()]
+        rounds_by_id = {r.pk: r for r in rounds}
+        teams = {team.pk: team for team in self.team_set.all()}
+        team_standings = []
+        for round_id, scores in self._team_standing_scores(rounds, list(teams.values())).items():
+            r = rounds_by_id[round_id]
+            if (first_round is not None) and (r.start < first_round.start):
+                continue
+            team_standings += [TeamRoundStanding(the_round=r, team=teams[team_id], rank=rank, score=score)
+                               for team_id, (rank, score) in add_ranks(scores).items()]
+        return standings, team_standings
+
+    def _update_standings(self, first_round=None):
+        """
+        Store the positions and scores of everyone, and of every Team, after each Round.
+
+        first_round is an optional Round. If provided, only the standings after that
+        Round and later Rounds are updated, as earlier ones can't have changed.
+        Only the stored standings that have changed are written.
+        """
+        player_standings, team_standings = self._calc_standings(first_round)
+        rounds = self.round_set.all()
+        if first_round is not None:
+            rounds = rounds.filter(start__gte=first_round.start)
+        with transaction.atomic():
+            _store_standings(RoundStanding, 'player_id', rounds, player_standings)
+            _store_standings(TeamRoundStanding, 'team_id', rounds, team_standings)
 
     def _store_score(self, tp, scores, add_handicap):
         """
-        Update tp.calculated_score in the database
+        Update tp.calculated_score
 
         Also updates score if it was previously equal to calculated_score.
 
@@ -1398,13 +1876,13 @@ class Tournament(models.Model):
 
         Sets score to 0 if the player is not in scores
         Otherwise if add_handicap is True, adds tp.handicap
-        Saves the resulting score to the database
+        Does not save tp. Returns True if the score attributes were changed.
         """
         if tp.player not in scores:
             scores[tp.player] = 0.0
         elif add_handicap:
             scores[tp.player] += tp.handicap
-        _save_score(tp, scores[tp.player])
+        return _set_score(tp, scores[tp.player])
 
     def update_scores(self, for_players=None):
         """
@@ -1423,13 +1901,12 @@ class Tournament(models.Model):
         scores = self._calculated_scores(rps)
         add_handicap = self.is_finished and self.handicaps
         # Save scores, including for anyone who has yet to attend a round
+        tps = self.tournamentplayer_set.select_related('player').order_by()
         if for_players is not None:
-            for p in for_players:
-                tp = self.tournamentplayer_set.get(player=p)
-                self._store_score(tp, scores, add_handicap)
-        else:
-            for tp in self.tournamentplayer_set.order_by():
-                self._store_score(tp, scores, add_handicap)
+            tps = tps.filter(player__in=for_players)
+        changed_tps = [tp for tp in tps if self._store_score(tp, scores, add_handicap)]
+        if changed_tps:
+            TournamentPlayer.objects.bulk_update(changed_tps, ['score', 'calculated_score'])
         if self.is_finished:
             # Hand out Best Country awards
             for power, gp_list in self.best_countries().items():
@@ -1444,6 +1921,31 @@ class Tournament(models.Model):
                         #      to another player)
                         gp.tournamentplayer().awards.add(award)
 
+    def rescore(self):
+        """
+        Recalculate all the scores for the Tournament in a single pass.
+
+        Rescores every Game, then every Round, then the Tournament and any Teams.
+        Always updates calculated_score. Also updates score if it was previously
+        equal to calculated_score.
+        Can raise InvalidScoringSystem.
+        """
+        changed_gps = []
+        games = Game.objects.filter(the_round__tournament=self).select_related('the_round__tournament', 'pool')
+        games = list(games.prefetch_related('centrecount_set', 'drawproposal_set__drawing_powers'))
+        game_scores = _calc_scores_for_games(games)
+        for g in games:
+            changed_gps += g._update_gameplayer_scores(*game_scores[g])[1]
+        if changed_gps:
+            GamePlayer.objects.bulk_update(changed_gps, _GAMEPLAYER_SCORING_FIELDS)
+        # Check every power, in case the stored rankings were never written
+        self._update_best_countries()
+        for r in self.round_set.all():
+            r._update_roundplayer_scores()
+        self.update_scores()
+        self.update_team_scores()
+        self._update_roundplayer_tournament_scores()
+
     def update_team_scores(self, for_players=None):
         """
         Recalculate the scores for Teams and store them in the Teams.
@@ -1456,14 +1958,70 @@ class Tournament(models.Model):
         teams = self.team_set.all()
         if for_players:
             teams = teams.filter(players__in=for_players)
-        for team in teams:
+        changed_teams = []
+        for team in teams.distinct():
             if self.num_games_in_team_score is None:
                 gps = team.gameplayers()
                 team_score = gps.aggregate(Sum('score', default=0))['score__sum']
             else:
                 gps = team.gameplayers().order_by('-score')
                 team_score = sum(gp.score for gp in gps[:self.num_games_in_team_score])
-            _save_score(team, team_score)
+            if _set_score(team, team_score):
+                changed_teams.append(team)
+        if changed_teams:
+            Team.objects.bulk_update(changed_teams, ['score', 'calculated_score'])
+
+    def _update_roundplayer_tournament_scores(self, for_players=None, first_round=None):
+        """
+        Update the cached tournament_score attribute of RoundPlayers.
+
+        Each RoundPlayer's tournament_score is the Player's tournament score
+        after that Round. This is just the TournamentPlayer's score unless a
+        later Round has Games (and thus potentially scores).
+        for_players is an optional QuerySet or list of Players that have changed.
+        first_round is an optional Round. If provided, only RoundPlayers for
+        that Round and later Rounds are updated.
+        Also updates the stored standings after those Rounds.
+        """
+        rounds = list(self.round_set.all())
+        if first_round is not None:
+            rounds = [r for r in rounds if r.start >= first_round.start]
+        if not rounds:
+            return
+        # Find the latest Round with Games
+        rounds_with_games = set(Game.objects.filter(the_round__tournament=self).values_list('the_round_id',
+                                                                                             flat=True))
+        last_round_with_games = None
+        for r in self.round_set.all():
+            if r.pk in rounds_with_games:
+                last_round_with_games = r
+        all_rps = RoundPlayer.objects.filter(the_round__tournament=self).order_by()
+        if for_players is not None:
+            all_rps = all_rps.filter(player__in=for_players)
+        rps = all_rps.filter(the_round__in=rounds).select_related('player')
+        rps_by_round = defaultdict(list)
+        for rp in rps:
+            rps_by_round[rp.the_round_id].append(rp)
+        tp_scores = dict(self.tournamentplayer_set.filter(
+            player_id__in=[rp.player_id for rp in rps]
+        ).values_list('player_id', 'score'))
+        changed_rps = []
+        for r in rounds:
+            if (last_round_with_games is not None) and (r.start < last_round_with_games.start):
+                # Figure out tournament scores without any later Rounds
+                t_scores = self._calculated_scores(all_rps.filter(the_round__start__lte=r.start))
+                scores = {rp.player_id: t_scores.get(rp.player, 0.0) for rp in rps_by_round[r.pk]}
+            else:
+                # TournamentPlayer score doesn't include any later Rounds
+                scores = tp_scores
+            for rp in rps_by_round[r.pk]:
+                tournament_score = scores.get(rp.player_id, 0.0)
+                if rp.tournament_score != tournament_score:
+                    rp.tournament_score = tournament_score
+                    changed_rps.append(rp)
+        if changed_rps:
+            RoundPlayer.objects.bulk_update(changed_rps, ['tournament_score'])
+        self._update_standings(rounds[0])
 
     def winner(self):
         """
@@ -1474,18 +2032,24 @@ class Tournament(models.Model):
             return self.tournamentplayer_set.filter(unranked=False).order_by('-score').first().player
         return None
 
+    def ordered_rounds(self):
+        """
+        Return a list of the Rounds of the tournament, in order.
+
+        The list is read once and then kept with this Tournament object,
+        which normally lasts for a single request.
+        """
+        if self._ordered_rounds is None:
+            self._ordered_rounds = list(self.round_set.all())
+        return self._ordered_rounds
+
     def round_numbered(self, number):
         """
         Return the Round (if any) of the tournament with the specified number.
 
         Can raise Round.DoesNotExist.
         """
-        try:
-            return self.round_set.all()[number - 1]
-        except (IndexError, ValueError):
-            pass
-        # This allows this function to be used like QuerySet.get()
-        raise Round.DoesNotExist
+        return self.round_set.get(round_number=number)
 
     def team_rounds(self):
         """
@@ -1518,6 +2082,132 @@ class Tournament(models.Model):
             gp_list.sort(key=itemgetter(2, 1), reverse=True)
         gp_list.sort(key=itemgetter(3))
 
+    def _best_country_lists(self, gps):
+        """
+        Rank results with each power.
+
+        gps is a QuerySet of GamePlayers in the Tournament.
+        Returns a dict, keyed by GreatPower, of lists of lists of GamePlayers,
+        as for best_countries(whole_list=True).
+        """
+        gps = gps.filter(power__isnull=False).select_related('power',
+                                                             'player',
+                                                             'game__the_round__tournament')
+        # Populate tuples. Dict, keyed by GreatPower,
+        # of lists of (GamePlayer, score, dots, unranked) 4-tuples
+        unranked_by_player_id = dict(self.tournamentplayer_set.values_list('player_id',
+                                                                           'unranked'))
+        tuples = {}
+        for gp in gps:
+            tuple_ = (gp, gp.score, gp.final_scs or 0, unranked_by_player_id.get(gp.player_id, False))
+            tuples.setdefault(gp.power, []).append(tuple_)
+        retval = {}
+        for power, power_tuples in tuples.items():
+            self._sort_best_country_list(power_tuples)
+            retval[power] = []
+            # Store the score, dot count, and unranked for the last tuple accessed
+            last = None
+            for tup in power_tuples:
+                nxt = tup[1:]
+                if nxt == last:
+                    # Tie - append to current list
+                    retval[power][-1].append(tup[0])
+                else:
+                    # No tie - start a new list
+                    retval[power].append([tup[0]])
+                last = nxt
+        return retval
+
+    def _update_best_countries(self, power_ids=None):
+        """
+        Store where every result ranks among the results with the same power.
+
+        power_ids is an optional iterable of GreatPower ids. If provided,
+        only the results with those GreatPowers are re-ranked.
+        Only the BestCountryRanks that have changed are written.
+        """
+        gps = GamePlayer.objects.filter(game__the_round__tournament=self)
+        existing = BestCountryRank.objects.filter(tournament=self)
+        if power_ids is not None:
+            power_ids = [p_id for p_id in power_ids if p_id is not None]
+            gps = gps.filter(power_id__in=power_ids)
+            existing = existing.filter(power_id__in=power_ids)
+        ranks = []
+        for power, gp_lists in self._best_country_lists(gps).items():
+            for rank, gps in enumerate(gp_lists, start=1):
+                ranks += [BestCountryRank(tournament=self, power=power, gameplayer=gp, rank=rank)
+                          for gp in gps]
+        old = {gp_id: (pk, power_id, rank) for pk, gp_id, power_id, rank in existing.values_list('pk',
+                                                                                                'gameplayer_id',
+                                                                                                'power_id',
+                                                                                                'rank')}
+        changed = []
+        for bcr in ranks:
+            prev = old.pop(bcr.gameplayer_id, None)
+            if (prev is None) or (prev[1:] != (bcr.power_id, bcr.rank)):
+                changed.append(bcr)
+        with transaction.atomic():
+            if old:
+                BestCountryRank.objects.filter(pk__in=[pk for pk, _, _ in old.values()]).delete()
+            if changed:
+                # Update in place, so that concurrent writers can't clash on the unique constraint
+                BestCountryRank.objects.bulk_create(changed,
+                                                    update_conflicts=True,
+                                                    unique_fields=['gameplayer'],
+                                                    update_fields=['tournament', 'power', 'rank'])
+
+    def _stored_best_countries(self):
+        """
+        Returns the stored BestCountryRanks.
+
+        Returns a dict, keyed by GreatPower, of lists of lists of GamePlayers,
+        as for best_countries(whole_list=True).
+        This never writes to the database. If the rankings haven't been
+        stored yet (e.g. the Tournament hasn't been scored since it was created),
+        they are calculated without being stored.
+        """
+        ranks = BestCountryRank.objects.filter(tournament=self).select_related('power',
+                                                                               'gameplayer__power',
+                                                                               'gameplayer__player',
+                                                                               'gameplayer__game__the_round__tournament')
+        ranks = ranks.order_by('power_id', 'rank', 'pk')
+        rows = list(ranks)
+        if not rows:
+            return self._best_country_lists(GamePlayer.objects.filter(game__the_round__tournament=self))
+        retval = {}
+        for bcr in rows:
+            gp_lists = retval.setdefault(bcr.power, [])
+            if len(gp_lists) < bcr.rank:
+                gp_lists.append([])
+            gp_lists[bcr.rank - 1].append(bcr.gameplayer)
+        return retval
+
+    def seeder_history(self, before_round):
+        """
+        Summarise the Games played in earlier Rounds, for seeding before_round.
+
+        Returns a 2-tuple of dicts.
+        The first is keyed by 2-tuples of TournamentPlayer pks (lowest first),
+        with the number of Games each pair of players has played together.
+        The second is keyed by (TournamentPlayer pk, GreatPower pk) 2-tuples,
+        with the number of Games each player has played each power.
+        Uses the stored SharedGameCounts and PowerGameCounts of finished Rounds,
+        rebuilding them first for any Round that is unfinished or hasn't been stored.
+        """
+        rounds = self.round_set.filter(start__lt=before_round.start)
+        stale = rounds.filter(game__gameplayer__isnull=False)
+        stale = stale.filter(Q(is_finished=False)
+                             | (~Q(pk__in=SharedGameCount.objects.values('the_round_id'))
+                                & ~Q(pk__in=PowerGameCount.objects.values('the_round_id'))))
+        for r in stale.distinct():
+            r._update_seeder_history()
+        shared = SharedGameCount.objects.filter(the_round__in=rounds).order_by()
+        shared = shared.values_list('player1_id', 'player2_id').annotate(total=Sum('count'))
+        powers = PowerGameCount.objects.filter(the_round__in=rounds).order_by()
+        powers = powers.values_list('player_id', 'power_id').annotate(total=Sum('count'))
+        return ({(tp1, tp2): total for tp1, tp2, total in shared},
+                {(tp, power): total for tp, power, total in powers})
+
     def best_countries(self, whole_list=False, after_round_num=None):
         """
         Find the best result for every power
@@ -1531,58 +2221,22 @@ class Tournament(models.Model):
         A, B, and C with scores of 2.0, 5.0, and 2.0 respectively would be
         returned as [[B], [A, C]].
         If after_round_num is None, determines the best countries if all games
-        ended now. Otherwise, returns best countries after the specified round
-        had completed.
+        ended now, from the stored BestCountryRanks. Otherwise, returns best
+        countries after the specified round had completed.
         Note that this does not consider who was given any "best country" awards.
         """
-        tuples = {}
+        if after_round_num is None:
+            gp_lists = self._stored_best_countries()
+        else:
+            gp_lists = self._best_country_lists(GamePlayer.objects.filter(game__the_round__tournament=self,
+                                                                          game__the_round__round_number__lte=after_round_num))
         # If no Games exist, return a dict of empty lists
-        if not Game.objects.filter(the_round__tournament=self).exists():
-            for power in GreatPower.objects.all():
-                tuples[power] = []
-            return tuples
-        # Populate tuples. Dict, keyed by GreatPower,
-        # of lists of (GamePlayer, score, dots, unranked) 4-tuples
-        unranked_by_player_id = dict(self.tournamentplayer_set.values_list('player_id',
-                                                                           'unranked'))
-        for gp in GamePlayer.objects.filter(game__the_round__tournament=self).select_related('power',
-                                                       'player',
-                                                       'game__the_round__tournament'):
-            if not gp.power:
-                continue
-            if (after_round_num is not None) and (gp.game.the_round.number() > after_round_num):
-                continue
-            tuple_ = (gp, gp.score, gp.final_sc_count(), unranked_by_player_id.get(gp.player_id, False))
-            tuples.setdefault(gp.power, []).append(tuple_)
-        for power in tuples:
-            self._sort_best_country_list(tuples[power])
-        retval = {}
+        if not gp_lists and not Game.objects.filter(the_round__tournament=self).exists():
+            return {power: [] for power in reference_data.great_powers()}
         if whole_list:
-            for power in tuples:
-                retval[power] = []
-                # Store the score, dot count, and unranked for the last tuple accessed
-                last = (None, None, None)
-                while len(tuples[power]):
-                    tup = tuples[power].pop(0)
-                    nxt = tup[1:]
-                    if nxt == last:
-                        # Tie - append to current list
-                        retval[power][-1].append(tup[0])
-                    else:
-                        # No tie - start a new list
-                        retval[power].append([tup[0]])
-                    last = nxt
-            return retval
+            return gp_lists
         # Filter out all except the best for each country
-        for power in tuples:
-            best_gp, best_score, best_dots, best_unranked = tuples[power].pop(0)
-            list_ = [best_gp]
-            for gp, score, dots, unranked in tuples[power]:
-                # It's only a tie if all three criteria match
-                if (score == best_score) and (dots == best_dots) and (unranked == best_unranked):
-                    list_.append(gp)
-            retval[power] = list_
-        return retval
+        return {power: power_lists[0] for power, power_lists in gp_lists.items()}
 
     def background(self, mask=MASK_ALL_BG):
         """
@@ -2044,7 +2698,7 @@ class TournamentPlayer(models.Model):
         # Remove any existing preferences for this player
         self.preference_set.all().delete()
         to_power = {}
-        for p in GreatPower.objects.all():
+        for p in reference_data.great_powers():
             to_power[p.abbreviation] = p
         # Go through the string, creating Preferences
         with transaction.atomic():
@@ -2181,6 +2835,8 @@ class Round(models.Model):
     email_sent = models.BooleanField(default=False)
     is_finished = models.BooleanField(default=False)
     is_team_round = models.BooleanField(default=False)
+    # Position within the Tournament, in start order. Maintained by save() and deletion
+    round_number = models.PositiveSmallIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['start']
@@ -2205,9 +2861,15 @@ class Round(models.Model):
         If scoring_system attribute may have changed, updates score attributes of any
         GamePlayers and corresponding RoundPlayers and TournamentPlayers.
         If is_finished may have changed, calls Tournament.set_is_finished().
+        If start may have changed, renumbers the Rounds of the Tournament.
         """
         super().save(*args, **kwargs)
 
+        if ('update_fields' not in kwargs) or ('start' in kwargs['update_fields']):
+            # The order of the Rounds may have changed
+            self.round_number = _renumber_rounds(self.tournament_id)[self.pk]
+            self._forget_tournament_rounds()
+
         if ('update_fields' not in kwargs) or ('scoring_system' in kwargs['update_fields']):
             # Change may affect the scoring
             try:
@@ -2216,8 +2878,9 @@ class Round(models.Model):
                 pass
             else:
                 # Re-score all Games. This will call self.update_scores()
-                for g in self.game_set.order_by():
-                    g.update_scores()
+                games = self.game_set.select_related('the_round__tournament', 'pool').order_by()
+                update_scores_for_games(games.prefetch_related('centrecount_set',
+                                                               'drawproposal_set__drawing_powers'))
 
         if ('update_fields' not in kwargs) or ('is_team_round' in kwargs['update_fields']):
             self.tournament.update_team_scores()
@@ -2301,6 +2964,20 @@ class Round(models.Model):
         If for_players is not provided, every RoundPlayer's score will be updated.
         This method also calls to update the corresponding TournamentPlayers' scores.
         """
+        self._update_roundplayer_scores(for_players)
+        # That could change the Tournament scoring for those Players
+        self.tournament.update_scores(for_players)
+        if self.is_team_round:
+            self.tournament.update_team_scores(for_players)
+        # Cache the players' tournament scores for this and any later rounds
+        self.tournament._update_roundplayer_tournament_scores(for_players, self)
+
+    def _update_roundplayer_scores(self, for_players=None):
+        """
+        Updates the score attributes of RoundPlayers, without propagating the change.
+
+        for_players is an optional list or QuerySet of Players whose scores should change.
+        """
         system = self.tournament.round_scoring_system_obj()
         gps = GamePlayer.objects.filter(game__the_round=self).distinct()
         if for_players is not None:
@@ -2346,51 +3023,12 @@ class Round(models.Model):
                 changed_score_rps[rp.pk] = rp
         if changed_score_rps:
             RoundPlayer.objects.bulk_update(changed_score_rps.values(), fields)
-        # That could change the Tournament scoring for those Players
-        self.tournament.update_scores(for_players)
-        if self.is_team_round:
-            self.tournament.update_team_scores(for_players)
-        # Cache the players' tournament scores
-        # Most of the time, this is called for the current round,
-        # but we need to be careful if a later round has started
-        rps2 = RoundPlayer.objects.none()
-        next_one = False
-        for next_round in self.tournament.round_set.all():
-            if next_round == self:
-                next_one = True
-            elif next_one:
-                break
-            rps2 |= next_round.roundplayer_set.order_by()
-        # Is there a later round, and if so, has it got Games (and thus potentially scores) ?
-        if (next_round != self) and (next_round.game_set.exists()):
-            # Figure out tournament scores without any later rounds
-            if for_players is not None:
-                rps2 = rps2.filter(player__in=for_players)
-            t_scores = self.tournament._calculated_scores(rps2)
-            changed_tournament_score_rps = {}
-            for rp in rps:
-                tournament_score = t_scores.get(rp.player, 0.0)
-                if rp.tournament_score != tournament_score:
-                    rp.tournament_score = tournament_score
-                    changed_tournament_score_rps[rp.pk] = rp
-        else:
-            # Tournament score calculated earlier doesn't include any later Rounds
-            tp_scores = dict(self.tournament.tournamentplayer_set.filter(
-                player_id__in=[rp.player_id for rp in rps]
-            ).values_list('player_id', 'score'))
-            changed_tournament_score_rps = {}
-            for rp in rps:
-                tournament_score = tp_scores.get(rp.player_id, 0.0)
-                if rp.tournament_score != tournament_score:
-                    rp.tournament_score = tournament_score
-                    changed_tournament_score_rps[rp.pk] = rp
-        if changed_tournament_score_rps:
-            RoundPlayer.objects.bulk_update(changed_tournament_score_rps.values(), ['tournament_score'])
 
     def set_is_finished(self):
         """
         Sets self.is_finished to True if the Round has games, and they have all finished.
         Calls self.tournament.set_is_finished() if the round has finished.
+        Stores the seeder history of a finished Round.
         """
         gs = self.game_set.order_by()
         if not gs:
@@ -2398,6 +3036,8 @@ class Round(models.Model):
             return
         self.is_finished = not gs.filter(is_finished=False).exists()
         self.save(update_fields=['is_finished'])
+        if self.is_finished:
+            self._update_seeder_history()
 
     def in_progress(self):
         """
@@ -2420,17 +3060,20 @@ class Round(models.Model):
         """
         Which round within the tournament is this one ?
         """
-        rounds = self.tournament.round_set.all()
-        for count, r in enumerate(rounds, 1):
-            if r == self:
-                return count
-        raise AssertionError("Round doesn't exist within its own tournament")
+        if not self.round_number:
+            raise AssertionError("Round doesn't exist within its own tournament")
+        return self.round_number
 
     def is_last(self):
         """
         Is this the last round of the tournament ?
         """
-        return self == self.tournament.round_set.order_by('start').last()
+        return not self.tournament.round_set.filter(round_number__gt=self.round_number).exists()
+
+    def _forget_tournament_rounds(self):
+        """Discard the cached ordered_rounds() of the Tournament object, if it has been read"""
+        if Round.tournament.is_cached(self):
+            self.tournament._ordered_rounds = None
 
     def board_call_msg(self):
         """
@@ -2471,6 +3114,41 @@ class Round(models.Model):
         random.shuffle(results)
         return results
 
+    def _update_seeder_history(self):
+        """
+        Store how often each pair of players shared a Game, and who played each power, in this Round.
+
+        Replaces any existing SharedGameCounts and PowerGameCounts for the Round.
+        GamePlayers whose player is no longer in the Tournament are ignored.
+        """
+        tp_ids = dict(self.tournament.tournamentplayer_set.values_list('player_id', 'id'))
+        game_tps = defaultdict(list)
+        power_counts = Counter()
+        gps = GamePlayer.objects.filter(game__the_round=self).order_by()
+        for game_id, player_id, power_id in gps.values_list('game_id', 'player_id', 'power_id'):
+            tp_id = tp_ids.get(player_id)
+            if tp_id is None:
+                continue
+            game_tps[game_id].append(tp_id)
+            if power_id is not None:
+                power_counts[(tp_id, power_id)] += 1
+        shared_counts = Counter()
+        for tps in game_tps.values():
+            shared_counts.update(combinations(sorted(tps), 2))
+        with transaction.atomic():
+            SharedGameCount.objects.filter(the_round=self).delete()
+            PowerGameCount.objects.filter(the_round=self).delete()
+            SharedGameCount.objects.bulk_create([SharedGameCount(the_round=self,
+                                                                 player1_id=tp1,
+                                                                 player2_id=tp2,
+                                                                 count=count)
+                                                 for (tp1, tp2), count in shared_counts.items()])
+            PowerGameCount.objects.bulk_create([PowerGameCount(the_round=self,
+                                                               player_id=tp,
+                                                               power_id=power,
+                                                               count=count)
+                                                for (tp, power), count in power_counts.items()])
+
 
 class Pool(models.Model):
     """
@@ -2536,7 +3214,7 @@ class Pool(models.Model):
                 raise ValidationError({'determines_top_rankings': _('A round may not have more than one pool with determines_top_rankings set')})
             if self.board_count is None:
                 raise ValidationError({'determines_top_rankings': _('determines_top_rankings only makes sense if board_count is also set')})
-            elif self.determines_top_rankings > (GreatPower.objects.count() * self.board_count):
+            elif self.determines_top_rankings > (len(reference_data.great_powers()) * self.board_count):
                 raise ValidationError({'determines_top_rankings': _('Not enough players in the pool')})
 
 
@@ -2547,6 +3225,20 @@ class GameManager(models.Manager):
         """Games in stable power-assignment order."""
         return self.get_queryset().order_by('name')
 
+    def bulk_create_games(self, games):
+        """
+        Add the (unsaved) Games to the database, using a handful of queries.
+
+        Unlike bulk_create(), this also does everything that Game.save()
+        does for each new Game, and sends post_save for each of them.
+        Returns the list of Games.
+        """
+        with transaction.atomic(using=self.db):
+            games = self.bulk_create(games)
+            Game._after_insert(games)
+        _send_post_save_for_created(Game, games, self.db)
+        return games
+
 
 class Game(models.Model):
     """
@@ -2585,37 +3277,63 @@ class Game(models.Model):
         """
         Save the object to the database.
 
-        Ensures that 1901 SC counts and ownership info exists.
-        Ensures that S1901M image exists.
+        When a Game is first saved, creates the 1900 SC counts and ownership info
+        and the S1901M image. If the_set may have changed, updates that image.
         If is_finished attribute may be changed, called Round.set_is_finished().
         """
-        super().save(*args, **kwargs)
-
-        # Auto-create 1900 SC counts (unless they already exist)
-        # Auto-create SC Ownership (unless they already exist)
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
         with transaction.atomic():
-            for power in GreatPower.objects.all():
-                CentreCount.objects.update_or_create(power=power,
-                                                     game=self,
-                                                     year=FIRST_YEAR - 1,
-                                                     defaults={'count': power.starting_centres})
-                for sc in SupplyCentre.objects.filter(initial_owner=power):
-                    SupplyCentreOwnership.objects.get_or_create(owner=power,
-                                                                game=self,
-                                                                year=FIRST_YEAR - 1,
-                                                                sc=sc)
-
-        # Auto-create S1901M image (if it doesn't exist)
-        GameImage.objects.update_or_create(game=self,
-                                           year=FIRST_YEAR,
-                                           season=Seasons.SPRING,
-                                           phase=Phases.MOVEMENT,
-                                           defaults={'image': self.the_set.initial_image})
+            super().save(*args, **kwargs)
+            if adding:
+                Game._after_insert([self])
+                return
+            if (update_fields is None) or ('the_set' in update_fields):
+                self.gameimage_set.filter(year=FIRST_YEAR,
+                                          season=Seasons.SPRING,
+                                          phase=Phases.MOVEMENT).update(image=self.the_set.initial_image)
 
         # Some change may affect the is_finished attribute of the Round
-        if ('update_fields' not in kwargs) or ('is_finished' in kwargs['update_fields']):
+        if (update_fields is None) or ('is_finished' in update_fields):
             self.the_round.set_is_finished()
 
+    @staticmethod
+    def _after_insert(games):
+        """
+        Do what is needed once the Games have been added to the database.
+
+        Used by both save() and GameManager.bulk_create_games().
+        Creates the initial state of each Game, and updates whether their Rounds are finished.
+        """
+        Game.create_initial_state(games)
+        for r in {g.the_round_id: g.the_round for g in games}.values():
+            r.set_is_finished()
+
+    @staticmethod
+    def create_initial_state(games):
+        """
+        Create the 1900 SC counts and ownership info and the S1901M image for the Games.
+
+        Anything that already exists is left alone.
+        Uses three queries, however many Games there are, and sends no signals.
+        """
+        ccs = []
+        scos = []
+        for g in games:
+            for power in reference_data.great_powers():
+                centres = reference_data.initial_centres(power)
+                ccs.append(CentreCount(power=power, game=g, year=FIRST_YEAR - 1, count=len(centres)))
+                for sc in centres:
+                    scos.append(SupplyCentreOwnership(owner=power, game=g, year=FIRST_YEAR - 1, sc=sc))
+        CentreCount.objects.bulk_create(ccs, ignore_conflicts=True)
+        SupplyCentreOwnership.objects.bulk_create(scos, ignore_conflicts=True)
+        GameImage.objects.bulk_create([GameImage(game=g,
+                                                 year=FIRST_YEAR,
+                                                 season=Seasons.SPRING,
+                                                 phase=Phases.MOVEMENT,
+                                                 image=g.the_set.initial_image) for g in games],
+                                      ignore_conflicts=True)
+
     def get_absolute_url(self):
         """Returns the canonical URL for the object."""
         return reverse('game_detail',
@@ -2675,11 +3393,32 @@ class Game(models.Model):
             pos = ranks[gp.player][0]
             position_to_gps.setdefault(pos, []).append(gp)
         # Starting from the lowest rank, work through the whole list
+        choosing_order = []
         for pos in sorted(position_to_gps.keys(), reverse=True):
             # At each rank, order players randomly
             random.shuffle(position_to_gps[pos])
-            for gp in position_to_gps[pos]:
-                gp.set_power_from_prefs()
+            choosing_order += position_to_gps[pos]
+        powers = list(reference_data.great_powers())
+        power_index = {p.pk: n for n, p in enumerate(powers)}
+        # Dict, keyed by player id, of dicts, keyed by power index, of (zero-based) ranking
+        rankings = {}
+        prefs = Preference.objects.filter(player__tournament=self.the_round.tournament_id,
+                                          player__player__in=[gp.player_id for gp in gps])
+        for player_id, power_id, ranking in prefs.values_list('player__player_id', 'power_id', 'ranking'):
+            rankings.setdefault(player_id, {})[power_index[power_id]] = ranking - 1
+        # Solve it as an assignment problem. Each player's cost for a power
+        # is how far down their list it is, with unranked powers last.
+        # Weighting the costs so that each player's choice outweighs that of
+        # everyone after them gives the same result as each choosing in turn
+        base = len(powers) + 1
+        costs = []
+        for n, gp in enumerate(choosing_order):
+            weight = base ** (len(choosing_order) - 1 - n)
+            player_rankings = rankings.get(gp.player_id, {})
+            costs.append([weight * player_rankings.get(i, len(powers)) for i in range(len(powers))])
+        for gp, i in zip(choosing_order, min_cost_assignment(costs)):
+            gp.power = powers[i]
+            gp.save(update_fields=['power'])
 
     def set_is_finished(self, year=None):
         """
@@ -2709,46 +3448,58 @@ class Game(models.Model):
         if not all_scos.exists():
             raise SCOwnershipsNotFound(f'{year} of game {str(self)}')
         with transaction.atomic():
-            for p in GreatPower.objects.all():
+            for p in reference_data.great_powers():
                 CentreCount.objects.update_or_create(power=p,
                                                      game=self,
                                                      year=year,
                                                      defaults={'count': all_scos.filter(owner=p).count()})
 
-    def compare_sc_counts_and_ownerships(self, year):
+    def update_gameplayer_sc_counts(self, power_id=None):
+        """
+        Update the final_scs and year_eliminated attributes of the GamePlayers.
+
+        They are also updated when the Game is scored, and when changes to
+        its CentreCounts or GamePlayers are committed. This updates them now.
+        power_id is an optional GreatPower id. If provided, just the GamePlayer
+        playing that GreatPower is updated.
+        """
+        ccs = self.centrecount_set.all()
+        gps = self.gameplayer_set.all()
+        if power_id is not None:
+            ccs = ccs.filter(power_id=power_id)
+            gps = gps.filter(power_id=power_id)
+        _update_sc_summaries(gps, ccs)
+
+    def compare_sc_counts_and_ownerships(self, year, history=None):
         """
         Check SupplyCentreOwnerships against CentreCounts
 
         Compares the SupplyCentreOwnerships and CentreCounts for the given
         game year.
+        history is an optional BoardHistory for the Game, to save re-reading them.
         Returns a list of strings describing any issues.
         Can raise SCOwnershipsNotFound.
         """
-        all_scos = self.supplycentreownership_set.filter(year=year).order_by()
-        if not all_scos.exists():
+        if history is None:
+            history = BoardHistory(self)
+        if not history.has_ownerships(year):
             raise SCOwnershipsNotFound(f'{year} of game {str(self)}')
         retval = []
-        for p in GreatPower.objects.all():
-            sco_dots = all_scos.filter(owner=p).count()
-            try:
-                cc = CentreCount.objects.get(power=p,
-                                             game=self,
-                                             year=year)
-            except CentreCount.DoesNotExist:
+        for p, sco_dots, count in zip(history.powers, history.owned_counts(year), history.counts(year)):
+            if count is None:
                 retval.append(ngettext('Missing count of one centre for %(power)s',
                                        'Missing count of %(dots)d centres for %(power)s',
                                        sco_dots)
                               % {'dots': sco_dots,
                                  'power': p})
-            else:
-                if cc.count != sco_dots:
-                    retval.append(ngettext('%(power)s owns one centre in %(year)d, but their centrecount is %(dots)d',
-                                           '%(power)s owns %(sco_dots)d centres in %(year)d, but their centrecount is %(dots)d',
-                                           sco_dots)
-                                  % {'power': p,
-                                     'year': year,
-                                     'sco_dots': sco_dots,
-                                     'dots': cc.count})
+            elif count != sco_dots:
+                retval.append(ngettext('%(power)s owns one centre in %(year)d, but their centrecount is %(dots)d',
+                                       '%(power)s owns %(sco_dots)d centres in %(year)d, but their centrecount is %(dots)d',
+                                       sco_dots)
+                              % {'power': p,
+                                 'year': year,
+                                 'sco_dots': sco_dots,
+                                 'dots': count})
         return retval
 
     def _calc_scores(self):
@@ -2759,7 +3510,14 @@ class Game(models.Model):
         """
         system = self.the_round.game_scoring_system_obj()
         tgs = TournamentGameState(self)
-        scores = system.scores(tgs)
+        return self._scale_scores(system.scores(tgs))
+
+    def _scale_scores(self, scores):
+        """
+        Apply any Pool game score multiplier to the Game scores.
+
+        Return value is a dict, indexed by power id, of scores.
+        """
         if (self.pool is None) or (self.pool.game_score_multiplier is None):
             return scores
         # Apply the multiplier
@@ -2793,15 +3551,43 @@ class Game(models.Model):
         Also updates score if if was previously equal to calculated_score.
         Then calls the equivalent function for the Round this Game is in, unless update_round is False.
         """
-        scores = self._calc_scores()
-        gps = self.gameplayer_set.select_related('power').order_by()
+        if update_round:
+            pending = getattr(_deferred_scoring, 'games', None)
+            if pending is not None:
+                # Rescore when the deferred_score_updates() context exits
+                pending[self.pk] = self
+                return
+            update_scores_for_games([self])
+            return
+        _, changed_gps = self._update_gameplayer_scores(*_calc_scores_for_games([self])[self])
+        if changed_gps:
+            GamePlayer.objects.bulk_update(changed_gps, _GAMEPLAYER_SCORING_FIELDS)
+            self.the_round.tournament._update_best_countries({gp.power_id for gp in changed_gps})
+
+    def _update_gameplayer_scores(self, scores, state):
+        """
+        Set the GamePlayers' score and supply centre summary attributes, without saving them.
+
+        scores is a dict, indexed by power, of Game scores.
+        state is the TournamentGameState for the Game.
+        Returns a 2-tuple of a list of all the GamePlayers and a list of those
+        whose attributes changed.
+        """
+        gps = list(self.gameplayer_set.select_related('power', 'player').order_by())
+        changed_gps = []
         for gp in gps:
+            changed = False
+            summary = (None, None)
             if gp.power:
-                _save_score(gp, scores[gp.power])
-        if update_round:
-            # Only the scores for this Game's players can have changed
-            players = [gp.player for gp in gps]
-            self.the_round.update_scores(players)
+                changed = _set_score(gp, scores[gp.power])
+                summary = _sc_summary((year, counts[gp.power]) for year, counts in sorted(state.sc_counts.items())
+                                      if gp.power in counts)
+            if (gp.final_scs, gp.year_eliminated) != summary:
+                gp.final_scs, gp.year_eliminated = summary
+                changed = True
+            if changed:
+                changed_gps.append(gp)
+        return gps, changed_gps
 
     def positions(self):
         """
@@ -2895,7 +3681,7 @@ class Game(models.Model):
             scs = scs.filter(year__lte=year)
         result = []
         # Find the most recent CentreCount for each GreatPower
-        for power in GreatPower.objects.all():
+        for power in reference_data.great_powers():
             power_scs = scs.filter(power=power)
             sc = power_scs.last()
             if sc.count > 0:
@@ -3254,6 +4040,232 @@ def _update_scores_after_roundplayer_delete(sender, instance, **kwargs):
             pass
         else:
             instance.the_round.tournament.update_scores([instance.player])
+            # The Round itself may be being deleted, so leave the standings until the end
+            _standings_changed(instance.the_round.tournament_id)
+
+
+class RoundStanding(models.Model):
+    """
+    A player's position and tournament score after a Round
+
+    These are written by Tournament._update_standings() whenever scores are
+    updated, or anything else they depend on changes.
+    """
+    the_round = models.ForeignKey(Round, verbose_name=_(u'round'), on_delete=models.CASCADE)
+    player = models.ForeignKey(Player, on_delete=models.CASCADE)
+    rank = models.PositiveIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['the_round__start', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['the_round', 'player'],
+                                    name='unique_standing_round_player'),
+        ]
+
+    def __str__(self):
+        return _(u'%(player)s after %(round)s') % {'player': self.player,
+                                                   'round': self.the_round}
+
+
+class TeamRoundStanding(models.Model):
+    """
+    A Team's position and score after a Round
+
+    These are written by Tournament._update_standings() whenever scores are
+    updated, or anything else they depend on changes.
+    """
+    the_round = models.ForeignKey(Round, verbose_name=_(u'round'), on_delete=models.CASCADE)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE)
+    rank = models.PositiveIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['the_round__start', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['the_round', 'team'],
+                                    name='unique_standing_round_team'),
+        ]
+
+    def __str__(self):
+        return _(u'%(team)s after %(round)s') % {'team': self.team.name,
+                                                 'round': self.the_round}
+
+
+class SharedGameCount(models.Model):
+    """
+    How many Games in a Round two TournamentPlayers played together
+
+    player1 always has the lower pk.
+    These are written by Round._update_seeder_history() when the Round's Games
+    are finished, and when seeding a later Round.
+    """
+    the_round = models.ForeignKey(Round, verbose_name=_(u'round'), on_delete=models.CASCADE)
+    player1 = models.ForeignKey(TournamentPlayer, related_name='+', on_delete=models.CASCADE)
+    player2 = models.ForeignKey(TournamentPlayer, related_name='+', on_delete=models.CASCADE)
+    count = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['the_round', 'player1', 'player2'],
+                                    name='unique_shared_round_players'),
+        ]
+
+    def __str__(self):
+        return _(u'%(player1)s and %(player2)s in %(round)s') % {'player1': self.player1,
+                                                                 'player2': self.player2,
+                                                                 'round': self.the_round}
+
+
+class PowerGameCount(models.Model):
+    """
+    How many Games in a Round a TournamentPlayer played a GreatPower
+
+    These are written by Round._update_seeder_history() when the Round's Games
+    are finished, and when seeding a later Round.
+    """
+    the_round = models.ForeignKey(Round, verbose_name=_(u'round'), on_delete=models.CASCADE)
+    player = models.ForeignKey(TournamentPlayer, related_name='+', on_delete=models.CASCADE)
+    power = models.ForeignKey(GreatPower, related_name='+', on_delete=models.CASCADE)
+    count = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['the_round', 'player', 'power'],
+                                    name='unique_power_round_player'),
+        ]
+
+    def __str__(self):
+        return _(u'%(player)s as %(power)s in %(round)s') % {'player': self.player,
+                                                             'power': self.power,
+                                                             'round': self.the_round}
+
+
+class SeedingJob(models.Model):
+    """
+    Seeding the Games for a Round, possibly in the background
+
+    result is set once seeding has finished, to a list with a dict for each
+    Game, with keys 'pool' (a Pool pk or None), 'players' (a list of
+    [TournamentPlayer pk, GreatPower pk or None] 2-lists) and 'issues'
+    (a list of strings).
+    heartbeat is updated whenever the seeder reports progress, so that a job
+    left RUNNING by a worker that has died can be spotted.
+    """
+    the_round = models.OneToOneField(Round, verbose_name=_(u'round'), on_delete=models.CASCADE)
+    status = models.CharField(max_length=1,
+                              choices=SeedingStatus.choices,
+                              default=SeedingStatus.RUNNING)
+    started_at = models.DateTimeField(auto_now_add=True)
+    heartbeat = models.DateTimeField(default=django_timezone.now,
+                                     help_text=_('When seeding last reported progress'))
+    best_fitness = models.IntegerField(blank=True,
+                                       null=True,
+                                       help_text=_('Fitness score of the best seeding found so far. Lower is better'))
+    accept_requested = models.BooleanField(default=False,
+                                           help_text=_('Set to stop seeding and use the best seeding found so far'))
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    def fail_if_stale(self):
+        """
+        Mark the job FAILED if it is RUNNING but hasn't reported progress recently.
+
+        settings.SEEDING_JOB_TIMEOUT is the number of seconds without progress
+        after which the worker is assumed to have died.
+        Returns True if the job was marked FAILED.
+        """
+        if self.status != SeedingStatus.RUNNING:
+            return False
+        cutoff = django_timezone.now() - timedelta(seconds=settings.SEEDING_JOB_TIMEOUT)
+        if self.heartbeat >= cutoff:
+            return False
+        # Check again in the database, in case progress was reported since the job was read
+        stale = SeedingJob.objects.filter(pk=self.pk, status=SeedingStatus.RUNNING, heartbeat__lt=cutoff)
+        if not stale.update(status=SeedingStatus.FAILED, error=_('Seeding stopped responding')):
+            return False
+        self.refresh_from_db()
+        return True
+
+    def __str__(self):
+        return _(u'Seeding %(round)s') % {'round': self.the_round}
+
+
+class TournamentVersion(models.Model):
+    """
+    A count of the changes to the data shown on a Tournament's pages
+
+    This only ever increases, so it can be used to tell whether a page
+    needs to be generated again.
+    Created when first needed, and increased by _data_changed().
+    """
+    tournament = models.OneToOneField(Tournament, primary_key=True, on_delete=models.CASCADE)
+    version = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def for_tournament(cls, tournament_id):
+        """
+        Return the TournamentVersion for the Tournament with the specified pk.
+
+        Returns None if there is no such Tournament.
+        """
+        try:
+            return cls.objects.select_related('tournament').get(tournament_id=tournament_id)
+        except cls.DoesNotExist:
+            pass
+        if not Tournament.objects.filter(pk=tournament_id).exists():
+            return None
+        return cls.objects.get_or_create(tournament_id=tournament_id)[0]
+
+    def __str__(self):
+        return _(u'%(tournament)s version %(version)d') % {'tournament': self.tournament,
+                                                           'version': self.version}
+
+
+class GameVersion(models.Model):
+    """
+    A count of the changes to the data shown on a Game's pages
+
+    See TournamentVersion.
+    """
+    game = models.OneToOneField(Game, primary_key=True, on_delete=models.CASCADE)
+    version = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def for_game(cls, tournament_id, game_name):
+        """
+        Return the GameVersion for the named Game in the Tournament with the specified pk.
+
+        Returns None if there is no such Game.
+        """
+        try:
+            return cls.objects.get(game__name=game_name, game__the_round__tournament_id=tournament_id)
+        except cls.DoesNotExist:
+            pass
+        game_id = Game.objects.filter(name=game_name,
+                                      the_round__tournament_id=tournament_id).values_list('pk', flat=True).first()
+        if game_id is None:
+            return None
+        return cls.objects.get_or_create(game_id=game_id)[0]
+
+    def __str__(self):
+        return _(u'%(game)s version %(version)d') % {'game': self.game,
+                                                     'version': self.version}
+
+
+class GamePlayerManager(models.Manager):
+    """Manager for GamePlayers"""
+
+    def bulk_create_gameplayers(self, gps):
+        """
+        Add the (unsaved) GamePlayers to the database, using a single query.
+
+        Unlike bulk_create(), this also sends post_save for each new GamePlayer.
+        Returns the list of GamePlayers.
+        """
+        gps = self.bulk_create(gps)
+        _send_post_save_for_created(GamePlayer, gps, self.db)
+        return gps
 
 
 class GamePlayer(models.Model):
@@ -3279,6 +4291,19 @@ class GamePlayer(models.Model):
                                          help_text=_('Score as calculated by the system'))
     after_action_report = models.TextField(blank=True,
                                            help_text=_("This player's account of the game"))
+    # These attributes summarise the CentreCounts for the power in the game
+    # They are updated by the scoring code, along with the scores,
+    # and when changes to the CentreCounts or GamePlayers are committed
+    final_scs = models.PositiveSmallIntegerField(blank=True,
+                                                 null=True,
+                                                 validators=[validate_max_supplycentres],
+                                                 help_text=_('Latest supply centre count'))
+    year_eliminated = models.PositiveSmallIntegerField(blank=True,
+                                                       null=True,
+                                                       validators=[validate_year],
+                                                       help_text=_('Year in which the power was eliminated'))
+
+    objects = GamePlayerManager()
 
     class Meta:
         ordering = ['game', 'power']
@@ -3343,33 +4368,17 @@ class GamePlayer(models.Model):
         """
         Returns True if this GamePlayer is the best result for this power (so far)
         """
-        # Check all the other players of this power in the tournament
+        if self.power_id is None:
+            return False
+        try:
+            return self.best_country_rank.rank == 1
+        except BestCountryRank.DoesNotExist:
+            pass
+        # Not stored yet, so work it out without storing it
         t = self.game.the_round.tournament
-        gps = GamePlayer.objects.filter(power=self.power,
-                        game__the_round__tournament=t).select_related('player')
-        if self.tournamentplayer().unranked:
-            # If there are ranked GamePlayers of the same power,
-            # they will rank ahead of this GamePlayer.
-            # If they're all unranked, fall through to compare scores/dots
-            tps = t.tournamentplayer_set.filter(unranked=False).order_by()
-            for gp in gps:
-                if tps.filter(player=gp.player).exists():
-                    return False
-        if self.game.the_round.tournament.best_country_criterion == BestCountryCriteria.SCORE:
-            gp = gps.order_by('-score').first()
-            if gp.score > self.score:
-                return False
-            if (gp.score == self.score) and (gp.final_sc_count() > self.final_sc_count()):
-                return False
-        else:
-            gp = sorted(gps, key=lambda gp: gp.final_sc_count(), reverse=True)[0]
-            gp_dots = gp.final_sc_count()
-            self_dots = self.final_sc_count()
-            if gp_dots > self_dots:
-                return False
-            if (gp_dots == self_dots) and (gp.score > self.score):
-                return False
-        return True
+        gp_lists = t._best_country_lists(GamePlayer.objects.filter(game__the_round__tournament=t,
+                                                                   power_id=self.power_id))
+        return any(gp.pk == self.pk for gp in gp_lists.get(self.power, [[]])[0])
 
     def roundplayer(self):
         """
@@ -3393,16 +4402,13 @@ class GamePlayer(models.Model):
         """
         Year in which the player was eliminated, or None.
         """
-        sc = self.game.centrecount_set.filter(power=self.power).filter(count=0).order_by('year').first()
-        if not sc:
-            return None
-        return sc.year
+        return self.year_eliminated
 
     def final_sc_count(self):
         """
         Number of SupplyCentres held at the end of the Game, or currently if the Game is still ongoing.
         """
-        return self.game.centrecount_set.filter(power=self.power).order_by('year').last().count
+        return self.final_scs
 
     def set_power_from_prefs(self):
         """
@@ -3423,7 +4429,7 @@ class GamePlayer(models.Model):
         if self.power is None:
             # No preferences left, so pick a power at random from the unassigned ones
             used_powers = [gp.power for gp in gps.filter(power__isnull=False)]
-            free_powers = list(GreatPower.objects.all())
+            free_powers = list(reference_data.great_powers())
             for p in used_powers:
                 free_powers.remove(p)
             random.shuffle(free_powers)
@@ -3565,6 +4571,32 @@ class GamePlayer(models.Model):
                                     self.player_id])
 
 
+class BestCountryRank(models.Model):
+    """
+    Where a GamePlayer's result ranks among all the results with that power in the Tournament
+
+    Tied results share a rank, and the best results have rank 1.
+    These are written by Tournament._update_best_countries() whenever scores are
+    updated, or anything else they depend on changes.
+    """
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE)
+    power = models.ForeignKey(GreatPower, related_name='+', on_delete=models.CASCADE)
+    gameplayer = models.OneToOneField(GamePlayer,
+                                      related_name='best_country_rank',
+                                      on_delete=models.CASCADE)
+    rank = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['tournament', 'power', 'rank', 'pk']
+        indexes = [
+            models.Index(fields=['tournament', 'power', 'rank']),
+        ]
+
+    def __str__(self):
+        return _(u'%(gameplayer)s ranked %(rank)d') % {'gameplayer': self.gameplayer,
+                                                        'rank': self.rank}
+
+
 class GameImage(models.Model):
     """
     An image depicting a Game at a certain point.
@@ -3663,3 +4695,179 @@ class CentreCount(models.Model):
             raise ValidationError({'count': _(u'SC count for a power cannot increase from zero')})
         if self.count > 2 * prev.count:
             raise ValidationError({'count': _(u'SC count for a power cannot more than double in a year')})
+
+
+# Stored standings are updated by the scoring code, but other changes can also affect them
+
+@receiver([post_save, post_delete], sender=Round)
+def _standings_changed_after_round_change(sender, instance, created=False, update_fields=None, **kwargs):
+    """Rounds may have been added, removed or reordered"""
+    if created or (update_fields is None) or not {'start', 'is_team_round'}.isdisjoint(update_fields):
+        _standings_changed(instance.tournament_id)
+
+
+@receiver([post_save, post_delete], sender=Team)
+def _standings_changed_after_team_change(sender, instance, **kwargs):
+    """Teams may have been added or removed"""
+    _standings_changed(instance.tournament_id)
+
+
+@receiver([post_save, post_delete], sender=Pool)
+def _standings_changed_after_pool_change(sender, instance, **kwargs):
+    """The top board may have changed"""
+    _standings_changed(instance.the_round.tournament_id)
+
+
+@receiver(post_delete, sender=Round)
+def _renumber_rounds_after_delete(sender, instance, **kwargs):
+    """Close the gap left by the deleted Round"""
+    _renumber_rounds(instance.tournament_id)
+    instance._forget_tournament_rounds()
+
+
+@receiver([post_save, post_delete], sender=TournamentPlayer)
+def _standings_changed_after_tournamentplayer_change(sender, instance, update_fields=None, **kwargs):
+    """Players may have been added, removed or (un)ranked, or had their score overridden"""
+    if (update_fields is None) or not {'player', 'score', 'unranked'}.isdisjoint(update_fields):
+        _standings_changed(instance.tournament_id)
+        _best_countries_changed(tournament_id=instance.tournament_id)
+
+
+@receiver(post_save, sender=Tournament)
+def _best_countries_changed_after_tournament_change(sender, instance, update_fields=None, **kwargs):
+    """The best country criterion may have changed"""
+    if (update_fields is None) or ('best_country_criterion' in update_fields):
+        _best_countries_changed(tournament_id=instance.pk)
+
+
+@receiver(post_save, sender=GamePlayer)
+def _best_countries_changed_after_gameplayer_save(sender, instance, update_fields=None, **kwargs):
+    """The GamePlayer's result, or which power it's with, may have changed"""
+    if update_fields is None:
+        # The power may have changed, affecting the results with the old power
+        _best_countries_changed(game_id=instance.game_id)
+    elif not {'power', 'player', 'game'}.isdisjoint(update_fields):
+        _best_countries_changed(game_id=instance.game_id)
+    elif not {'score', 'final_scs'}.isdisjoint(update_fields):
+        _best_countries_changed(game_id=instance.game_id, power_id=instance.power_id)
+
+
+@receiver(post_delete, sender=GamePlayer)
+def _best_countries_changed_after_gameplayer_delete(sender, instance, **kwargs):
+    """The other results with the same power may rank differently"""
+    if instance.power_id is not None:
+        # The Game may be being deleted too, so find the Tournament now
+        _best_countries_changed(tournament_id=instance.game.the_round.tournament_id,
+                                power_id=instance.power_id)
+
+
+@receiver([post_save, post_delete], sender=CentreCount)
+def _sc_counts_changed_after_centrecount_change(sender, instance, **kwargs):
+    """The summary of the power's CentreCounts may have changed"""
+    _sc_counts_changed(instance.game_id)
+
+
+@receiver(post_save, sender=GamePlayer)
+def _sc_counts_changed_after_gameplayer_save(sender, instance, created, update_fields=None, **kwargs):
+    """A new GamePlayer, or one whose power may have changed, needs its power's CentreCounts summarised"""
+    if created or (update_fields is None) or not {'power', 'game'}.isdisjoint(update_fields):
+        _sc_counts_changed(instance.game_id)
+
+
+@receiver([post_save, post_delete], sender=RoundPlayer)
+def _discard_seeding_after_roundplayer_change(sender, instance, update_fields=None, **kwargs):
+    """Discard any seeding of the RoundPlayer's Round if who is playing may have changed"""
+    if (update_fields is None) or ('game_count' in update_fields):
+        SeedingJob.objects.filter(the_round_id=instance.the_round_id).delete()
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+def _standings_changed_after_team_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Team scores depend on who is in each Team"""
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        _standings_changed(instance.tournament_id)
+    elif pk_set:
+        for tournament_id in Team.objects.filter(pk__in=pk_set).values_list('tournament_id', flat=True).distinct():
+            _standings_changed(tournament_id)
+
+
+# Track changes to the data shown on Tournament and Game pages
+
+@receiver([post_save, post_delete], sender=SupplyCentreOwnership)
+@receiver([post_save, post_delete], sender=DrawProposal)
+@receiver([post_save, post_delete], sender=CentreCount)
+@receiver([post_save, post_delete], sender=GamePlayer)
+def _data_changed_after_game_change(sender, instance, **kwargs):
+    """The object's Game, and so its Tournament, has changed"""
+    # The Tournament is found from the Game when the change is committed
+    _data_changed(game_id=instance.game_id)
+
+
+@receiver([post_save, post_delete], sender=Game)
+def _data_changed_after_game_save(sender, instance, **kwargs):
+    """The Game and its Tournament have changed"""
+    _data_changed(instance.the_round.tournament_id, instance.pk)
+
+
+@receiver(post_save, sender=Tournament)
+def _data_changed_after_tournament_change(sender, instance, **kwargs):
+    """The Tournament has changed"""
+    _data_changed(tournament_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Round)
+@receiver([post_save, post_delete], sender=TournamentPlayer)
+@receiver([post_save, post_delete], sender=Team)
+def _data_changed_after_change(sender, instance, **kwargs):
+    """The object's Tournament has changed"""
+    _data_changed(tournament_id=instance.tournament_id)
+
+
+@receiver([post_save, post_delete], sender=RoundPlayer)
+@receiver([post_save, post_delete], sender=Pool)
+def _data_changed_after_round_change(sender, instance, **kwargs):
+    """The Tournament of the object's Round has changed"""
+    _data_changed(tournament_id=instance.the_round.tournament_id)
+
+
+@receiver(m2m_changed, sender=TournamentPlayer.awards.through)
+@receiver(m2m_changed, sender=Team.players.through)
+def _data_changed_after_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """The Tournament of the TournamentPlayer or Team has changed"""
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        _data_changed(tournament_id=instance.tournament_id)
+    elif pk_set:
+        for tournament_id in model.objects.filter(pk__in=pk_set).values_list('tournament_id', flat=True).distinct():
+            _data_changed(tournament_id=tournament_id)
+
+
+@receiver(m2m_changed, sender=Tournament.managers.through)
+def _data_changed_after_managers_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Who can change the Tournament, and so what its pages show them, has changed"""
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        _data_changed(tournament_id=instance.pk)
+    elif pk_set:
+        for tournament_id in pk_set:
+            _data_changed(tournament_id=tournament_id)
+
+
+@receiver(post_save, sender=Player)
+def _data_changed_after_player_change(sender, instance, created, **kwargs):
+    """The Player's details are shown on the pages of every Tournament they're in"""
+    if created:
+        return
+    for tournament_id in instance.tournamentplayer_set.values_list('tournament_id', flat=True):
+        _data_changed(tournament_id=tournament_id)
+
+
+@receiver(m2m_changed, sender=DrawProposal.drawing_powers.through)
+def _data_changed_after_draw_change(sender, instance, action, reverse, **kwargs):
+    """The DrawProposal's Game has changed"""
+    if (action in ['post_add', 'post_remove', 'post_clear']) and not reverse:
+        _data_changed(game_id=instance.game_id)
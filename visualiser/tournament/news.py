@@ -23,7 +23,8 @@ import random
 from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 
-from tournament.models import CentreCount, DrawSecrecy, Game, Round, Tournament
+from tournament.board_history import BoardHistory
+from tournament.models import DrawSecrecy, Game, Round, Tournament
 from tournament.players import position_str
 
 # Mask values to choose which news strings to include
@@ -209,41 +210,25 @@ def _round_news(r):
     return results
 
 
-def _sc_gains_and_losses(prev_scos, current_scos):
+def _sc_gains_and_losses(centres, prev_owners, current_owners):
     """
     Find interesting changes in SC ownership
 
     Returns two dicts (gains then losses), indexed by GreatPower, of
-      2-tuples containing SupplyCentre and other Power (previous owner
-      (None if neutral) or new owner).
-    Parameters are two QuerySets for last year and this year's
-      SupplyCentreOwnerships.
+      lists of 2-tuples containing SupplyCentre and other Power (previous
+      owner (None if neutral) or new owner), in the order of centres.
+    Parameters are a list of SupplyCentres, then two lists of last year's
+      and this year's owning GreatPowers (None if neutral) in the same order.
     """
-    # Can't do anything without two consecutive years information
-    if not prev_scos.exists() or not current_scos.exists():
-        return {}, {}
-    # Extract the info we need into two sets that can be operated on
-    prev = set()
-    for sco in prev_scos.all():
-        prev.add((sco.sc, sco.owner))
-    current = set()
-    for sco in current_scos.all():
-        current.add((sco.sc, sco.owner))
     gains = {}
     losses = {}
-    for sc, owner in prev - current:
-        for s, o in current:
-            if s == sc:
-                new_owner = o
-                break
-        losses.setdefault(owner, []).append((sc, new_owner))
-    for sc, owner in current - prev:
-        prev_owner = None
-        for s, o in prev:
-            if s == sc:
-                prev_owner = o
-                break
-        gains.setdefault(owner, []).append((sc, prev_owner))
+    for sc, prev_owner, owner in zip(centres, prev_owners, current_owners):
+        if prev_owner == owner:
+            continue
+        if prev_owner is not None:
+            losses.setdefault(prev_owner, []).append((sc, owner))
+        if owner is not None:
+            gains.setdefault(owner, []).append((sc, prev_owner))
     return gains, losses
 
 
@@ -255,27 +240,32 @@ def _game_news(g, include_game_name=False, mask=MASK_ALL_NEWS, for_year=None):
         gn_str = _(u' in game %(name)s') % {'name': g.name}
     else:
         gn_str = ''
-    if g.is_finished and ((for_year is None) or (for_year >= g.final_year())):
+    history = BoardHistory(g)
+    if g.is_finished and ((for_year is None) or (for_year >= history.final_year())):
         # Just report the final result
         return [g.result_str(include_game_name) + '.']
-    centres_set = g.centrecount_set.order_by('-year')
+    years = history.years()
     if for_year:
-        centres_set = centres_set.filter(year__lte=for_year)
+        years = [y for y in years if y <= for_year]
     # Which is the most recent year we have info for ?
-    last_year = centres_set[0].year
+    last_year = years[-1]
     # If the game just started, there is no news, so return the background instead
     if last_year == 1900:
         return g.background()
-    gps = g.gameplayer_set.order_by()
-    current_scs = centres_set.filter(year=last_year)
+    players = {gp.power_id: gp.player for gp in g.gameplayer_set.select_related('player').order_by()}
+    # List of (GreatPower, count) 2-tuples for the powers with counts for the year
+    current_scs = [(power, count) for power, count in zip(history.powers, history.counts(last_year))
+                   if count is not None]
     results = []
     if (mask & MASK_SC_OWNER_COUNTS) != 0:
         # Which dots have had lots of owners?
         owner_sets = {}
-        for sco in g.supplycentreownership_set.filter(year__lte=last_year):
-            if sco.sc not in owner_sets:
-                owner_sets[sco.sc] = set()
-            owner_sets[sco.sc].add(sco.owner)
+        for year in history.ownership_years():
+            if year > last_year:
+                break
+            for sc, owner in zip(history.centres, history.owners(year)):
+                if owner is not None:
+                    owner_sets.setdefault(sc, set()).add(owner)
         for sc, set_ in owner_sets.items():
             if len(set_) > 3:
                 results.append(_('%(dot)s has been owned by %(owners)d different Great Powers (%(list)s).')
@@ -284,46 +274,44 @@ def _game_news(g, include_game_name=False, mask=MASK_ALL_NEWS, for_year=None):
                                   'list': ','.join([_(p.abbreviation) for p in set_])})
     if (mask & MASK_BOARD_TOP) != 0:
         # Who's topping the board ?
-        max_scs = current_scs.order_by('-count')[0].count
-        first = current_scs.order_by('-count').filter(count=max_scs)
-        first_str = ', '.join([f'{gps.get(power=scs.power).player} ({_(scs.power.abbreviation)})' for scs in list(first)])
+        max_scs = max(count for power, count in current_scs)
+        first = [power for power, count in current_scs if count == max_scs]
+        first_str = ', '.join([f'{players[power.pk]} ({_(power.abbreviation)})' for power in first])
         results.append(_(u'Highest SC count%(game)s is %(dots)d, for %(player)s.')
                        % {'game': gn_str,
                           'dots': max_scs,
                           'player': first_str})
-    prev_scs = centres_set.filter(year=last_year-1)
-    current_scos = g.supplycentreownership_set.filter(year=last_year).order_by()
-    prev_scos = g.supplycentreownership_set.filter(year=last_year-1).order_by()
-    if prev_scos.exists() and current_scos.exists():
-        sc_gains, sc_losses = _sc_gains_and_losses(prev_scos, current_scos)
+    prev_counts = history.counts(last_year - 1)
+    # Can't do anything with ownerships without two consecutive years information
+    if history.has_ownerships(last_year) and history.has_ownerships(last_year - 1):
+        sc_gains, sc_losses = _sc_gains_and_losses(history.centres,
+                                                   history.owners(last_year - 1),
+                                                   history.owners(last_year))
     else:
         # Filter out stuff that needs supply centre ownership information
         mask &= ~MASK_OWNERSHIP
-    for scs in current_scs:
-        power = scs.power
-        try:
-            prev = prev_scs.get(power=power)
-        except CentreCount.DoesNotExist:
+    for power, count, prev_count in zip(history.powers, history.counts(last_year), prev_counts):
+        if (count is None) or (prev_count is None):
             continue
         # Who gained 2 or more centres in the last year ?
         if (mask & MASK_GAINERS) != 0:
-            if scs.count - prev.count > 1:
+            if count - prev_count > 1:
                 results.append(_(u'%(player)s (%(power)s) grew from %(old)d to %(new)d centres%(game)s.')
-                               % {'player': gps.get(power=power).player,
+                               % {'player': players[power.pk],
                                   'power': _(power.abbreviation),
-                                  'old': prev.count,
-                                  'new': scs.count,
+                                  'old': prev_count,
+                                  'new': count,
                                   'game': gn_str})
         # Who lost 2 or more centres in the last year ?
         if (mask & MASK_LOSERS) != 0:
-            if prev.count - scs.count > 1:
+            if prev_count - count > 1:
                 results.append(ngettext('%(player)s (%(power)s) shrank from %(old)d to %(new)d centre%(game)s.',
                                         '%(player)s (%(power)s) shrank from %(old)d to %(new)d centres%(game)s.',
-                                        scs.count)
-                               % {'player': gps.get(power=power).player,
+                                        count)
+                               % {'player': players[power.pk],
                                   'power': _(power.abbreviation),
-                                  'old': prev.count,
-                                  'new': scs.count,
+                                  'old': prev_count,
+                                  'new': count,
                                   'game': gn_str})
         # Who took 2 or more, lost 2 or more, or had a total of 4 or more gains and losses?
         if (mask & MASK_SC_CHANGES) != 0:
@@ -348,7 +336,7 @@ def _game_news(g, include_game_name=False, mask=MASK_ALL_NEWS, for_year=None):
                 else:
                     losses_str = _('no centres')
                 results.append(_('%(player)s (%(power)s) took %(gains)s and lost %(losses)s%(game)s.')
-                               % {'player': gps.get(power=power).player,
+                               % {'player': players[power.pk],
                                   'power': _(power.abbreviation),
                                   'gains': gains_str,
                                   'losses': losses_str,
@@ -378,8 +366,7 @@ def _game_news(g, include_game_name=False, mask=MASK_ALL_NEWS, for_year=None):
             sz = len(powers)
             incl = []
             for power in powers:
-                game_player = gps.get(power=power)
-                incl.append(_(u'%(player)s (%(power)s)') % {'player': game_player.player,
+                incl.append(_(u'%(player)s (%(power)s)') % {'player': players[power.pk],
                                                             'power': _(power.abbreviation)})
             incl_str = ', '.join(incl)
             if g.the_round.tournament.draw_secrecy == DrawSecrecy.COUNTS:
@@ -396,16 +383,15 @@ def _game_news(g, include_game_name=False, mask=MASK_ALL_NEWS, for_year=None):
             results.append(d_str)
     if (mask & MASK_ELIMINATIONS) != 0:
         # Who has been eliminated so far, and when ?
-        zeroes = centres_set.filter(count=0).reverse()
-        while zeroes:
-            scs = zeroes[0]
-            power = scs.power
-            zeroes = zeroes.exclude(power=power)
-            results.append(_(u'%(player)s (%(power)s) was eliminated in %(year)d%(game)s.')
-                           % {'player': gps.get(power=power).player,
-                              'power': _(power.abbreviation),
-                              'year': scs.year,
-                              'game': gn_str})
+        for power in history.powers:
+            for year in years:
+                if history.count(power, year) == 0:
+                    results.append(_(u'%(player)s (%(power)s) was eliminated in %(year)d%(game)s.')
+                                   % {'player': players[power.pk],
+                                      'power': _(power.abbreviation),
+                                      'year': year,
+                                      'game': gn_str})
+                    break
     # Shuffle the resulting list
     random.shuffle(results)
     return results
@@ -19,6 +19,9 @@ Round Views for the Diplomacy Tournament Visualiser.
 """
 
 import csv
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from itertools import combinations
 
 import requests
@@ -26,28 +29,41 @@ import requests
 from django.conf import settings
 from django.contrib.auth.decorators import permission_required
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Sum
 from django.forms.formsets import formset_factory
-from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.http import (Http404, HttpResponse, HttpResponseRedirect,
+                         JsonResponse)
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from tournament.diplomacy import GameSet, GreatPower
+from tournament.diplomacy import GreatPower, reference_data
 from tournament.email import send_board_call_email
 from tournament.forms import (BaseGamePlayersFormset, BasePlayerRoundFormset,
                               BasePowerAssignFormset, GamePlayersForm,
                               GameScoreForm, GetSevenPlayersForm,
                               PlayerRoundForm, PoolForm, PowerAssignForm)
-from tournament.game_seeder import GameSeeder, SeedMethod
+from tournament.game_seeder import ArrayGameSeeder, SeedMethod
 from tournament.models import (Game, GamePlayer, Pool, PowerAssignMethods,
-                               Round, RoundPlayer, Tournament, TournamentPlayer)
-from tournament.tournament_views import (get_modifiable_tournament_or_404,
-                                         get_visible_tournament_or_404)
+                               Round, RoundPlayer, SeedingJob, SeedingStatus,
+                               Tournament, TournamentPlayer)
+from tournament.tournament_views import (conditional_view,
+                                         get_modifiable_tournament_or_404,
+                                         get_visible_tournament_or_404,
+                                         tournament_etag)
 
 
 REFRESH_TIME = 60
+# How often the seeding progress page is refreshed, in seconds
+SEEDING_REFRESH_TIME = 5
+# Minimum time between updates to a SeedingJob's progress, in seconds
+SEEDING_PROGRESS_INTERVAL = 1.0
+
+# Thread pool for SeedingJobs, created when first needed
+_seeding_pool = None
+_seeding_pool_lock = threading.Lock()
 
 
 def get_round_or_404(tournament, round_num):
@@ -68,6 +84,7 @@ def get_pool_or_404(the_round, pool_slug):
         raise Http404 from e
 
 
+@conditional_view(tournament_etag)
 def round_simple(request, tournament_id, round_num, template):
     """Just render the specified template with the round"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
@@ -259,7 +276,7 @@ def get_seven(request, tournament_id, round_num):
         # Check that we have the right number of players in fixed-size pools
         for pool in pool_set.filter(board_count__isnull=False):
             rps = full_rps.filter(pool=pool)
-            if rps.count() != (pool.board_count * GreatPower.objects.count()):
+            if rps.count() != (pool.board_count * len(reference_data.great_powers())):
                 # Fixed-size pools need to be sorted first
                 return HttpResponseRedirect(reverse('populate_pools',
                                             args=(tournament_id,
@@ -347,44 +364,45 @@ def _sitters_and_two_gamers(tournament, the_round, pool):
     return sitters, two_gamers
 
 
-def _create_game_seeder(tournament, the_round):
-    """Return a GameSeeder that knows about the tournament so far"""
+def _create_game_seeder(tournament, the_round, progress=None):
+    """
+    Return a GameSeeder that knows about the tournament so far
+
+    progress is passed to the GameSeeder.
+    """
     tourney_players = list(tournament.tournamentplayer_set.prefetch_related('seederbias_set').order_by())
     tp_by_player_id = {tp.player_id: tp for tp in tourney_players}
     # Create the game seeder
-    seeder = GameSeeder(GreatPower.objects.all(),
-                        SeedMethod.BOARD,
-                        starts=10)
+    seeder = ArrayGameSeeder(reference_data.great_powers(),
+                             SeedMethod[settings.SEEDER_METHOD],
+                             starts=settings.SEEDER_STARTS,
+                             iterations=settings.SEEDER_ITERATIONS,
+                             workers=settings.SEEDER_WORKERS,
+                             time_limit=settings.SEEDER_TIME_LIMIT,
+                             progress=progress)
     # Tell the seeder about every player in the tournament
     # (regardless of whether they're playing this round - they may have played already)
     for tp in tourney_players:
         seeder.add_player(tp)
     # Provide details of games already played this tournament
-    for rnd in tournament.round_set.filter(start__lt=the_round.start).order_by():
-        for g in rnd.game_set.order_by():
-            game = set()
-            for gp in g.gameplayer_set.select_related('power',
-                                                      'player',
-                                                      'game__the_round').order_by():
-                tp = tp_by_player_id.get(gp.player_id)
-                if tp is None:
-                    tp = gp.tournamentplayer()
-                game.add((tp, gp.power))
-            assert len(game) == 7
-            seeder.add_played_game(game)
+    tp_by_id = {tp.pk: tp for tp in tourney_players}
+    powers_by_id = {p.pk: p for p in seeder.powers}
+    shared_games, power_games = tournament.seeder_history(the_round)
+    for (tp1_id, tp2_id), count in shared_games.items():
+        seeder.add_shared_games(tp_by_id[tp1_id], tp_by_id[tp2_id], count)
+    for (tp_id, power_id), count in power_games.items():
+        seeder.add_power_games(tp_by_id[tp_id], powers_by_id[power_id], count)
     # Add in any biases now that all players have been added
     for tp in tourney_players:
         # Just use seederbias_set so we only get each SeederBias once
         # because we only look at their player1
         for sb in tp.seederbias_set.all():
-            seeder.add_bias(sb.player1, sb.player2)
+            seeder.add_bias(tp_by_id[sb.player1_id], tp_by_id[sb.player2_id])
     # If this is a team round, add biases to separate team members
     if (tournament.team_size is not None) and the_round.is_team_round:
-        for t in tournament.team_set.all():
+        for t in tournament.team_set.prefetch_related('players'):
             for p1, p2 in combinations(list(t.players.all()), 2):
-                tp1 = p1.tournamentplayer_set.get(tournament=tournament)
-                tp2 = p2.tournamentplayer_set.get(tournament=tournament)
-                seeder.add_bias(tp1, tp2)
+                seeder.add_bias(tp_by_player_id[p1.pk], tp_by_player_id[p2.pk])
     return seeder
 
 
@@ -433,15 +451,16 @@ def _pool_power_assignment(tournament_power_assignment, pool):
     return tournament_power_assignment
 
 
-def _seed_games(tournament, the_round):
+def _seed_games(tournament, the_round, progress=None):
     """
     Wrapper round GameSeeder to do the actual seeding for a round
 
     Returns a list of games, where each game is a 3-tuple containing a pool (possibly None),
     a set of (player, power) 2-tuples and a list of issues.
+    progress is passed to the GameSeeder.
     """
     power_assignment = tournament.power_assignment
-    seeder = _create_game_seeder(tournament, the_round)
+    seeder = _create_game_seeder(tournament, the_round, progress)
     # Pools with a board_count first
     pool_set = the_round.pool_set.order_by('-board_count')
     if pool_set:
@@ -464,6 +483,185 @@ def _seed_games(tournament, the_round):
     return _seed_games_for_pool(seeder, tournament, the_round)
 
 
+class _SeedingJobProgress:
+    """
+    GameSeeder progress callback that records the progress of a SeedingJob.
+
+    Updates the SeedingJob at most every SEEDING_PROGRESS_INTERVAL seconds,
+    and tells the GameSeeder to stop if the TD has accepted the best seeding so far.
+    """
+    def __init__(self, job_pk):
+        self.job_pk = job_pk
+        # The latest fitness score reported
+        self.fitness = None
+        self._last_update = None
+
+    def __call__(self, fitness):
+        self.fitness = fitness
+        now = time.monotonic()
+        if (self._last_update is not None) and (now - self._last_update < SEEDING_PROGRESS_INTERVAL):
+            return False
+        self._last_update = now
+        jobs = SeedingJob.objects.filter(pk=self.job_pk)
+        jobs.update(best_fitness=fitness, heartbeat=timezone.now())
+        return jobs.filter(accept_requested=True).exists()
+
+
+def _run_seeding_job(job_pk):
+    """
+    Seed the Games for a SeedingJob's Round, storing the result in the SeedingJob.
+
+    Does nothing to the SeedingJob if it is deleted while seeding.
+    """
+    job = SeedingJob.objects.select_related('the_round__tournament').get(pk=job_pk)
+    r = job.the_round
+    jobs = SeedingJob.objects.filter(pk=job_pk)
+    progress = _SeedingJobProgress(job_pk)
+    try:
+        games = _seed_games(r.tournament, r, progress)
+    except Exception as e:
+        jobs.update(status=SeedingStatus.FAILED,
+                    error=str(e) or e.__class__.__name__)
+        return
+    result = []
+    for pool, g, issues in games:
+        result.append({'pool': pool.pk if pool else None,
+                       'players': [[tp.pk, power.pk if power else None] for tp, power in g],
+                       'issues': list(issues)})
+    jobs.update(status=SeedingStatus.FINISHED,
+                best_fitness=progress.fitness,
+                result=result)
+
+
+def _run_seeding_job_in_thread(job_pk):
+    """Run a SeedingJob in a thread of the thread pool"""
+    try:
+        _run_seeding_job(job_pk)
+    finally:
+        # Each thread has its own database connection
+        connection.close()
+
+
+def _seeding_thread_pool():
+    """Returns the thread pool used to run SeedingJobs"""
+    global _seeding_pool
+    with _seeding_pool_lock:
+        if _seeding_pool is None:
+            _seeding_pool = ThreadPoolExecutor(max_workers=settings.SEEDING_JOB_WORKERS,
+                                               thread_name_prefix='seeding')
+        return _seeding_pool
+
+
+def _start_seeding_job(the_round):
+    """
+    Start seeding the Games for a Round, replacing any existing SeedingJob.
+
+    If settings.SEEDING_JOB_WORKERS is zero, seeding is finished before returning,
+    otherwise it runs in the background.
+    Returns the SeedingJob.
+    """
+    SeedingJob.objects.filter(the_round=the_round).delete()
+    job = SeedingJob.objects.create(the_round=the_round)
+    if settings.SEEDING_JOB_WORKERS:
+        # Wait until the thread will be able to see the SeedingJob
+        transaction.on_commit(lambda: _seeding_thread_pool().submit(_run_seeding_job_in_thread, job.pk))
+    else:
+        _run_seeding_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def _create_seeded_games(tournament, the_round, job):
+    """
+    Delete a finished SeedingJob, and create the Games and GamePlayers from it.
+
+    Replaces any existing Games for the Round.
+    Returns a list of initial data for a BasePowerAssignFormset,
+    or None if the SeedingJob has already been used or discarded.
+    """
+    with transaction.atomic():
+        # Claim the job first, so that only one request can use it
+        if not SeedingJob.objects.filter(pk=job.pk, status=SeedingStatus.FINISHED).delete()[0]:
+            return None
+        return _create_games_from_seeding(tournament, the_round, job)
+
+
+def _create_games_from_seeding(tournament, the_round, job):
+    """
+    Create the Games and GamePlayers for a finished SeedingJob.
+
+    Replaces any existing Games for the Round.
+    Returns a list of initial data for a BasePowerAssignFormset.
+    """
+    # Delete any existing Games and GamePlayers for this round
+    the_round.game_set.all().delete()
+    # Use the tournament's default GameSet, or fall back to sensible defaults
+    if tournament.default_game_set:
+        default_set = tournament.default_game_set
+    elif tournament.is_virtual():
+        default_set = reference_data.game_set(name='Backstabbr')
+    else:
+        default_set = reference_data.game_set(pk=1)
+    pools = {pool.pk: pool for pool in the_round.pool_set.all()}
+    tps = {tp.pk: tp for tp in tournament.tournamentplayer_set.select_related('player')}
+    powers = {power.pk: power for power in reference_data.great_powers()}
+    data = []
+    round_num = the_round.number()
+    # Add the Games to the database
+    new_games = []
+    for n, seeded in enumerate(job.result, start=1):
+        pool = pools.get(seeded['pool'])
+        new_games.append(Game(name=_generate_game_name(round_num,
+                                                       pool,
+                                                       n),
+                              the_round=the_round,
+                              pool=pool,
+                              is_top_board=(pool is not None) and (pool.determines_top_rankings is not None),
+                              the_set=default_set))
+    new_games = Game.objects.bulk_create_games(new_games)
+    # And then all their GamePlayers
+    new_gps = []
+    for new_game, seeded in zip(new_games, job.result):
+        new_gps += [GamePlayer(player=tps[tp_pk].player,
+                               game=new_game,
+                               power=powers.get(power_pk)) for tp_pk, power_pk in seeded['players']]
+    new_gps = GamePlayer.objects.bulk_create_gameplayers(new_gps)
+    # If we're assigning powers from preferences, do so now
+    if tournament.power_assignment == PowerAssignMethods.PREFERENCES:
+        for new_game in new_games:
+            new_game.assign_powers_from_prefs()
+        assigned = dict(GamePlayer.objects.filter(game__in=new_games).values_list('pk', 'power_id'))
+        for gp in new_gps:
+            gp.power = powers.get(assigned[gp.pk])
+    game_gps = {}
+    for gp in new_gps:
+        game_gps.setdefault(gp.game_id, []).append(gp)
+    for new_game, seeded in zip(new_games, job.result):
+        current = {'name': new_game.name,
+                   'the_set': new_game.the_set,
+                   'issues': '\n'.join(seeded['issues'])}
+        for gp in game_gps.get(new_game.pk, []):
+            current[str(gp.id)] = gp.power
+        data.append(current)
+    return data
+
+
+def _power_assignment_data(the_round):
+    """Returns a list of initial data for a BasePowerAssignFormset for the existing Games of a Round"""
+    data = []
+    # Ordering must match that used inside the formset
+    for g in Game.objects.for_power_assignment().filter(the_round=the_round):
+        current = {'name': g.name,
+                   'the_set': g.the_set,
+                   'top_board': g.is_top_board,
+                   'external_url': g.external_url,
+                   'notes': g.notes}
+        for gp in g.gameplayer_set.order_by():
+            current[str(gp.id)] = gp.power
+        data.append(current)
+    return data
+
+
 def _generate_game_name(round_num, pool, i):
     """Generate a default name for Game n in pool pool of round round_num"""
     # TODO incorporate pool.slug into game name
@@ -490,17 +688,7 @@ def seed_games(request, tournament_id, round_num):
     t = get_modifiable_tournament_or_404(tournament_id, request.user)
     r = get_round_or_404(t, round_num)
     if request.method == 'POST':
-        data = []
-        # Ordering must match that used inside the formset
-        for g in Game.objects.for_power_assignment().filter(the_round=r):
-            current = {'name': g.name,
-                       'the_set': g.the_set,
-                       'top_board': g.is_top_board,
-                       'external_url': g.external_url,
-                       'notes': g.notes}
-            for gp in g.gameplayer_set.order_by():
-                current[str(gp.id)] = gp.power
-            data.append(current)
+        data = _power_assignment_data(r)
         PowerAssignFormset = formset_factory(PowerAssignForm,
                                              formset=BasePowerAssignFormset,
                                              extra=0)
@@ -566,43 +754,29 @@ def seed_games(request, tournament_id, round_num):
             return HttpResponseRedirect(reverse('get_seven',
                                                 args=(tournament_id,
                                                       round_num)))
-        # Delete any existing Games and GamePlayers for this round
-        r.game_set.all().delete()
-        # Use the tournament's default GameSet, or fall back to sensible defaults
-        if t.default_game_set:
-            default_set = t.default_game_set
-        elif t.is_virtual():
-            default_set = GameSet.objects.get(name='Backstabbr')
-        else:
-            default_set = GameSet.objects.get(pk=1)
-        data = []
-        # Generate a seeding, and assign powers if required
-        games = _seed_games(t, r)
-        # Add the Games and GamePlayers to the database
-        for n, (pool, g, i) in enumerate(games, start=1):
-            new_game = Game.objects.create(name=_generate_game_name(round_num,
-                                                                    pool,
-                                                                    n),
-                                           the_round=r,
-                                           pool=pool,
-                                           is_top_board=(pool is not None) and (pool.determines_top_rankings is not None),
-                                           the_set=default_set)
-            current = {'name': new_game.name,
-                       'the_set': new_game.the_set,
-                       'issues': '\n'.join(i)}
-            for tp, power in g:
-                gp = GamePlayer.objects.create(player=tp.player,
-                                               game=new_game,
-                                               power=power)
-                current[str(gp.id)] = power
-            # If we're assigning powers from preferences, do so now
-            if t.power_assignment == PowerAssignMethods.PREFERENCES:
-                new_game.assign_powers_from_prefs()
-                for tp, _ in g:
-                    gp = GamePlayer.objects.get(player=tp.player,
-                                                game=new_game)
-                    current[str(gp.id)] = gp.power
-            data.append(current)
+        try:
+            job = r.seedingjob
+        except SeedingJob.DoesNotExist:
+            # Generate a seeding, and assign powers if required
+            job = _start_seeding_job(r)
+        job.fail_if_stale()
+        if job.status != SeedingStatus.FINISHED:
+            if job.status == SeedingStatus.FAILED:
+                # Try again next time
+                job.delete()
+            context = {'tournament': t,
+                       'round': r,
+                       'job': job}
+            if job.status == SeedingStatus.RUNNING:
+                # The page polls for progress, so this is only used without JavaScript
+                context['redirect_url'] = reverse('seed_games', args=(tournament_id, round_num))
+                context['redirect_time'] = SEEDING_REFRESH_TIME
+                context['noscript_redirect'] = True
+            return render(request, 'rounds/seeding_progress.html', context)
+        data = _create_seeded_games(t, r, job)
+        if data is None:
+            # Another request has just created the Games from this seeding
+            data = _power_assignment_data(r)
         # Create a form for each of the resulting games
         PowerAssignFormset = formset_factory(PowerAssignForm,
                                              formset=BasePowerAssignFormset,
@@ -613,6 +787,37 @@ def seed_games(request, tournament_id, round_num):
     return render(request, 'rounds/seeded_games.html', context)
 
 
+@permission_required('tournament.add_game')
+def seed_games_status(request, tournament_id, round_num):
+    """JSON status of seeding the Games for a round"""
+    t = get_modifiable_tournament_or_404(tournament_id, request.user)
+    r = get_round_or_404(t, round_num)
+    try:
+        job = r.seedingjob
+    except SeedingJob.DoesNotExist as e:
+        raise Http404('No seeding for this round') from e
+    job.fail_if_stale()
+    data = {'status': job.status,
+            'status_display': job.get_status_display(),
+            'started_at': job.started_at,
+            'best_fitness': job.best_fitness,
+            'accept_requested': job.accept_requested,
+            'error': job.error}
+    return JsonResponse(data)
+
+
+@permission_required('tournament.add_game')
+def seed_games_accept(request, tournament_id, round_num):
+    """Stop seeding the Games for a round, and use the best seeding found so far"""
+    t = get_modifiable_tournament_or_404(tournament_id, request.user)
+    r = get_round_or_404(t, round_num)
+    if request.method == 'POST':
+        SeedingJob.objects.filter(the_round=r,
+                                  status=SeedingStatus.RUNNING).update(accept_requested=True)
+    return HttpResponseRedirect(reverse('seed_games',
+                                        args=(tournament_id, round_num)))
+
+
 # TODO: Name is misleading - also used to modify existing game(s)
 @permission_required('tournament.add_game')
 def create_games(request, tournament_id, round_num, game_name=None, pool_slug=''):
@@ -708,7 +913,7 @@ def create_games(request, tournament_id, round_num, game_name=None, pool_slug=''
                         g.gameplayer_set.all().delete()
                         for power, field in f.cleaned_data.items():
                             try:
-                                p = GreatPower.objects.get(name=power)
+                                p = reference_data.great_power(name=power)
                             except GreatPower.DoesNotExist:
                                 continue
                             GamePlayer.objects.create(game=g,
@@ -733,6 +938,7 @@ def create_games(request, tournament_id, round_num, game_name=None, pool_slug=''
                    'formset': formset})
 
 
+@conditional_view(tournament_etag)
 def round_scores(request, tournament_id, round_num):
     """Display scores after the specified round"""
     # TODO can we share code with tournament_scores() ?
@@ -822,7 +1028,7 @@ def game_scores(request, tournament_id, round_num):
                                      the_round=r)
                 # Set the score for each player
                 for power in f.changed_data:
-                    p = GreatPower.objects.get(name=power)
+                    p = reference_data.great_power(name=power)
                     # Update the matching GamePlayer's score
                     GamePlayer.objects.filter(game=g,
                                               power=p).update(score=f.cleaned_data[power])
@@ -839,6 +1045,7 @@ def game_scores(request, tournament_id, round_num):
                    'formset': formset})
 
 
+@conditional_view(tournament_etag)
 def game_index(request, tournament_id, round_num):
     """Display a list of games in the round"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
@@ -879,6 +1086,7 @@ def game_cycle(request, tournament_id, round_num, template, game_name=None):
         # Go back to the first game
         next_game_name = games[0].name
     context = {'game': g,
+               'draw_in_browser': settings.DRAW_GRAPHS_IN_BROWSER,
                'refresh': True,
                'redirect_time': REFRESH_TIME,
                'redirect_url': reverse(game_cycle,
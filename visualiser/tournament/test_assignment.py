@@ -0,0 +1,55 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+import random
+import unittest
+
+from tournament.assignment import min_cost_assignment
+
+
+class MinCostAssignmentTests(unittest.TestCase):
+
+    def _total(self, costs, assignment):
+        return sum(row[c] for row, c in zip(costs, assignment))
+
+    def test_empty(self):
+        self.assertEqual(min_cost_assignment([]), [])
+
+    def test_too_many_rows(self):
+        self.assertRaises(ValueError, min_cost_assignment, [[1], [2]])
+
+    def test_identity(self):
+        costs = [[0 if r == c else 1 for c in range(7)] for r in range(7)]
+        self.assertEqual(min_cost_assignment(costs), list(range(7)))
+
+    def test_optimal(self):
+        rng = random.Random(7)
+        for _ in range(100):
+            rows = rng.randint(1, 6)
+            cols = rng.randint(rows, 6)
+            costs = [[rng.randint(0, 9) for _ in range(cols)] for _ in range(rows)]
+            with self.subTest(costs=costs):
+                assignment = min_cost_assignment(costs, rng)
+                self.assertEqual(len(set(assignment)), rows)
+                best = min(self._total(costs, p) for p in itertools.permutations(range(cols), rows))
+                self.assertEqual(self._total(costs, assignment), best)
+
+    def test_ties_random(self):
+        # Every assignment is equally good, so we should see different ones
+        costs = [[0] * 7 for _ in range(7)]
+        results = {tuple(min_cost_assignment(costs)) for _ in range(20)}
+        self.assertGreater(len(results), 1)
@@ -0,0 +1,140 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from tournament.diplomacy import GameSet, GreatPower
+from tournament.game_scoring import G_SCORING_SYSTEMS
+from tournament.models import (R_SCORING_SYSTEMS, CentreCount, DrawSecrecy,
+                               Game, GamePlayer, Round, Tournament)
+from tournament.players import Player
+
+
+class BackfillGamePlayerSCCountsCommandTests(TestCase):
+    fixtures = ['game_sets.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        t = Tournament.objects.create(name='t1',
+                                      start_date=today,
+                                      end_date=today + timedelta(hours=24),
+                                      round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                      tournament_scoring_system='Sum all round scores',
+                                      draw_secrecy=DrawSecrecy.SECRET)
+        r = Round.objects.create(tournament=t,
+                                 scoring_system=G_SCORING_SYSTEMS[0].name,
+                                 dias=True,
+                                 start=datetime.now(timezone.utc))
+        cls.g = Game.objects.create(name='g1',
+                                    the_round=r,
+                                    the_set=GameSet.objects.get(name='Avalon Hill'))
+        cls.austria = GreatPower.objects.get(abbreviation='A')
+        cls.england = GreatPower.objects.get(abbreviation='E')
+        p1 = Player.objects.create(first_name='Abbey', last_name='Brown')
+        p2 = Player.objects.create(first_name='Charles', last_name='Dickens')
+        cls.gp1 = GamePlayer.objects.create(player=p1, game=cls.g, power=cls.austria)
+        cls.gp2 = GamePlayer.objects.create(player=p2, game=cls.g, power=cls.england)
+        CentreCount.objects.create(power=cls.austria, game=cls.g, year=1901, count=2)
+        CentreCount.objects.create(power=cls.austria, game=cls.g, year=1902, count=0)
+        CentreCount.objects.create(power=cls.england, game=cls.g, year=1901, count=5)
+        CentreCount.objects.create(power=cls.england, game=cls.g, year=1902, count=6)
+        # Everyone else holds their starting centres
+        for power in GreatPower.objects.exclude(pk__in=[cls.austria.pk, cls.england.pk]):
+            for year in [1901, 1902]:
+                CentreCount.objects.create(power=power, game=cls.g, year=year, count=power.starting_centres)
+        # As when the counts are entered
+        cls.g.update_scores()
+
+    def test_counts_kept_up_to_date(self):
+        """Scoring the Game should store the counts"""
+        self.gp1.refresh_from_db()
+        self.assertEqual(self.gp1.final_sc_count(), 0)
+        self.assertEqual(self.gp1.elimination_year(), 1902)
+        self.gp2.refresh_from_db()
+        self.assertEqual(self.gp2.final_sc_count(), 6)
+        self.assertIsNone(self.gp2.elimination_year())
+
+    def test_centrecount_save_updates(self):
+        """Committing a CentreCount change should update the GamePlayer"""
+        cc = CentreCount.objects.get(power=self.england, game=self.g, year=1902)
+        cc.count = 7
+        with self.captureOnCommitCallbacks(execute=True):
+            cc.save()
+        self.gp2.refresh_from_db()
+        self.assertEqual(self.gp2.final_scs, 7)
+        self.assertIsNone(self.gp2.year_eliminated)
+
+    def test_centrecount_delete_updates(self):
+        """Committing a CentreCount deletion should update the GamePlayer"""
+        with self.captureOnCommitCallbacks(execute=True):
+            CentreCount.objects.get(power=self.austria, game=self.g, year=1902).delete()
+        self.gp1.refresh_from_db()
+        self.assertEqual(self.gp1.final_scs, 2)
+        self.assertIsNone(self.gp1.year_eliminated)
+
+    def test_new_gameplayer(self):
+        """A GamePlayer added to a new Game should get the starting count"""
+        with self.captureOnCommitCallbacks(execute=True):
+            g = Game.objects.create(name='g2',
+                                    the_round=self.g.the_round,
+                                    the_set=self.g.the_set)
+            gp = GamePlayer.objects.create(player=self.gp1.player, game=g, power=self.england)
+        gp.refresh_from_db()
+        self.assertEqual(gp.final_sc_count(), 3)
+        self.assertIsNone(gp.elimination_year())
+        with self.captureOnCommitCallbacks(execute=True):
+            CentreCount.objects.create(power=self.england, game=g, year=1901, count=0)
+        gp.refresh_from_db()
+        self.assertEqual(gp.final_sc_count(), 0)
+        self.assertEqual(gp.elimination_year(), 1901)
+
+    def test_gameplayer_power_change(self):
+        """Changing a GamePlayer's power should update the counts"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.gp2.power = None
+            self.gp2.save(update_fields=['power'])
+            self.gp1.power = self.england
+            self.gp1.save()
+        self.gp1.refresh_from_db()
+        self.assertEqual(self.gp1.final_scs, 6)
+        self.assertIsNone(self.gp1.year_eliminated)
+        self.gp2.refresh_from_db()
+        self.assertIsNone(self.gp2.final_scs)
+        self.assertIsNone(self.gp2.year_eliminated)
+
+    def test_backfill(self):
+        GamePlayer.objects.update(final_scs=None, year_eliminated=None)
+        out = StringIO()
+        call_command('backfill_gameplayer_sc_counts', stdout=out)
+        self.assertIn('1 games', out.getvalue())
+        self.gp1.refresh_from_db()
+        self.assertEqual(self.gp1.final_scs, 0)
+        self.assertEqual(self.gp1.year_eliminated, 1902)
+        self.gp2.refresh_from_db()
+        self.assertEqual(self.gp2.final_scs, 6)
+        self.assertIsNone(self.gp2.year_eliminated)
+
+    def test_backfill_other_tournament(self):
+        GamePlayer.objects.update(final_scs=None, year_eliminated=None)
+        call_command('backfill_gameplayer_sc_counts', str(self.g.the_round.tournament_id + 1), stdout=StringIO())
+        self.gp2.refresh_from_db()
+        self.assertIsNone(self.gp2.final_scs)
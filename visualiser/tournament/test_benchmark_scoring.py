@@ -0,0 +1,65 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from tournament.game_scoring import G_SCORING_SYSTEMS
+from tournament.models import T_SCORING_SYSTEMS, Tournament
+
+
+class BenchmarkScoringCommandTests(TestCase):
+    fixtures = ['game_sets.json']
+
+    def test_benchmark_game_systems(self):
+        out = StringIO()
+        call_command('benchmark_scoring', '--sizes', '1', '5', '--repeat', '1', '--skip-tournament', stdout=out)
+        results = json.loads(out.getvalue())['results']
+        # scores() and batch_scores() for each system and size
+        self.assertEqual(len(results), 2 * 2 * len(G_SCORING_SYSTEMS))
+        for r in results:
+            self.assertEqual(r['kind'], 'game')
+            self.assertGreaterEqual(r['seconds'], 0.0)
+
+    def test_benchmark_tournament_systems(self):
+        out = StringIO()
+        call_command('benchmark_scoring', '--sizes', '16', '--repeat', '1', '--skip-game', stdout=out)
+        results = json.loads(out.getvalue())['results']
+        # scores() for each system, plus TScoringWDC2025._top21()
+        self.assertEqual(len(results), len(T_SCORING_SYSTEMS) + 1)
+        self.assertIn('_top21', [r['method'] for r in results])
+        # Nothing should be left in the database
+        self.assertFalse(Tournament.objects.exists())
+
+    def test_benchmark_system_filter_and_compare(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'results.json')
+            call_command('benchmark_scoring', '--sizes', '2', '--repeat', '1', '--skip-tournament',
+                         '--system', 'Solo', '--output', filename)
+            with open(filename) as f:
+                results = json.load(f)['results']
+            self.assertTrue(results)
+            for r in results:
+                self.assertIn('Solo', r['system'])
+            err = StringIO()
+            call_command('benchmark_scoring', '--sizes', '2', '--repeat', '1', '--skip-tournament',
+                         '--system', 'Solo', '--compare', filename, stdout=StringIO(), stderr=err)
+            self.assertEqual(len(err.getvalue().splitlines()), len(results))
@@ -0,0 +1,77 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from tournament.game_seeder import SeedMethod
+
+
+class BenchmarkSeedingCommandTests(SimpleTestCase):
+
+    def _run(self, *args, **kwargs):
+        out = StringIO()
+        call_command('benchmark_seeding', '--time-limit', '0.1', '--starts', '2',
+                     '--iterations', '100', *args, stdout=out, **kwargs)
+        return json.loads(out.getvalue())
+
+    def test_benchmark_all_methods(self):
+        output = self._run('--sizes', '12', '--prior-rounds', '1', '2')
+        self.assertEqual(output['seeder'], 'GameSeeder')
+        results = output['results']
+        self.assertEqual(len(results), 2 * len(SeedMethod))
+        for r in results:
+            self.assertEqual(r['players'], 12)
+            # 12 players needs two doublers
+            self.assertEqual(r['sitters'], 0)
+            self.assertEqual(r['doublers'], 2)
+            self.assertGreaterEqual(r['seconds'], 0.0)
+            self.assertGreater(r['peak_memory'], 0)
+            self.assertGreaterEqual(r['fitness'], 0)
+
+    def test_benchmark_repeatable(self):
+        args = ['--sizes', '22', '--prior-rounds', '3', '--methods', 'RANDOM', 'BOARD',
+                '--array', '--skip-memory']
+        output = self._run(*args)
+        self.assertEqual(output['seeder'], 'ArrayGameSeeder')
+        results = output['results']
+        for r in results:
+            self.assertEqual(r['sitters'], 1)
+            self.assertIsNone(r['peak_memory'])
+        self.assertEqual([r['fitness'] for r in self._run(*args)['results']],
+                         [r['fitness'] for r in results])
+
+    def test_benchmark_compare(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'results.json')
+            call_command('benchmark_seeding', '--sizes', '14', '--prior-rounds', '1',
+                         '--methods', 'RANDOM', '--skip-memory', '--output', filename)
+            with open(filename) as f:
+                results = json.load(f)['results']
+            self.assertEqual(len(results), 1)
+            err = StringIO()
+            self._run('--sizes', '14', '21', '--prior-rounds', '1', '--methods', 'RANDOM',
+                      '--skip-memory', '--compare', filename, stderr=err)
+            self.assertEqual(len(err.getvalue().splitlines()), 1)
+
+    def test_benchmark_too_few_players(self):
+        self.assertRaises(CommandError, call_command, 'benchmark_seeding', '--sizes', '6', stdout=StringIO())
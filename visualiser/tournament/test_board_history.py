@@ -0,0 +1,141 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as datetime_timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tournament.board_history import BoardHistory
+from tournament.diplomacy import GameSet, GreatPower, SupplyCentre
+from tournament.game_scoring import G_SCORING_SYSTEMS
+from tournament.models import (R_SCORING_SYSTEMS, T_SCORING_SYSTEMS,
+                               CentreCount, DrawSecrecy, Game, Round,
+                               SupplyCentreOwnership, Tournament)
+
+HOURS_24 = timedelta(hours=24)
+
+
+class BoardHistoryTests(TestCase):
+    """
+    Test BoardHistory
+    """
+    fixtures = ['game_sets.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.t1 = Tournament.objects.create(name='t1',
+                                           start_date=today,
+                                           end_date=today + HOURS_24,
+                                           round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                           tournament_scoring_system=T_SCORING_SYSTEMS[0].name,
+                                           draw_secrecy=DrawSecrecy.SECRET,
+                                           is_published=True)
+        r1 = Round.objects.create(tournament=cls.t1,
+                                  scoring_system=G_SCORING_SYSTEMS[0].name,
+                                  dias=True,
+                                  start=datetime.combine(cls.t1.start_date,
+                                                         time(hour=8, tzinfo=datetime_timezone.utc)))
+        cls.g1 = Game.objects.create(name='g1',
+                                     started_at=r1.start,
+                                     the_round=r1,
+                                     the_set=GameSet.objects.get(name='Avalon Hill'))
+        cls.austria = GreatPower.objects.get(abbreviation='A')
+        cls.england = GreatPower.objects.get(abbreviation='E')
+        cls.france = GreatPower.objects.get(abbreviation='F')
+        # 1901 - only partly entered
+        CentreCount.objects.create(game=cls.g1, power=cls.austria, year=1901, count=5)
+        CentreCount.objects.create(game=cls.g1, power=cls.england, year=1901, count=4)
+        cls.belgium = SupplyCentre.objects.get(name='Belgium')
+        cls.vienna = SupplyCentre.objects.get(name='Vienna')
+        SupplyCentreOwnership.objects.create(game=cls.g1, year=1901, sc=cls.belgium, owner=cls.england)
+        SupplyCentreOwnership.objects.create(game=cls.g1, year=1901, sc=cls.vienna, owner=cls.austria)
+
+    def test_years(self):
+        history = BoardHistory(self.g1)
+        self.assertEqual(history.years(), [1900, 1901])
+        self.assertEqual(history.final_year(), 1901)
+
+    def test_counts(self):
+        history = BoardHistory(self.g1)
+        self.assertEqual(history.count(self.austria, 1900), 3)
+        self.assertEqual(history.count(self.austria, 1901), 5)
+        self.assertIsNone(history.count(self.france, 1901))
+        self.assertIsNone(history.count(self.france, 1902))
+        self.assertEqual(len(history.counts(1901)), 7)
+
+    def test_neutrals(self):
+        history = BoardHistory(self.g1)
+        self.assertEqual(history.neutrals(1900), self.g1.neutrals(1900))
+        self.assertEqual(history.neutrals(1901), 34 - 9)
+        self.assertIsNone(history.neutrals(1905))
+
+    def test_owners(self):
+        history = BoardHistory(self.g1)
+        self.assertTrue(history.has_ownerships(1901))
+        self.assertFalse(history.has_ownerships(1902))
+        self.assertEqual(history.ownership_years()[-1], 1901)
+        owners = dict(zip(history.centres, history.owners(1901)))
+        self.assertEqual(owners[self.belgium], self.england)
+        self.assertEqual(owners[self.vienna], self.austria)
+        self.assertIsNone(owners[SupplyCentre.objects.get(name='Holland')])
+        self.assertEqual(history.owned_counts(1901)[history.powers.index(self.austria)], 1)
+
+    def test_queries(self):
+        powers = list(GreatPower.objects.all())
+        centres = list(SupplyCentre.objects.all())
+        # One query for the CentreCounts and one for the SupplyCentreOwnerships
+        with self.assertNumQueries(2):
+            history = BoardHistory(self.g1, powers=powers, centres=centres)
+            for year in history.years():
+                history.counts(year)
+                history.owners(year)
+                history.neutrals(year)
+
+    def test_subset_of_powers(self):
+        history = BoardHistory(self.g1, powers=[self.england])
+        self.assertEqual(history.counts(1901), [4])
+
+    def test_compare_sc_counts_and_ownerships(self):
+        history = BoardHistory(self.g1)
+        # Austria and England own fewer centres than their counts, and the others have no counts
+        self.assertEqual(len(self.g1.compare_sc_counts_and_ownerships(1901, history)), 7)
+
+    def test_views_query_count(self):
+        """The number of queries for the SC chart and ownership pages shouldn't depend on the game length"""
+        urls = [reverse('game_sc_chart', args=(self.t1.pk, self.g1.name)),
+                reverse('game_sc_owners', args=(self.t1.pk, self.g1.name))]
+
+        def query_counts():
+            result = []
+            for url in urls:
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, secure=True)
+                self.assertEqual(response.status_code, 200)
+                result.append(len(queries))
+            return result
+
+        # The first requests also create the data versions
+        query_counts()
+        before = query_counts()
+        for year in range(1902, 1906):
+            CentreCount.objects.create(game=self.g1, power=self.austria, year=year, count=5)
+            SupplyCentreOwnership.objects.create(game=self.g1, year=year, sc=self.vienna, owner=self.austria)
+        self.assertEqual(query_counts(), before)
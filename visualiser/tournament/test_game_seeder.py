@@ -18,13 +18,15 @@
 Assign powers to players in a Diplomacy game.
 """
 
+import itertools
+import time
 import unittest
 from string import ascii_uppercase
 
-from tournament.game_seeder import (GameSeeder, ImpossibleToSeed,
-                                    InvalidPlayer, InvalidPlayerCount,
-                                    InvalidPlayerPairing, InvalidWeight,
-                                    PowersNotUnique, SeedMethod)
+from tournament.game_seeder import (ArrayGameSeeder, GameSeeder,
+                                    ImpossibleToSeed, InvalidPlayer,
+                                    InvalidPlayerCount, InvalidPlayerPairing,
+                                    InvalidWeight, PowersNotUnique, SeedMethod)
 
 
 class GameSeederSetupTest(unittest.TestCase):
@@ -181,6 +183,39 @@ class GameSeederSetupTest(unittest.TestCase):
         self.assertEqual(2 * seeder._BIAS_WEIGHT ** 2,
                          seeder._fitness_score({'A', 'B', 'C', 'D', 'E', 'F', 'G'}))
 
+    # add_shared_games() and add_power_games()
+    def test_add_shared_games_unknown_player(self):
+        seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
+        seeder.add_player('A')
+        self.assertRaises(InvalidPlayer, seeder.add_shared_games, 'A', 'B', 1)
+        self.assertRaises(InvalidPlayerPairing, seeder.add_shared_games, 'A', 'A', 1)
+
+    def test_add_power_games_unknown_player(self):
+        seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
+        seeder.add_player('A')
+        self.assertRaises(InvalidPlayer, seeder.add_power_games, 'B', '1', 1)
+
+    def test_add_shared_and_power_games(self):
+        """Adding a summary of games should be the same as adding the games"""
+        games = [with_powers(set('ABCDEFG')), with_powers(set('ABHIJKL'))]
+        seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
+        summary_seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
+        for p in ascii_uppercase[:14]:
+            seeder.add_player(p)
+            summary_seeder.add_player(p)
+        shared = {}
+        for game in games:
+            seeder.add_played_game(game)
+            for (p1, power1), (p2, _) in itertools.combinations(sorted(game), 2):
+                shared[(p1, p2)] = shared.get((p1, p2), 0) + 1
+            for p, power in game:
+                summary_seeder.add_power_games(p, power, 1)
+        for (p1, p2), count in shared.items():
+            summary_seeder.add_shared_games(p1, p2, count)
+        self.assertEqual(summary_seeder.games_played_matrix, seeder.games_played_matrix)
+        self.assertEqual(summary_seeder.powers_played, seeder.powers_played)
+        self.assertTrue(summary_seeder.games_played)
+
     # _power_fitness()
     def test_power_fitness_no_games(self):
         seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
@@ -213,16 +248,6 @@ class GameSeederSetupTest(unittest.TestCase):
                                                    ('F', '6'),
                                                    ('G', '7')}))
 
-    # _assign_some_powers()
-    def test_assign_some_powers(self):
-        seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
-        for p in ['A', 'B', 'C', 'D', 'E', 'F', 'G']:
-            seeder.add_player(p)
-        games = seeder._assign_some_powers(['A', 'B', 'C', 'D', 'E', 'F', 'G'],
-                                           self.powers)
-        self.assertEqual(len(games), 7*6*5*4*3*2)
-        # Ideally, we'd also check for duplicate seedings
-
     # _assign_powers()
     def test_assign_powers(self):
         seeder = GameSeeder(self.powers, SeedMethod.RANDOM)
@@ -546,18 +571,19 @@ class _SharedSeederAlgorithmCasesMixin:
     """
 
     seed_method = None
+    seeder_class = GameSeeder
 
     def test_seed_games_no_players(self):
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            self.seed_method)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   self.seed_method)
         games = seeder.seed_games()
         self.assertEqual(len(games), 0)
 
     def _create_method_seeder(self, num_players, starts=1, iterations=1000):
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            seed_method=self.seed_method,
-                            starts=starts,
-                            iterations=iterations)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method,
+                                   starts=starts,
+                                   iterations=iterations)
         for i in range(num_players):
             seeder.add_player(f'{i}p')
         return seeder
@@ -610,6 +636,26 @@ class _SharedSeederAlgorithmCasesMixin:
         seeder = self._create_method_seeder(num_players=14)
         self.assertRaises(InvalidPlayer, seeder.seed_games, omitting_players={'X'})
 
+    def test_shared_seed_games_progress_stop(self):
+        calls = []
+
+        def progress(fitness):
+            calls.append(fitness)
+            return True
+
+        seeder = self._create_method_seeder(num_players=14, starts=5)
+        seeder.progress = progress
+        first_round = seeder.seed_games()
+        for g in first_round:
+            seeder.add_played_game(with_powers(g))
+        calls.clear()
+        games = seeder.seed_games()
+        self.check_game_set(games, 14)
+        # Asking to stop should stop at the first report
+        self.assertEqual(len(calls), 1)
+        self.assertIsInstance(calls[0], int)
+        self.assertLessEqual(seeder._set_fitness(games), calls[0])
+
     def test_shared_seed_games_with_single_doubler(self):
         seeder = self._create_method_seeder(num_players=13)
         first_dup = '2p'
@@ -635,6 +681,8 @@ class _SharedSeederAlgorithmCasesMixin:
 class _SharedRandomBoardSeederCasesMixin:
     """Shared larger-scale behavior tests for RANDOM and BOARD methods."""
 
+    seeder_class = GameSeeder
+
     def assert_second_round_21_fitness(self, fitness):
         """Override for algorithm-specific quality assertion on 21-player round 2."""
         self.assertLessEqual(fitness, 30)
@@ -648,10 +696,10 @@ class _SharedRandomBoardSeederCasesMixin:
 
     def _seed_bigger_tournament(self, starts, iterations):
         """Two rounds of a 49-player tournament."""
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            starts=starts,
-                            iterations=iterations,
-                            seed_method=self.seed_method)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   starts=starts,
+                                   iterations=iterations,
+                                   seed_method=self.seed_method)
         for i in range(49):
             seeder.add_player(f'{i}p')
         games = seeder.seed_games()
@@ -664,8 +712,8 @@ class _SharedRandomBoardSeederCasesMixin:
         self.assert_bigger_tournament_second_round_fitness(seeder._set_fitness(games))
 
     def test_seed_games_second_round(self):
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            seed_method=self.seed_method)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method)
         for p in ascii_uppercase[:21]:
             seeder.add_player(p)
         # Add some previously-played games.
@@ -700,8 +748,8 @@ class _SharedRandomBoardSeederCasesMixin:
                 self._seed_bigger_tournament(starts, iterations)
 
     def test_seed_games_separate_dups_1(self):
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            seed_method=self.seed_method)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method)
         for p in ascii_uppercase[:26]:
             seeder.add_player(p)
         dups = {'A', 'B'}
@@ -712,8 +760,8 @@ class _SharedRandomBoardSeederCasesMixin:
         self.check_no_games_played(seeder)
 
     def test_seed_games_separate_dups_2(self):
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            seed_method=self.seed_method)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method)
         for p in ascii_uppercase[:18]:
             seeder.add_player(p)
         dups = {'A', 'B', 'C'}
@@ -725,8 +773,8 @@ class _SharedRandomBoardSeederCasesMixin:
         self.check_no_games_played(seeder)
 
     def test_seed_games_three_rounds_rotating_omissions(self):
-        seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                            seed_method=self.seed_method)
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method)
         for i in range(25):
             seeder.add_player(f'{i}p')
 
@@ -801,8 +849,8 @@ class ExhaustiveGameSeederTest(_SharedSeederAlgorithmCasesMixin,
         players = [(7, 42), (14, 36)]
         for count, fitness in players:
             with self.subTest(player_count=count):
-                seeder = GameSeeder(['1', '2', '3', '4', '5', '6', '7'],
-                                    seed_method=self.seed_method)
+                seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                           seed_method=self.seed_method)
                 for i in range(count):
                     seeder.add_player(f'{i}p')
                 r = seeder.seed_games()
@@ -818,6 +866,48 @@ class ExhaustiveGameSeederTest(_SharedSeederAlgorithmCasesMixin,
                 self.assertEqual(seeder._set_fitness(r), fitness)
 
 
+    def test_exhaustive_seeding_21_players(self):
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method)
+        for p in ascii_uppercase[:21]:
+            seeder.add_player(p)
+        for n in range(3):
+            seeder.add_played_game(with_powers(set(ascii_uppercase[7 * n:7 * n + 7])))
+        r = seeder.seed_games()
+        self.check_game_set(r, 21)
+        # Each game must have two pairs who played each other in round 1
+        self.assertEqual(seeder._set_fitness(r), 30)
+
+    def test_exhaustive_seedings_improve(self):
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method)
+        for i in range(14):
+            seeder.add_player(f'{i}p')
+        seeder.add_played_game(with_powers({'0p', '2p', '4p', '6p', '8p', '10p', '12p'}))
+        seeder.add_played_game(with_powers({'1p', '3p', '5p', '7p', '9p', '11p', '13p'}))
+        seeder.add_played_game(with_powers({'0p', '1p', '2p', '3p', '4p', '5p', '6p'}))
+        seeder.add_played_game(with_powers({'7p', '8p', '9p', '10p', '11p', '12p', '13p'}))
+        seedings = list(seeder._exhaustive_seedings(seeder._player_pool((), ())))
+        self.assertGreater(len(seedings), 0)
+        fitnesses = [f for _, f in seedings]
+        self.assertEqual(fitnesses, sorted(fitnesses, reverse=True))
+        self.assertEqual(len(set(fitnesses)), len(fitnesses))
+        for s, f in seedings:
+            self.check_game_set(s, 14)
+            self.assertEqual(seeder._set_fitness(s), f)
+
+    def test_exhaustive_seeding_time_limit(self):
+        # Even with no time, we should get a valid seeding
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method,
+                                   time_limit=0)
+        for i in range(28):
+            seeder.add_player(f'{i}p')
+        for n in range(4):
+            seeder.add_played_game(with_powers({f'{i}p' for i in range(n, 28, 4)}))
+        self.check_game_set(seeder.seed_games(), 28)
+
+
 class BoardGameSeederTest(_SharedSeederAlgorithmCasesMixin,
                           _SharedRandomBoardSeederCasesMixin,
                           _GameSetAssertionsMixin,
@@ -825,3 +915,225 @@ class BoardGameSeederTest(_SharedSeederAlgorithmCasesMixin,
     """Validate board-based seeding."""
 
     seed_method = SeedMethod.BOARD
+
+    def _second_round_seeder(self, **kwargs):
+        """A 49-player seeder with a first round already played"""
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method,
+                                   **kwargs)
+        for i in range(49):
+            seeder.add_player(f'{i}p')
+        for n in range(7):
+            seeder.add_played_game(with_powers({f'{7 * n + i}p' for i in range(7)}))
+        return seeder
+
+    def test_seed_games_repeatable(self):
+        seeder = self._second_round_seeder(starts=5, random_seed=42)
+        games = seeder.seed_games()
+        self.check_game_set(games, 49)
+        self.assertEqual(seeder.seed_games(), games)
+
+    def test_seed_games_parallel(self):
+        seeder = self._second_round_seeder(starts=4, workers=2, random_seed=42)
+        games = seeder.seed_games()
+        self.check_game_set(games, 49)
+        # Every start should give the same result as it would serially
+        serial_seeder = self._second_round_seeder(starts=4, random_seed=42)
+        self.assertEqual(seeder._set_fitness(games),
+                         serial_seeder._set_fitness(serial_seeder.seed_games()))
+
+    def test_seed_games_parallel_doublers(self):
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method,
+                                   starts=4,
+                                   workers=2)
+        for p in ascii_uppercase[:26]:
+            seeder.add_player(p)
+        dups = {'A', 'B'}
+        games = seeder.seed_games(players_doubling_up=dups)
+        self.check_game_set(games, 28, duplicates=dups)
+        for g in games:
+            self.assertNotEqual('A' in g, 'B' in g)
+        self.check_no_games_played(seeder)
+
+    def test_seed_games_time_limit(self):
+        # Even with no time, we should get a valid seeding
+        seeder = self._second_round_seeder(starts=1000, time_limit=0)
+        self.check_game_set(seeder.seed_games(), 49)
+
+
+class AnnealGameSeederTest(_SharedSeederAlgorithmCasesMixin,
+                           _SharedRandomBoardSeederCasesMixin,
+                           _GameSetAssertionsMixin,
+                           unittest.TestCase):
+    """Validate simulated annealing seeding."""
+
+    seed_method = SeedMethod.ANNEAL
+
+    def bigger_tournament_cases(self):
+        # starts isn't used, and a single swap isn't enough to improve a random seeding
+        return [(1, 10000)]
+
+    def _second_round_seeder(self, **kwargs):
+        """A 49-player seeder with a first round already played"""
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method,
+                                   **kwargs)
+        for i in range(49):
+            seeder.add_player(f'{i}p')
+        for n in range(7):
+            seeder.add_played_game(with_powers({f'{7 * n + i}p' for i in range(7)}))
+        return seeder
+
+    def test_seed_games_repeatable(self):
+        seeder = self._second_round_seeder(random_seed=42)
+        games = seeder.seed_games()
+        self.check_game_set(games, 49)
+        self.assertEqual(seeder.seed_games(), games)
+
+    def test_seed_games_trajectory(self):
+        seeder = self._second_round_seeder(iterations=5000, random_seed=1)
+        games = seeder.seed_games()
+        self.check_game_set(games, 49)
+        trajectory = seeder.fitness_trajectory
+        self.assertGreater(len(trajectory), 1)
+        # Times should increase and fitnesses decrease
+        times = [t for t, _ in trajectory]
+        self.assertEqual(times, sorted(times))
+        fitnesses = [f for _, f in trajectory]
+        self.assertEqual(fitnesses, sorted(fitnesses, reverse=True))
+        self.assertEqual(len(set(fitnesses)), len(fitnesses))
+        # The last entry should be the seeding returned
+        self.assertEqual(fitnesses[-1], seeder._set_fitness(games))
+        # There are seedings of 49 players where no two players meet again
+        self.assertEqual(fitnesses[-1], 0)
+
+    def test_seed_games_trajectory_doublers(self):
+        seeder = self.seeder_class(['1', '2', '3', '4', '5', '6', '7'],
+                                   seed_method=self.seed_method,
+                                   random_seed=3)
+        for p in ascii_uppercase[:26]:
+            seeder.add_player(p)
+        seeder.add_played_game(with_powers(set('ABCDEFG')))
+        seeder.add_bias('H', 'I')
+        dups = {'A', 'B'}
+        games = seeder.seed_games(players_doubling_up=dups)
+        self.check_game_set(games, 28, duplicates=dups)
+        for g in games:
+            self.assertNotEqual('A' in g, 'B' in g)
+            self.assertFalse(('H' in g) and ('I' in g))
+        # The trajectory includes the doubler bias, which has now been removed
+        seeder._add_bias_for_doublers(dups, add=True)
+        self.assertEqual(seeder.fitness_trajectory[-1][1],
+                         seeder._set_fitness(games, include_these_games=True))
+
+    def test_seed_games_time_limit(self):
+        seeder = self._second_round_seeder(time_limit=0.5, random_seed=1)
+        start = time.monotonic()
+        games = seeder.seed_games()
+        self.check_game_set(games, 49)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertLessEqual(seeder.fitness_trajectory[-1][0], 0.5)
+
+    def test_seed_games_no_time(self):
+        # Even with no time, we should get a valid seeding
+        seeder = self._second_round_seeder(time_limit=0)
+        self.check_game_set(seeder.seed_games(), 49)
+
+
+class ArrayRandomGameSeederTest(RandomGameSeederTest):
+    """Validate an array-backed random GameSeeder seeding games"""
+
+    seeder_class = ArrayGameSeeder
+
+
+class ArrayBoardGameSeederTest(BoardGameSeederTest):
+    """Validate array-backed board-based seeding."""
+
+    seeder_class = ArrayGameSeeder
+
+
+class ArrayAnnealGameSeederTest(AnnealGameSeederTest):
+    """Validate array-backed simulated annealing seeding."""
+
+    seeder_class = ArrayGameSeeder
+
+
+class ArrayGameSeederTest(unittest.TestCase):
+    """
+    Check that ArrayGameSeeder agrees with GameSeeder
+    """
+
+    def _seeders(self):
+        """Return a GameSeeder and an ArrayGameSeeder with the same history"""
+        seeders = []
+        for cls in [GameSeeder, ArrayGameSeeder]:
+            seeder = cls(['1', '2', '3', '4', '5', '6', '7'],
+                         SeedMethod.RANDOM,
+                         iterations=500)
+            for p in ascii_uppercase[:26]:
+                seeder.add_player(p)
+            seeder.add_played_game(with_powers(set('ABCDEFG')))
+            seeder.add_played_game(with_powers(set('HIJKLMN')))
+            seeder.add_played_game(with_powers(set('OPQRSTU')))
+            seeder.add_played_game(with_powers(set('AHOVWXY')))
+            seeder.add_bias('B', 'I')
+            seeders.append(seeder)
+        return seeders
+
+    def test_power_fitness(self):
+        seeder, array_seeder = self._seeders()
+        game = with_powers(set('AHOVWXY'))
+        self.assertEqual(array_seeder._power_fitness(game), seeder._power_fitness(game))
+
+    def test_fitness_score(self):
+        seeder, array_seeder = self._seeders()
+        for game in [set('ABHIOPV'), set('ABCDEFG'), set('TUVWXYZ')]:
+            with self.subTest(game=game):
+                self.assertEqual(array_seeder._fitness_score(game), seeder._fitness_score(game))
+
+    def test_set_fitness(self):
+        seeder, array_seeder = self._seeders()
+        # A and B are doubling up
+        games = [set('ABHIOPV'), set('ACJKQRW'), set('BDLMSTX'), set('EFGNUYZ')]
+        for include in [False, True]:
+            with self.subTest(include_these_games=include):
+                self.assertEqual(array_seeder._set_fitness(games, include),
+                                 seeder._set_fitness(games, include))
+
+    def test_improve_fitness(self):
+        _, array_seeder = self._seeders()
+        games = [set('ABHIOPV'), set('ACJKQRW'), set('BDLMSTX'), set('EFGNUYZ')]
+        for include in [False, True]:
+            with self.subTest(include_these_games=include):
+                start = array_seeder._set_fitness(games, include)
+                res, fitness = array_seeder._improve_fitness([g.copy() for g in games], include)
+                # The fitness returned should be correct for the seeding
+                self.assertEqual(fitness, array_seeder._set_fitness(res, include))
+                self.assertLessEqual(fitness, start)
+
+    def test_seed_games_with_doublers(self):
+        _, array_seeder = self._seeders()
+        dups = {'A', 'B'}
+        games = array_seeder.seed_games(players_doubling_up=dups)
+        self.assertEqual(len(games), 4)
+        for g in games:
+            self.assertEqual(len(g), 7)
+            self.assertNotEqual('A' in g, 'B' in g)
+        # The temporary bias should have been removed
+        self.assertEqual(array_seeder._pair_counts[0, 1], 1)
+        self.assertEqual(array_seeder.games_played_matrix['A']['B'], 1)
+
+    def test_pair_squares(self):
+        seeder, array_seeder = self._seeders()
+        self.assertEqual(array_seeder._pair_squares(), seeder._pair_squares())
+
+    def test_add_shared_and_power_games(self):
+        seeder, array_seeder = self._seeders()
+        for s in [seeder, array_seeder]:
+            s.add_shared_games('V', 'Z', 2)
+            s.add_power_games('Z', '3', 2)
+        self.assertEqual(array_seeder._pair_squares(), seeder._pair_squares())
+        game = with_powers(set('VWXYZAB'))
+        self.assertEqual(array_seeder._power_fitness(game), seeder._power_fitness(game))
+        self.assertEqual(array_seeder._power_fitness({('Z', '3')}), 2)
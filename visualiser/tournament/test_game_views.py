@@ -20,13 +20,14 @@ from urllib.parse import urlencode
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import TestCase, tag
 from django.urls import reverse
 
 from tournament.diplomacy import GameSet, GreatPower, SupplyCentre
 from tournament.game_scoring import G_SCORING_SYSTEMS
-from tournament.game_views import _graph_end_year
+from tournament.graphs import _graph_end_year
 from tournament import backstabbr
 from tournament import webdip
 from tournament.models import (R_SCORING_SYSTEMS, T_SCORING_SYSTEMS,
@@ -2020,7 +2021,7 @@ class GameViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'games/vote.html')
 
-    # test game_views._graph_end_year()
+    # test graphs._graph_end_year()
     def test_graph_end_year_finished(self):
         self.assertEqual(self.g1.centrecount_set.filter(year=1905).count(), 0)
         self.assertIs(False, self.g1.is_finished)
@@ -2122,6 +2123,8 @@ class GameViewTests(TestCase):
 
     def test_graph_sparse_data(self):
         """Check that we can generate a graph when some years have missing SC CentreCounts"""
+        # Don't re-use a graph cached by another test
+        cache.clear()
         # Add two elimination years
         sc1 = CentreCount.objects.create(game=self.g1,
                                          year=1902,
@@ -2338,6 +2341,38 @@ class GameViewTests(TestCase):
         self.g1.supplycentreownership_set.filter(year=1903).delete()
         self.g1.centrecount_set.filter(year=1903).delete()
 
+    def test_api_conditional_get(self):
+        url = reverse('api_game', args=(1, self.t1.pk, self.g1.name))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # A change to a different Game in the same Tournament changes the Tournament
+        with self.captureOnCommitCallbacks(execute=True):
+            self.g2.save()
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        # As does a new draw vote in this Game
+        with self.captureOnCommitCallbacks(execute=True):
+            dp = DrawProposal.objects.create(game=self.g1,
+                                             year=1901,
+                                             season=Seasons.SPRING,
+                                             passed=False,
+                                             proposer=self.austria)
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # Cleanup
+        dp.delete()
+
+    def test_sc_chart_conditional_get(self):
+        url = reverse('game_sc_chart', args=(self.t1.pk, self.g1.name))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
     def test_api_with_passed_draw(self):
         self.assertEqual(self.g1.drawproposal_set.count(), 0)
         dp = DrawProposal.objects.create(game=self.g1,
@@ -0,0 +1,212 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as datetime_timezone
+import json
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import translation
+
+from tournament import graphs
+from tournament.diplomacy import GameSet, GreatPower
+from tournament.game_scoring import G_SCORING_SYSTEMS
+from tournament.models import (R_SCORING_SYSTEMS, T_SCORING_SYSTEMS,
+                               CentreCount, DrawSecrecy, Game, GameVersion,
+                               Round, Tournament, TournamentPlayer,
+                               TournamentVersion)
+from tournament.players import Player
+
+HOURS_24 = timedelta(hours=24)
+
+
+class GraphCacheTests(TestCase):
+    fixtures = ['game_sets.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.t1 = Tournament.objects.create(name='t1',
+                                           start_date=today,
+                                           end_date=today + HOURS_24,
+                                           round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                           tournament_scoring_system=T_SCORING_SYSTEMS[0].name,
+                                           draw_secrecy=DrawSecrecy.SECRET,
+                                           is_published=True)
+        cls.r1 = Round.objects.create(tournament=cls.t1,
+                                      scoring_system=G_SCORING_SYSTEMS[0].name,
+                                      dias=True,
+                                      start=datetime.combine(cls.t1.start_date,
+                                                             time(hour=8, tzinfo=datetime_timezone.utc)))
+        cls.g1 = Game.objects.create(name='Game1',
+                                     started_at=cls.r1.start,
+                                     the_round=cls.r1,
+                                     the_set=GameSet.objects.first())
+
+    def setUp(self):
+        cache.clear()
+
+    def test_game_graph_cached(self):
+        with patch('tournament.graphs.render_game_graph', return_value=b'png') as mock_render:
+            self.assertEqual(graphs.game_graph(self.g1), b'png')
+            self.assertEqual(graphs.game_graph(self.g1), b'png')
+        mock_render.assert_called_once_with(self.g1)
+
+    def test_game_graph_game_changed(self):
+        with patch('tournament.graphs.render_game_graph', return_value=b'png') as mock_render:
+            graphs.game_graph(self.g1)
+            GameVersion.objects.filter(game=self.g1).update(version=F('version') + 1)
+            graphs.game_graph(self.g1)
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_game_graph_round_changed(self):
+        # The end of the X-axis can be set by the Round
+        with patch('tournament.graphs.render_game_graph', return_value=b'png') as mock_render:
+            graphs.game_graph(self.g1)
+            TournamentVersion.objects.filter(tournament=self.t1).update(version=F('version') + 1)
+            graphs.game_graph(self.g1)
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_game_graph_language(self):
+        with patch('tournament.graphs.render_game_graph', return_value=b'png') as mock_render:
+            with translation.override('en'):
+                graphs.game_graph(self.g1)
+            with translation.override('fr'):
+                graphs.game_graph(self.g1)
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_tournament_graph_cached(self):
+        with patch('tournament.graphs.render_tournament_graph', return_value=b'png') as mock_render:
+            self.assertEqual(graphs.tournament_graph(self.t1), b'png')
+            self.assertEqual(graphs.tournament_graph(self.t1), b'png')
+            TournamentVersion.objects.filter(tournament=self.t1).update(version=F('version') + 1)
+            self.assertEqual(graphs.tournament_graph(self.t1), b'png')
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_graph_view_cached(self):
+        url = reverse('graph_img_scs', args=(self.t1.pk, self.g1.name))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(b'\x89PNG\r\n\x1a\n', response.content[:8])
+        with patch('tournament.graphs.render_game_graph') as mock_render:
+            response2 = self.client.get(url, secure=True)
+        mock_render.assert_not_called()
+        self.assertEqual(response.content, response2.content)
+
+    def test_graph_redrawn_after_change(self):
+        url = reverse('graph_img_scs', args=(self.t1.pk, self.g1.name))
+        self.client.get(url, secure=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.g1.notes = 'Changed'
+            self.g1.save()
+        with patch('tournament.graphs.render_game_graph', return_value=b'png') as mock_render:
+            response = self.client.get(url, secure=True)
+        mock_render.assert_called_once()
+        self.assertEqual(response.content, b'png')
+
+    def test_no_prerender_by_default(self):
+        with patch('tournament.graphs._graph_thread_pool') as mock_pool:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.g1.save()
+        mock_pool.assert_not_called()
+
+    @override_settings(GRAPH_PRERENDER_WORKERS=1)
+    def test_prerender_after_change(self):
+        with patch('tournament.graphs._graph_thread_pool') as mock_pool:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.g1.save()
+        mock_pool.return_value.submit.assert_called_once_with(graphs._prerender_graphs,
+                                                              {self.t1.pk},
+                                                              {self.g1.pk})
+
+    def test_prerender_graphs(self):
+        with patch('tournament.graphs.render_game_graph', return_value=b'game') as mock_game:
+            with patch('tournament.graphs.render_tournament_graph', return_value=b'scores') as mock_tournament:
+                # Closing the test's database connection would end the test transaction
+                with patch('tournament.graphs.connection'):
+                    graphs._prerender_graphs({self.t1.pk}, {self.g1.pk})
+                # Now viewing the graphs shouldn't draw them again
+                with translation.override(translation.get_supported_language_variant(settings.LANGUAGE_CODE)):
+                    graphs.game_graph(self.g1)
+                    graphs.tournament_graph(self.t1)
+        mock_game.assert_called_once()
+        mock_tournament.assert_called_once()
+
+    def test_game_graph_data(self):
+        austria = GreatPower.objects.get(abbreviation='A')
+        CentreCount.objects.create(game=self.g1, power=austria, year=1901, count=5)
+        # No count for Austria in 1902
+        CentreCount.objects.create(game=self.g1, power=GreatPower.objects.get(abbreviation='R'),
+                                   year=1902, count=6)
+        data = graphs.game_graph_data(self.g1)
+        self.assertEqual(data['x'], [1900, 1901, 1902])
+        self.assertEqual(data['x_max'], 1907)
+        self.assertEqual(data['y_max'], 18)
+        self.assertEqual(len(data['series']), 7)
+        austria_series = data['series'][0]
+        self.assertEqual(austria_series['label'], austria.name)
+        self.assertEqual(austria_series['values'], [3, 5, None])
+        self.assertEqual(austria_series['colour'],
+                         graphs._map_to_fg(self.g1.the_set.setpower_set.get(power=austria).colour))
+
+    def test_tournament_graph_data(self):
+        p1 = Player.objects.create(first_name='Angela', last_name='Ampersand')
+        TournamentPlayer.objects.create(player=p1, tournament=self.t1)
+        data = graphs.tournament_graph_data(self.t1)
+        self.assertEqual(data['x'], [1])
+        self.assertEqual(data['x_label'], 'Round')
+        self.assertEqual(len(data['series']), 1)
+        self.assertEqual(data['series'][0]['label'], str(p1))
+        self.assertTrue(data['series'][0]['colour'].startswith('#'))
+        self.assertEqual(len(data['series'][0]['values']), 1)
+
+    def test_graph_data_view(self):
+        url = reverse('graph_data_scs', args=(self.t1.pk, self.g1.name))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['x'], [1900])
+        # Asking again should just give the cached data
+        with patch('tournament.graphs.game_graph_data') as mock_data:
+            response2 = self.client.get(url, secure=True)
+        mock_data.assert_not_called()
+        self.assertEqual(response.content, response2.content)
+        # And a browser with the data already should be told it's unchanged
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_tournament_graph_data_view(self):
+        response = self.client.get(reverse('graph_data_score', args=(self.t1.pk,)), secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['series'], [])
+
+    def test_graph_page_server_drawn(self):
+        response = self.client.get(reverse('game_sc_graph', args=(self.t1.pk, self.g1.name)), secure=True)
+        self.assertContains(response, reverse('graph_img_scs', args=(self.t1.pk, self.g1.name)))
+        self.assertNotContains(response, '<canvas')
+
+    @override_settings(DRAW_GRAPHS_IN_BROWSER=True)
+    def test_graph_pages_browser_drawn(self):
+        response = self.client.get(reverse('game_sc_graph', args=(self.t1.pk, self.g1.name)), secure=True)
+        self.assertContains(response, reverse('graph_data_scs', args=(self.t1.pk, self.g1.name)))
+        self.assertNotContains(response, '<img src=')
+        response = self.client.get(reverse('tournament_score_graph', args=(self.t1.pk,)), secure=True)
+        self.assertContains(response, reverse('graph_data_score', args=(self.t1.pk,)))
+        self.assertNotContains(response, '<img src=')
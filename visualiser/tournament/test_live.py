@@ -0,0 +1,197 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as datetime_timezone
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from tournament import live
+from tournament.diplomacy import GameSet, GreatPower, SupplyCentre
+from tournament.game_scoring import G_SCORING_SYSTEMS
+from tournament.models import (R_SCORING_SYSTEMS, T_SCORING_SYSTEMS,
+                               DrawSecrecy, Game, Round, SupplyCentreOwnership,
+                               Tournament)
+
+HOURS_24 = timedelta(hours=24)
+
+
+def _published(mock_publish):
+    """Set of all the channels published to"""
+    return {channel for c in mock_publish.mock_calls for channel in c.args}
+
+
+class LiveEventsTests(SimpleTestCase):
+
+    async def test_events_change(self):
+        channel = live.tournament_channel(1)
+        events = live.events(channel)
+        self.assertTrue((await anext(events)).startswith('retry: '))
+        self.assertEqual(live.listener_count(channel), 1)
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        self.assertFalse(pending.done())
+        # Publishing to other channels should be ignored
+        live.publish(live.game_channel(1), live.tournament_channel(2))
+        await asyncio.sleep(0.01)
+        self.assertFalse(pending.done())
+        live.publish(channel)
+        self.assertEqual(await asyncio.wait_for(pending, 1), 'event: change\ndata: tournament-1\n\n')
+        await events.aclose()
+        self.assertEqual(live.listener_count(channel), 0)
+
+    async def test_events_combined(self):
+        channel = live.game_channel(1)
+        events = live.events(channel)
+        await anext(events)
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0)
+        # Several changes before the event is sent should give just one event
+        live.publish(channel)
+        live.publish(channel)
+        await asyncio.wait_for(pending, 1)
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.01)
+        self.assertFalse(pending.done())
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        # and the listener should have gone with the cancelled generator
+        self.assertEqual(live.listener_count(channel), 0)
+
+    async def test_events_keepalive(self):
+        events = live.events(live.game_channel(2), keepalive_time=0.01)
+        await anext(events)
+        self.assertEqual(await asyncio.wait_for(anext(events), 1), ': keepalive\n\n')
+        await events.aclose()
+
+    def test_publish_no_listeners(self):
+        live.publish(live.tournament_channel(3))
+        self.assertEqual(live.listener_count(live.tournament_channel(3)), 0)
+
+
+class LiveUpdateTests(TestCase):
+    fixtures = ['game_sets.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.t1 = Tournament.objects.create(name='t1',
+                                           start_date=today,
+                                           end_date=today + HOURS_24,
+                                           round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                           tournament_scoring_system=T_SCORING_SYSTEMS[0].name,
+                                           draw_secrecy=DrawSecrecy.SECRET,
+                                           is_published=True)
+        cls.r1 = Round.objects.create(tournament=cls.t1,
+                                      scoring_system=G_SCORING_SYSTEMS[0].name,
+                                      dias=True,
+                                      start=datetime.combine(cls.t1.start_date,
+                                                             time(hour=8, tzinfo=datetime_timezone.utc)))
+        cls.g1 = Game.objects.create(name='Game1',
+                                     started_at=cls.r1.start,
+                                     the_round=cls.r1,
+                                     the_set=GameSet.objects.first())
+        # Unpublished Tournament
+        cls.t2 = Tournament.objects.create(name='t2',
+                                           start_date=today,
+                                           end_date=today + HOURS_24,
+                                           round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                           tournament_scoring_system=T_SCORING_SYSTEMS[0].name,
+                                           draw_secrecy=DrawSecrecy.SECRET,
+                                           is_published=False)
+
+    def test_game_change_published(self):
+        with patch('tournament.live.publish') as mock_publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.g1.notes = 'Changed'
+                self.g1.save()
+        self.assertIn(live.game_channel(self.g1.pk), _published(mock_publish))
+        self.assertIn(live.tournament_channel(self.t1.pk), _published(mock_publish))
+
+    def test_sc_ownership_change_published(self):
+        with patch('tournament.live.publish') as mock_publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                SupplyCentreOwnership.objects.create(game=self.g1,
+                                                     year=1901,
+                                                     sc=SupplyCentre.objects.get(name='Belgium'),
+                                                     owner=GreatPower.objects.get(abbreviation='F'))
+        self.assertIn(live.game_channel(self.g1.pk), _published(mock_publish))
+
+    def test_nothing_published_before_commit(self):
+        with patch('tournament.live.publish') as mock_publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.r1.save()
+        mock_publish.assert_not_called()
+        self.assertTrue(callbacks)
+
+    @override_settings(LIVE_UPDATES=True)
+    def test_refresh_page_live_url(self):
+        response = self.client.get(reverse('tournament_scores_refresh', args=(self.t1.pk,)),
+                                   secure=True)
+        self.assertEqual(response.context['live_url'], reverse('tournament_events', args=(self.t1.pk,)))
+        self.assertContains(response, 'EventSource')
+        response = self.client.get(reverse('game_sc_chart_refresh', args=(self.t1.pk, self.g1.name)),
+                                   secure=True)
+        self.assertEqual(response.context['live_url'],
+                         reverse('game_events', args=(self.t1.pk, self.g1.name)))
+
+    @override_settings(LIVE_UPDATES=True)
+    def test_cycling_page_no_live_url(self):
+        # Pages that move on to a different page still need a timer
+        response = self.client.get(reverse('tournament_overview', args=(self.t1.pk,)),
+                                   secure=True)
+        self.assertNotIn('live_url', response.context)
+        self.assertContains(response, 'http-equiv="refresh"')
+
+    def test_refresh_page_live_updates_disabled(self):
+        response = self.client.get(reverse('tournament_scores_refresh', args=(self.t1.pk,)),
+                                   secure=True)
+        self.assertNotIn('live_url', response.context)
+        self.assertNotContains(response, 'EventSource')
+
+    async def test_tournament_events(self):
+        response = await self.async_client.get(reverse('tournament_events', args=(self.t1.pk,)),
+                                               secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = aiter(response.streaming_content)
+        self.assertTrue((await anext(content)).startswith(b'retry: '))
+        live.publish(live.tournament_channel(self.t1.pk))
+        self.assertEqual(await asyncio.wait_for(anext(content), 1),
+                         f'event: change\ndata: tournament-{self.t1.pk}\n\n'.encode())
+        await response.streaming_content.aclose()
+
+    async def test_game_events(self):
+        response = await self.async_client.get(reverse('game_events', args=(self.t1.pk, self.g1.name)),
+                                               secure=True)
+        self.assertEqual(response.status_code, 200)
+        content = aiter(response.streaming_content)
+        self.assertTrue((await anext(content)).startswith(b'retry: '))
+        await response.streaming_content.aclose()
+
+    async def test_events_not_visible(self):
+        response = await self.async_client.get(reverse('tournament_events', args=(self.t2.pk,)),
+                                               secure=True)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_events_unknown_game(self):
+        response = await self.async_client.get(reverse('game_events', args=(self.t1.pk, 'Nonexistent')),
+                                               secure=True)
+        self.assertEqual(response.status_code, 404)
@@ -14,37 +14,45 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import Counter
 from datetime import date, datetime, time, timedelta
 from datetime import timezone as datetime_timezone
-from unittest.mock import patch
+from itertools import combinations
+from unittest.mock import MagicMock, patch
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Sum
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
 from django.forms import modelform_factory
 from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
 
 from tournament import backstabbr, webdip
 from tournament.diplomacy import GameSet, GreatPower, SupplyCentre
 from tournament.game_scoring import G_SCORING_SYSTEMS
 from tournament.models import (NO_SCORING_SYSTEM_STR, R_SCORING_SYSTEMS,
                                T_SCORING_SYSTEMS, Award, BestCountryCriteria,
+                               BestCountryRank,
                                CentreCount, DBNCoverage, DrawProposal,
                                DrawSecrecy, Formats, Game, GameImage,
-                               GamePlayer, InvalidPowerAssignmentMethod,
+                               GamePlayer, GameVersion, InvalidPowerAssignmentMethod,
                                InvalidPreferenceList, InvalidScoringSystem,
                                InvalidYear, Phases, Pool, PowerAlreadyAssigned,
-                               PowerAssignMethods, Preference, Round,
-                               RoundPlayer, SCOwnershipsNotFound, Seasons,
-                               SeederBias, Series, SupplyCentreOwnership, Team,
-                               Tournament, TournamentPlayer, TScoringSumGames,
+                               PowerAssignMethods, PowerGameCount, Preference,
+                               Round, RoundPlayer, RoundStanding,
+                               SCOwnershipsNotFound, Seasons, SeederBias,
+                               Series, SharedGameCount, SupplyCentreOwnership, Team,
+                               TeamRoundStanding, Tournament, TournamentPlayer,
+                               TournamentVersion, TScoringSumGames,
                                TScoringSumRounds, find_game_scoring_system,
                                find_round_scoring_system,
                                find_tournament_scoring_system,
+                               deferred_score_updates,
                                scoring_systems_are_compatible,
-                               validate_game_name,
+                               update_scores_for_games, validate_game_name,
                                validate_game_scoring_system,
                                validate_no_newlines,
                                validate_round_scoring_system,
@@ -713,6 +721,8 @@ class TournamentScoringWDC2025Tests(TestCase):
         for g, players in games.items():
             for player, power, score in players:
                 GamePlayer.objects.create(player=player, game=g, power=power, score=score)
+            # The scores are set directly, so just store the supply centre counts
+            g.update_gameplayer_sc_counts()
 
     # TScoringWDC2025.__str__()
     def test_str(self):
@@ -2416,6 +2426,54 @@ class TournamentScoringTests(TestCase):
                         self.assertEqual(rp.score, 0.0)
                         self.assertIs(False, rp.score_dropped)
 
+    def _sum_games_queries(self, num_games):
+        """
+        Create a three round Tournament with num_games Games per Round.
+
+        Returns the number of queries used by TScoringSumGames.scores()
+        """
+        s = G_SCORING_SYSTEMS[0].name
+        today = date.today()
+        tss = _find_t_scoring_system(TScoringSumGames, 2)
+        t = Tournament.objects.create(name=f'Query Count Test {num_games}',
+                                      start_date=today,
+                                      end_date=today + HOURS_24,
+                                      round_scoring_system=NO_SCORING_SYSTEM_STR,
+                                      tournament_scoring_system=tss.name,
+                                      draw_secrecy=DrawSecrecy.SECRET)
+        powers = list(GreatPower.objects.all())
+        players = [Player.objects.create(first_name=f'Player{n}', last_name=f'Count{num_games}')
+                   for n in range(num_games * len(powers))]
+        start = datetime.combine(t.start_date, time(hour=8, tzinfo=datetime_timezone.utc))
+        for r_num in range(3):
+            r = Round.objects.create(tournament=t,
+                                     scoring_system=s,
+                                     dias=False,
+                                     start=start + r_num * HOURS_8)
+            for g_num in range(num_games):
+                g = Game.objects.create(name=f'r{r_num}g{g_num}',
+                                        started_at=r.start,
+                                        the_round=r,
+                                        the_set=self.set1)
+                for n, power in enumerate(powers):
+                    p = players[(g_num * len(powers) + n + r_num) % len(players)]
+                    RoundPlayer.objects.get_or_create(player=p, the_round=r)
+                    GamePlayer.objects.create(player=p, game=g, power=power, score=n + r_num)
+        round_players = RoundPlayer.objects.filter(the_round__tournament=t)
+        # The first call may update score_dropped flags
+        t_scores = tss.scores(round_players)
+        self.assertEqual(len(t_scores), len(players))
+        with CaptureQueriesContext(connection) as queries:
+            tss.scores(round_players)
+        return len(queries)
+
+    def test_tscoringsumgames_scores_query_count(self):
+        """TScoringSumGames.scores() query count doesn't depend on the number of players"""
+        queries = self._sum_games_queries(1)
+        # One query for RoundPlayers and one for GamePlayers
+        self.assertEqual(queries, 2)
+        self.assertEqual(queries, self._sum_games_queries(3))
+
 
 class ModelTests(TestCase):
     fixtures = ['game_sets.json', 'players.json']
@@ -4264,6 +4322,95 @@ class TournamentTests(TestCase):
         t.team_size = None
         t.save(update_fields=['team_size'])
 
+    # Tournament.standings()
+    def test_tournament_standings(self):
+        t = Tournament.objects.get(name='t1')
+        rounds = list(t.round_set.all())
+        standings = t.standings()
+        self.assertEqual(list(standings.keys()), rounds)
+        for n, r in enumerate(rounds, start=1):
+            with self.subTest(round=n):
+                self.assertEqual(standings[r], t.positions_and_scores(after_round_num=n))
+
+    def test_tournament_standings_stored(self):
+        """Rescoring should store the standings, and reading them should never write"""
+        t = Tournament.objects.get(name='t1')
+        t.rescore()
+        standings = RoundStanding.objects.filter(the_round__tournament=t)
+        self.assertEqual(standings.count(), t.round_set.count() * t.tournamentplayer_set.count())
+        # Earlier standings should just be read
+        with self.assertNumQueries(2):
+            t.positions_and_scores(after_round_num=1)
+        # Rescoring with nothing changed shouldn't write any standings
+        ids = list(standings.values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            t.rescore()
+        self.assertFalse([q for q in ctx.captured_queries if 'standing"' in q['sql'] and
+                          not q['sql'].startswith('SELECT')])
+        self.assertEqual(list(standings.values_list('pk', flat=True)), ids)
+        # Without stored standings, they are calculated but not stored
+        expected = t.positions_and_scores(after_round_num=1)
+        standings.delete()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(t.positions_and_scores(after_round_num=1), expected)
+        self.assertFalse([q for q in ctx.captured_queries if not q['sql'].startswith('SELECT')])
+        self.assertFalse(standings.exists())
+        # Updating the scores stores them again
+        rp = t.round_numbered(1).roundplayer_set.first()
+        t._update_roundplayer_tournament_scores([rp.player], t.round_numbered(1))
+        self.assertEqual(standings.count(), t.round_set.count() * t.tournamentplayer_set.count())
+        self.assertEqual(t.positions_and_scores(after_round_num=1), expected)
+
+    def test_tournament_standings_unranked(self):
+        """Changing whether a player is ranked updates the stored standings"""
+        t = Tournament.objects.get(name='t1')
+        t.rescore()
+        tp = t.tournamentplayer_set.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            tp.unranked = True
+            tp.save(update_fields=['unranked'])
+        self.assertEqual(t.positions_and_scores(after_round_num=1)[tp.player][0], Tournament.UNRANKED)
+        with self.captureOnCommitCallbacks(execute=True):
+            tp.unranked = False
+            tp.save(update_fields=['unranked'])
+        self.assertNotEqual(t.positions_and_scores(after_round_num=1)[tp.player][0], Tournament.UNRANKED)
+
+    def test_tournament_team_standings_stored(self):
+        t = Tournament.objects.get(name='t1')
+        t.team_size = 2
+        t.save(update_fields=['team_size'])
+        r1 = t.round_numbered(1)
+        r1.is_team_round = True
+        r1.save(update_fields=['is_team_round'])
+        # The standings should be stored once the Teams are committed
+        with self.captureOnCommitCallbacks(execute=True):
+            tm1 = Team.objects.create(tournament=t,
+                                      name='Test team 1')
+            tm1.players.add(self.p3)
+            tm1.players.add(self.p5)
+            tm2 = Team.objects.create(tournament=t,
+                                      name='Test team 2')
+            tm2.players.add(self.p1)
+            tm2.players.add(self.p6)
+        standings = TeamRoundStanding.objects.filter(the_round__tournament=t)
+        self.assertEqual(standings.count(), 2 * t.round_set.count())
+        scores = t.team_scores(after_round_num=1)
+        self.assertEqual(scores[tm1][0], 2)
+        self.assertAlmostEqual(scores[tm1][1], 1.1 + 2.1 + 1.3 + 2.2)
+        # Changing a Team should update them, once committed
+        with self.captureOnCommitCallbacks(execute=True):
+            tm1.players.remove(self.p5)
+        scores = t.team_scores(after_round_num=1)
+        p3_scores = GamePlayer.objects.filter(game__the_round=r1, player=self.p3).aggregate(Sum('score'))
+        self.assertAlmostEqual(scores[tm1][1], p3_scores['score__sum'])
+        # Cleanup
+        tm1.delete()
+        tm2.delete()
+        r1.is_team_round = False
+        r1.save(update_fields=['is_team_round'])
+        t.team_size = None
+        t.save(update_fields=['team_size'])
+
     # Tournament.winner()
     def test_tournament_winner_not_finished(self):
         t = Tournament.objects.get(name='t1')
@@ -5021,9 +5168,10 @@ class TournamentTests(TestCase):
         g14.the_round.save(update_fields=['scoring_system'])
         # Ensure all players are ranked
         gp_list = list(t.tournamentplayer_set.filter(unranked=True))
-        for gp in gp_list:
-            gp.unranked = False
-            gp.save(update_fields=['unranked'])
+        with self.captureOnCommitCallbacks(execute=True):
+            for gp in gp_list:
+                gp.unranked = False
+                gp.save(update_fields=['unranked'])
         # Add some CentreCounts to two Games
         # to give higher score with lower dot count and vice versa
         CentreCount.objects.create(power=self.austria, game=g12, year=1905, count=9)
@@ -5055,7 +5203,8 @@ class TournamentTests(TestCase):
                     self.assertGreater(self._rank_of(gp1, bc[power]), self._rank_of(gp2, bc[power]))
         # Change the Tournament to rank best countries by dot count
         t.best_country_criterion = BestCountryCriteria.DOTS
-        t.save(update_fields=['best_country_criterion'])
+        with self.captureOnCommitCallbacks(execute=True):
+            t.save(update_fields=['best_country_criterion'])
         # Now best countries should be different
         bc = t.best_countries(whole_list=True)
         for power in GreatPower.objects.all():
@@ -5068,10 +5217,11 @@ class TournamentTests(TestCase):
                     self.assertGreater(self._rank_of(gp1, bc[power]), self._rank_of(gp2, bc[power]))
         # Clean up
         t.best_country_criterion = BestCountryCriteria.SCORE
-        t.save(update_fields=['best_country_criterion'])
-        for gp in gp_list:
-            gp.unranked = True
-            gp.save(update_fields=['unranked'])
+        with self.captureOnCommitCallbacks(execute=True):
+            t.save(update_fields=['best_country_criterion'])
+            for gp in gp_list:
+                gp.unranked = True
+                gp.save(update_fields=['unranked'])
         g12.the_round.scoring_system = round_scoring1
         g12.the_round.save(update_fields=['scoring_system'])
         g14.the_round.scoring_system = round_scoring2
@@ -5080,6 +5230,97 @@ class TournamentTests(TestCase):
         g14.centrecount_set.filter(year=1905).delete()
 
     # Tournament.background()
+    def test_tournament_best_countries_stored(self):
+        """best_countries() should read the stored rankings, which are updated by rescoring"""
+        t = Tournament.objects.get(name='t1')
+        t._update_best_countries()
+        bc = t.best_countries(whole_list=True)
+        ranks = BestCountryRank.objects.filter(tournament=t)
+        self.assertEqual(ranks.count(), GamePlayer.objects.filter(game__the_round__tournament=t,
+                                                                  power__isnull=False).count())
+        with self.assertNumQueries(1):
+            self.assertEqual(t.best_countries(whole_list=True), bc)
+        gp = GamePlayer.objects.get(pk=bc[self.austria][-1][0].pk)
+        with self.assertNumQueries(1):
+            self.assertIs(False, gp.is_best_country())
+        # Saving a CentreCount doesn't change the rankings until the Game is rescored
+        pks = set(ranks.values_list('pk', flat=True))
+        cc = gp.game.centrecount_set.filter(power=self.austria).last()
+        cc.save()
+        self.assertEqual(set(ranks.values_list('pk', flat=True)), pks)
+        # Rescoring updates them, but rescoring again with nothing changed doesn't
+        gp.game.update_scores(update_round=False)
+        bc = t.best_countries(whole_list=True)
+        rows = set(ranks.values_list('pk', 'gameplayer_id', 'rank'))
+        gp.game.update_scores(update_round=False)
+        self.assertEqual(set(ranks.values_list('pk', 'gameplayer_id', 'rank')), rows)
+        self.assertEqual(t.best_countries(whole_list=True), bc)
+
+    def test_tournament_best_countries_read_only(self):
+        """Reading the best countries never writes them"""
+        t = Tournament.objects.get(name='t1')
+        t._update_best_countries()
+        bc = t.best_countries(whole_list=True)
+        gp = GamePlayer.objects.get(pk=bc[self.austria][-1][0].pk)
+        ranks = BestCountryRank.objects.filter(tournament=t)
+        ranks.delete()
+        self.assertEqual(t.best_countries(whole_list=True), bc)
+        self.assertIs(False, gp.is_best_country())
+        self.assertIs(True, GamePlayer.objects.get(pk=bc[self.austria][0][0].pk).is_best_country())
+        self.assertFalse(ranks.exists())
+        # Updating one power only writes that power's rankings
+        t._update_best_countries([self.austria.pk])
+        self.assertEqual(set(ranks.values_list('power_id', flat=True)), {self.austria.pk})
+        t._update_best_countries()
+        self.assertEqual(t.best_countries(whole_list=True), bc)
+
+    # Tournament.seeder_history()
+    def _expected_seeder_history(self, t, the_round):
+        """Calculate what seeder_history() should return from the GamePlayers"""
+        tp_ids = dict(t.tournamentplayer_set.values_list('player_id', 'id'))
+        shared = Counter()
+        powers = Counter()
+        for g in Game.objects.filter(the_round__tournament=t, the_round__start__lt=the_round.start):
+            gps = [gp for gp in g.gameplayer_set.all() if gp.player_id in tp_ids]
+            shared.update(combinations(sorted(tp_ids[gp.player_id] for gp in gps), 2))
+            powers.update((tp_ids[gp.player_id], gp.power_id) for gp in gps if gp.power_id is not None)
+        return dict(shared), dict(powers)
+
+    def test_tournament_seeder_history(self):
+        t = Tournament.objects.get(name='t1')
+        for r in t.round_set.all():
+            with self.subTest(round=r.number()):
+                self.assertEqual(t.seeder_history(r), self._expected_seeder_history(t, r))
+
+    def test_tournament_seeder_history_stored(self):
+        """seeder_history() should read the stored counts of finished Rounds"""
+        t = Tournament.objects.get(name='t1')
+        r = t.round_set.last()
+        gp = GamePlayer.objects.filter(game__the_round__tournament=t, power__isnull=False).first()
+        the_round = gp.game.the_round
+        # Finishing the Round stores its counts
+        the_round.game_set.update(is_finished=True)
+        the_round.set_is_finished()
+        self.assertTrue(PowerGameCount.objects.filter(the_round=the_round).exists())
+        history = t.seeder_history(r)
+        self.assertTrue(history[0])
+        # Changing a GamePlayer doesn't touch the stored counts
+        power = gp.power
+        gp.power = None
+        with self.assertNumQueries(1):
+            gp.save(update_fields=['power'])
+        self.assertEqual(t.seeder_history(r), history)
+        # Until the Round's Games are finished again
+        the_round.set_is_finished()
+        self.assertEqual(t.seeder_history(r), self._expected_seeder_history(t, r))
+        self.assertNotEqual(t.seeder_history(r), history)
+        # Unfinished Rounds are rebuilt when needed
+        the_round.game_set.update(is_finished=False)
+        the_round.set_is_finished()
+        gp.power = power
+        gp.save(update_fields=['power'])
+        self.assertEqual(t.seeder_history(r), history)
+
     def test_tournament_background_without_players(self):
         t = Tournament.objects.get(name='t1')
         # TODO Validate results
@@ -6959,6 +7200,59 @@ class RoundTests(TestCase):
         r22 = t.round_set.all()[1]
         self.assertEqual(r22.number(), 2)
 
+    def test_round_number_no_queries(self):
+        t = Tournament.objects.get(name='t1')
+        r13 = t.round_set.all()[2]
+        with self.assertNumQueries(0):
+            self.assertEqual(r13.number(), 3)
+
+    def test_round_number_insert_earlier(self):
+        t = Tournament.objects.get(name='t2')
+        r21 = t.round_numbered(1)
+        r = Round.objects.create(tournament=t,
+                                 scoring_system=s1,
+                                 dias=False,
+                                 start=r21.start - HOURS_8)
+        self.assertEqual(r.number(), 1)
+        self.assertEqual([r.number() for r in t.round_set.all()], [1, 2, 3])
+        # Cleanup
+        r.delete()
+
+    def test_round_number_delete(self):
+        t = Tournament.objects.get(name='t1')
+        t.round_numbered(2).delete()
+        self.assertEqual([r.number() for r in t.round_set.all()], [1, 2, 3])
+        self.assertEqual(t.round_numbered(3).start, t.round_set.last().start)
+
+    def test_round_number_reschedule(self):
+        t = Tournament.objects.get(name='t2')
+        r21 = t.round_numbered(1)
+        r22 = t.round_numbered(2)
+        r21.start = r22.start + HOURS_8
+        r21.save(update_fields=['start'])
+        self.assertEqual(r21.number(), 2)
+        r22.refresh_from_db()
+        self.assertEqual(r22.number(), 1)
+
+    # Tournament.ordered_rounds()
+    def test_tournament_ordered_rounds(self):
+        t = Tournament.objects.get(name='t1')
+        self.assertEqual(t.ordered_rounds(), list(t.round_set.all()))
+        # The list is kept with the Tournament
+        with self.assertNumQueries(0):
+            t.ordered_rounds()
+
+    def test_tournament_ordered_rounds_new_round(self):
+        t = Tournament.objects.get(name='t2')
+        self.assertEqual(len(t.ordered_rounds()), 2)
+        r = Round.objects.create(tournament=t,
+                                 scoring_system=s1,
+                                 dias=False,
+                                 start=t.round_numbered(2).start + HOURS_8)
+        self.assertEqual(t.ordered_rounds()[-1], r)
+        r.delete()
+        self.assertEqual(len(t.ordered_rounds()), 2)
+
     # Round.is_last()
     def test_round_is_last(self):
         t = Tournament.objects.get(name='t1')
@@ -7450,6 +7744,9 @@ class GameTests(TestCase):
         GamePlayer.objects.create(player=cls.p3, game=g14, power=cls.italy)
         GamePlayer.objects.create(player=cls.p2, game=g14, power=cls.russia)
         GamePlayer.objects.create(player=cls.p1, game=g14, power=cls.turkey)
+        # The Games aren't scored, so just store the supply centre counts
+        for g in [g11, g12, g13, g14]:
+            g.update_gameplayer_sc_counts()
         # And the corresponding RoundPlayers
         RoundPlayer.objects.create(player=cls.p1, the_round=cls.r11)
         RoundPlayer.objects.create(player=cls.p2, the_round=cls.r11)
@@ -8081,6 +8378,94 @@ class GameTests(TestCase):
         # Clean up
         t.delete()
 
+    # update_scores_for_games()
+    def test_update_scores_for_games(self):
+        t = Tournament.objects.get(name='t1')
+        g11 = self.r11.game_set.get(name='g11')
+        g12 = self.r11.game_set.get(name='g12')
+        update_scores_for_games([g11, g12])
+        # Germany (p5) soloed g11, nobody scored in g12
+        for gp in GamePlayer.objects.filter(game__in=[g11, g12]):
+            with self.subTest(game=gp.game, player=gp.player):
+                if (gp.game == g11) and (gp.player == self.p5):
+                    self.assertEqual(gp.score, 100.0)
+                else:
+                    self.assertEqual(gp.score, 0.0)
+        for rp in self.r11.roundplayer_set.all():
+            with self.subTest(player=rp.player):
+                if rp.player == self.p5:
+                    self.assertEqual(rp.score, 100.0)
+                    self.assertEqual(rp.tournament_score, 100.0)
+                else:
+                    self.assertEqual(rp.score, 0.0)
+                    self.assertEqual(rp.tournament_score, 0.0)
+        for tp in t.tournamentplayer_set.all():
+            with self.subTest(player=tp.player):
+                if tp.player == self.p5:
+                    self.assertEqual(tp.score, 100.0)
+                else:
+                    self.assertEqual(tp.score, 0.0)
+        # The cached tournament score for the later round should also be updated
+        rp = self.r12.roundplayer_set.get(player=self.p5)
+        self.assertEqual(rp.tournament_score, 100.0)
+
+    # deferred_score_updates()
+    def test_deferred_score_updates(self):
+        g11 = self.r11.game_set.get(name='g11')
+        with patch('tournament.models.update_scores_for_games') as mock_update:
+            with deferred_score_updates():
+                g11.update_scores()
+                with deferred_score_updates():
+                    g11.update_scores()
+                # Nothing should be rescored yet
+                mock_update.assert_not_called()
+            # One rescore, for the one Game
+            mock_update.assert_called_once()
+            self.assertEqual(list(mock_update.call_args.args[0]), [g11])
+
+    def test_deferred_score_updates_rescores(self):
+        g11 = self.r11.game_set.get(name='g11')
+        with deferred_score_updates():
+            g11.update_scores()
+            self.assertEqual(g11.gameplayer_set.get(player=self.p5).score, 0.0)
+        self.assertEqual(g11.gameplayer_set.get(player=self.p5).score, 100.0)
+        self.assertEqual(self.r11.roundplayer_set.get(player=self.p5).score, 100.0)
+
+    def test_deferred_score_updates_exception(self):
+        g11 = self.r11.game_set.get(name='g11')
+        with patch('tournament.models.update_scores_for_games') as mock_update:
+            with self.assertRaises(ValueError):
+                with deferred_score_updates():
+                    g11.update_scores()
+                    raise ValueError
+            mock_update.assert_not_called()
+            # Subsequent updates shouldn't be deferred
+            g11.update_scores()
+            mock_update.assert_called_once()
+
+    # Tournament.rescore()
+    def test_tournament_rescore(self):
+        t = Tournament.objects.get(name='t1')
+        t.rescore()
+        # Germany (p5) soloed g11
+        self.assertEqual(GamePlayer.objects.get(game__name='g11', player=self.p5).score, 100.0)
+        for rp in self.r11.roundplayer_set.all():
+            with self.subTest(player=rp.player):
+                if rp.player == self.p5:
+                    self.assertEqual(rp.score, 100.0)
+                else:
+                    self.assertEqual(rp.score, 0.0)
+        for tp in t.tournamentplayer_set.all():
+            with self.subTest(player=tp.player):
+                if tp.player == self.p5:
+                    self.assertEqual(tp.score, 100.0)
+                else:
+                    self.assertEqual(tp.score, 0.0)
+
+    def test_update_scores_for_games_none(self):
+        with self.assertNumQueries(0):
+            update_scores_for_games([])
+
     # Game.positions()
     def test_game_positions(self):
         g = Game.objects.first()
@@ -8539,7 +8924,102 @@ class GameTests(TestCase):
         self.assertEqual(g1.the_set, self.set1)
         g1.the_set = self.set2
         g1.save(update_fields=['the_set'])
-        # TODO Verify that the initial image has been updated
+        self.assertEqual(g1.gameimage_set.get(year=1901).image, self.set2.initial_image)
+        # Cleanup
+        g1.the_set = self.set1
+        g1.save(update_fields=['the_set'])
+
+    def test_game_save_update_fields(self):
+        g1 = Game.objects.first()
+        g1.notes = 'Table by the window'
+        with CaptureQueriesContext(connection) as queries:
+            g1.save(update_fields=['notes'])
+        # The initial state shouldn't be touched
+        for q in queries:
+            for table in ['centrecount', 'supplycentreownership', 'gameimage']:
+                self.assertNotIn(f'tournament_{table}', q['sql'])
+        # Cleanup
+        g1.notes = ''
+        g1.save(update_fields=['notes'])
+
+    def test_game_bulk_create_games(self):
+        g1 = Game.objects.first()
+        t = Tournament.objects.get(name='t1')
+        r = t.round_numbered(4)
+        games = [Game(name=f'bulk{n}',
+                      started_at=g1.started_at + HOURS_8,
+                      the_round=r,
+                      the_set=g1.the_set) for n in range(3)]
+        games = Game.objects.bulk_create_games(games)
+        for g in games:
+            self.assertIsNotNone(g.pk)
+            self.assertEqual(g.gameimage_set.count(), 1)
+            self.assertEqual(g.centrecount_set.count(), 7)
+            self.assertEqual(g.supplycentreownership_set.count(), 22)
+        r.refresh_from_db()
+        self.assertFalse(r.is_finished)
+        # Cleanup
+        for g in games:
+            g.delete()
+
+    def test_game_bulk_create_games_signals(self):
+        g1 = Game.objects.first()
+        r = Tournament.objects.get(name='t1').round_numbered(4)
+        games = [Game(name=f'bulk{n}',
+                      started_at=g1.started_at + HOURS_8,
+                      the_round=r,
+                      the_set=g1.the_set) for n in range(2)]
+        handler = MagicMock()
+        post_save.connect(handler, sender=Game)
+        try:
+            games = Game.objects.bulk_create_games(games)
+        finally:
+            post_save.disconnect(handler, sender=Game)
+        self.assertEqual([c.kwargs['instance'] for c in handler.call_args_list], games)
+        self.assertTrue(all(c.kwargs['created'] for c in handler.call_args_list))
+        # Cleanup
+        for g in games:
+            g.delete()
+
+    def test_gameplayer_bulk_create_gameplayers(self):
+        g1 = Game.objects.first()
+        r = Tournament.objects.get(name='t1').round_numbered(4)
+        g = Game.objects.create(name='bulkgps',
+                                started_at=g1.started_at + HOURS_8,
+                                the_round=r,
+                                the_set=g1.the_set)
+        players = [tp.player for tp in r.tournament.tournamentplayer_set.all()[:3]]
+        handler = MagicMock()
+        post_save.connect(handler, sender=GamePlayer)
+        try:
+            with self.assertNumQueries(1):
+                gps = GamePlayer.objects.bulk_create_gameplayers([GamePlayer(player=p, game=g)
+                                                                  for p in players])
+        finally:
+            post_save.disconnect(handler, sender=GamePlayer)
+        self.assertEqual(g.gameplayer_set.count(), 3)
+        self.assertEqual([c.kwargs['instance'] for c in handler.call_args_list], gps)
+        # Cleanup
+        g.delete()
+
+    def test_game_bulk_create_games_queries(self):
+        g1 = Game.objects.first()
+        t = Tournament.objects.get(name='t1')
+        r = t.round_numbered(4)
+
+        def bulk_create(count):
+            games = [Game(name=f'bulk{n}',
+                          started_at=g1.started_at + HOURS_8,
+                          the_round=r,
+                          the_set=g1.the_set) for n in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                games = Game.objects.bulk_create_games(games)
+            for g in games:
+                g.delete()
+            return len(queries)
+
+        # The number of queries shouldn't depend on the number of Games
+        self.assertEqual(bulk_create(1), bulk_create(5))
 
     @tag('slow')
     def test_game_save_end_of_game(self):
@@ -10271,6 +10751,9 @@ class GamePlayerTests(TestCase):
         gp_low_dots = GamePlayer.objects.create(player=self.p1, game=g1, power=self.austria, score=10)
         CentreCount.objects.create(power=self.austria, game=g1, year=1901, count=5)
         CentreCount.objects.create(power=self.austria, game=g2, year=1901, count=7)
+        # The scores are set directly, so just store the supply centre counts
+        g1.update_gameplayer_sc_counts()
+        g2.update_gameplayer_sc_counts()
 
         self.assertIs(False, gp_low_dots.is_best_country())
         self.assertIs(True, gp_high_dots.is_best_country())
@@ -10887,3 +11370,132 @@ class CentreCountTests(TestCase):
         sc = CentreCount.objects.first()
         # TODO Validate result
         str(sc)
+
+
+class DataVersionTests(TestCase):
+    fixtures = ['game_sets.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.t1 = Tournament.objects.create(name='t1',
+                                           start_date=today,
+                                           end_date=today + HOURS_24,
+                                           round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                           tournament_scoring_system=T_SCORING_SYSTEMS[0].name,
+                                           draw_secrecy=DrawSecrecy.SECRET)
+        cls.r1 = Round.objects.create(tournament=cls.t1,
+                                      scoring_system=G_SCORING_SYSTEMS[0].name,
+                                      dias=True,
+                                      start=datetime.combine(cls.t1.start_date,
+                                                             time(hour=8, tzinfo=datetime_timezone.utc)))
+        cls.g1 = Game.objects.create(name='Game1',
+                                     started_at=cls.r1.start,
+                                     the_round=cls.r1,
+                                     the_set=GameSet.objects.first())
+        cls.g2 = Game.objects.create(name='Game2',
+                                     started_at=cls.r1.start,
+                                     the_round=cls.r1,
+                                     the_set=GameSet.objects.first())
+
+    def test_tournament_version_for_tournament(self):
+        v = TournamentVersion.for_tournament(self.t1.pk)
+        self.assertEqual(v.tournament, self.t1)
+        self.assertEqual(v.version, 0)
+        self.assertEqual(TournamentVersion.for_tournament(self.t1.pk), v)
+        self.assertIsNone(TournamentVersion.for_tournament(self.t1.pk + 1))
+
+    def test_game_version_for_game(self):
+        v = GameVersion.for_game(self.t1.pk, self.g1.name)
+        self.assertEqual(v.game, self.g1)
+        self.assertEqual(v.version, 0)
+        self.assertEqual(GameVersion.for_game(self.t1.pk, self.g1.name), v)
+        self.assertIsNone(GameVersion.for_game(self.t1.pk, 'Nonexistent'))
+        self.assertIsNone(GameVersion.for_game(self.t1.pk + 1, self.g1.name))
+
+    def test_versions_increased_once_per_transaction(self):
+        tv = TournamentVersion.for_tournament(self.t1.pk)
+        gv1 = GameVersion.for_game(self.t1.pk, self.g1.name)
+        gv2 = GameVersion.for_game(self.t1.pk, self.g2.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            for p in GreatPower.objects.all():
+                CentreCount.objects.create(game=self.g1, power=p, year=1901, count=p.starting_centres)
+        for v in [tv, gv1, gv2]:
+            v.refresh_from_db()
+        self.assertEqual(tv.version, 1)
+        self.assertEqual(gv1.version, 1)
+        # Other Games are unaffected
+        self.assertEqual(gv2.version, 0)
+        # Clean up
+        self.g1.centrecount_set.filter(year=1901).delete()
+
+    def test_game_change_increases_tournament_version(self):
+        # SupplyCentreOwnership only identifies the Game
+        tv = TournamentVersion.for_tournament(self.t1.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            sco = SupplyCentreOwnership.objects.create(game=self.g1,
+                                                       year=1901,
+                                                       sc=SupplyCentre.objects.get(name='Belgium'),
+                                                       owner=GreatPower.objects.get(abbreviation='F'))
+        tv.refresh_from_db()
+        self.assertEqual(tv.version, 1)
+        # Clean up
+        sco.delete()
+
+    def test_versions_not_increased_before_commit(self):
+        tv = TournamentVersion.for_tournament(self.t1.pk)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            tp = TournamentPlayer.objects.create(tournament=self.t1,
+                                                 player=Player.objects.create(first_name='Angela',
+                                                                              last_name='Ampersand'))
+        self.assertTrue(callbacks)
+        tv.refresh_from_db()
+        self.assertEqual(tv.version, 0)
+        # Clean up
+        tp.player.delete()
+
+    def test_versions_increased_by_player_change(self):
+        tp = TournamentPlayer.objects.create(tournament=self.t1,
+                                             player=Player.objects.create(first_name='Angela',
+                                                                          last_name='Ampersand'))
+        tv = TournamentVersion.for_tournament(self.t1.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            tp.player.first_name = 'Angelina'
+            tp.player.save()
+        tv.refresh_from_db()
+        self.assertEqual(tv.version, 1)
+        # Clean up
+        tp.player.delete()
+
+    def test_versions_increased_by_managers_change(self):
+        tv = TournamentVersion.for_tournament(self.t1.pk)
+        u = User.objects.create_user(username='manager', password='pw')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.t1.managers.add(u)
+        tv.refresh_from_db()
+        self.assertEqual(tv.version, 1)
+        # Clean up
+        u.delete()
+
+    def test_gameplayer_change_doesnt_load_round(self):
+        gp = GamePlayer.objects.create(game=self.g1,
+                                       player=Player.objects.create(first_name='Angela',
+                                                                    last_name='Ampersand'))
+        gp = GamePlayer.objects.get(pk=gp.pk)
+        with self.captureOnCommitCallbacks(execute=False):
+            with self.assertNumQueries(1):
+                gp.save(update_fields=['after_action_report'])
+        # Clean up
+        gp.player.delete()
+
+    def test_versions_increased_by_award(self):
+        tp = TournamentPlayer.objects.create(tournament=self.t1,
+                                             player=Player.objects.create(first_name='Angela',
+                                                                          last_name='Ampersand'))
+        tv = TournamentVersion.for_tournament(self.t1.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            tp.awards.add(Award.objects.create(name='Best Hat', description='Best hat'))
+        tv.refresh_from_db()
+        self.assertEqual(tv.version, 1)
+        # Clean up
+        tp.player.delete()
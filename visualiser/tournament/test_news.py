@@ -43,6 +43,12 @@ class NewsTests(TestCase):
 
     @classmethod
     def setUpTestData(cls):
+        # Update the GamePlayers' supply centre counts, as when the data is committed
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls._create_test_data()
+
+    @classmethod
+    def _create_test_data(cls):
         # TODO This was copied from test_models. A lot likely isn't needed here.
         cls.set1 = GameSet.objects.get(name='Avalon Hill')
         cls.set2 = GameSet.objects.get(name='Gibsons')
@@ -552,12 +558,12 @@ class NewsTests(TestCase):
         self.assertIn('5 non-neutral centres changed hands.', res)
         self.assertIn('Michelle Nobody (A) shrank from 3 to 0 centres.', res)
         self.assertIn('Michelle Nobody (A) was eliminated in 1901.', res)
-        self.assertIn('Michelle Nobody (A) took no centres and lost Vie (to I), Tri (to I), Bud (to R).', res)
+        self.assertIn('Michelle Nobody (A) took no centres and lost Bud (to R), Tri (to I), Vie (to I).', res)
         self.assertIn('Iris Jackson (F) grew from 3 to 6 centres.', res)
-        self.assertIn('Iris Jackson (F) took Por (neutral), Mun (from G), Spa (neutral) and lost no centres.', res)
+        self.assertIn('Iris Jackson (F) took Mun (from G), Por (neutral), Spa (neutral) and lost no centres.', res)
         self.assertIn('George Hotel (G) took Den (neutral), Hol (neutral) and lost Ber (to R), Mun (to F).', res)
         self.assertIn('Ethel Frankenstein (I) grew from 3 to 6 centres.', res)
-        self.assertIn('Ethel Frankenstein (I) took Gre (neutral), Vie (from A), Tri (from A) and lost no centres.', res)
+        self.assertIn('Ethel Frankenstein (I) took Gre (neutral), Tri (from A), Vie (from A) and lost no centres.', res)
         self.assertIn('Charles Dog (R) grew from 4 to 6 centres.', res)
         # Cleanup
         g.supplycentreownership_set.filter(year=1901).delete()
@@ -0,0 +1,55 @@
+# Diplomacy Tournament Visualiser
+# Copyright (C) 2026 Chris Brand
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from tournament.models import (R_SCORING_SYSTEMS, DrawSecrecy,
+                               InvalidScoringSystem, Tournament)
+
+
+class RescoreTournamentCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.t = Tournament.objects.create(name='t1',
+                                          start_date=today,
+                                          end_date=today + timedelta(hours=24),
+                                          round_scoring_system=R_SCORING_SYSTEMS[0].name,
+                                          tournament_scoring_system='Sum all round scores',
+                                          draw_secrecy=DrawSecrecy.SECRET)
+
+    def test_rescore_tournament(self):
+        out = StringIO()
+        with patch.object(Tournament, 'rescore') as mock_rescore:
+            call_command('rescore_tournament', str(self.t.pk), stdout=out)
+        mock_rescore.assert_called_once()
+        self.assertIn(str(self.t), out.getvalue())
+
+    def test_rescore_tournament_invalid_id(self):
+        with self.assertRaises(CommandError):
+            call_command('rescore_tournament', str(self.t.pk + 1))
+
+    def test_rescore_tournament_invalid_scoring_system(self):
+        with patch.object(Tournament, 'rescore', side_effect=InvalidScoringSystem):
+            with self.assertRaises(CommandError):
+                call_command('rescore_tournament', str(self.t.pk))
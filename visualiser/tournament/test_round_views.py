@@ -16,19 +16,24 @@
 
 from datetime import date, datetime, time, timedelta
 from datetime import timezone as datetime_timezone
+from unittest.mock import patch
 from urllib.parse import urlencode
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core import mail
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
 from tournament.diplomacy import GameSet, GreatPower
 from tournament.game_scoring import G_SCORING_SYSTEMS
+from tournament import round_views
 from tournament.models import (NO_SCORING_SYSTEM_STR, R_SCORING_SYSTEMS,
                                DrawSecrecy, Formats, Game, GamePlayer, Pool,
                                PowerAssignMethods, Round, RoundPlayer,
-                               SeederBias, Team, Tournament, TournamentPlayer)
+                               SeederBias, SeedingJob, SeedingStatus, Team,
+                               Tournament, TournamentPlayer)
 from tournament.players import Player
 
 
@@ -1504,6 +1509,200 @@ class RoundViewTests(TestCase):
         # Clean up
         g.delete()
 
+    def test_seed_games_job_consumed(self):
+        """The seeding should be used to create the Games, then discarded"""
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeded_games.html')
+        self.assertEqual(self.r32.game_set.count(), 1)
+        self.assertFalse(SeedingJob.objects.filter(the_round=self.r32).exists())
+        # Clean up
+        self.r32.game_set.all().delete()
+
+    def test_seed_games_finished_job(self):
+        """A seeding that finished in the background should be used"""
+        players = [self.p1, self.p3, self.p4, self.p5, self.p6, self.p7, self.p9]
+        tps = [self.t3.tournamentplayer_set.get(player=p) for p in players]
+        SeedingJob.objects.create(the_round=self.r32,
+                                  status=SeedingStatus.FINISHED,
+                                  best_fitness=42,
+                                  result=[{'pool': None,
+                                           'players': [[tp.pk, None] for tp in tps],
+                                           'issues': ['Test issue']}])
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeded_games.html')
+        self.assertContains(response, 'Test issue')
+        g = self.r32.game_set.get()
+        self.assertEqual(set(gp.player for gp in g.gameplayer_set.all()), set(players))
+        self.assertFalse(SeedingJob.objects.filter(the_round=self.r32).exists())
+        # Clean up
+        g.delete()
+
+    def test_seed_games_job_used_once(self):
+        """A finished seeding should only be used to create Games once"""
+        players = [self.p1, self.p3, self.p4, self.p5, self.p6, self.p7, self.p9]
+        tps = [self.t3.tournamentplayer_set.get(player=p) for p in players]
+        job = SeedingJob.objects.create(the_round=self.r32,
+                                        status=SeedingStatus.FINISHED,
+                                        result=[{'pool': None,
+                                                 'players': [[tp.pk, None] for tp in tps],
+                                                 'issues': []}])
+        data = round_views._create_seeded_games(self.t3, self.r32, job)
+        self.assertEqual(len(data), 1)
+        g = self.r32.game_set.get()
+        # As if a second request read the SeedingJob before the first used it
+        self.assertIsNone(round_views._create_seeded_games(self.t3, self.r32, job))
+        self.assertEqual(self.r32.game_set.get(), g)
+        self.assertEqual(g.gameplayer_set.count(), 7)
+        # Clean up
+        g.delete()
+
+    def test_seed_games_running_job(self):
+        """While seeding is in progress, show its progress"""
+        job = SeedingJob.objects.create(the_round=self.r32, best_fitness=123)
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeding_progress.html')
+        self.assertContains(response, '123')
+        self.assertContains(response, reverse('seed_games_accept', args=(self.t3.pk, 2)))
+        # The page polls for progress, so only refreshes itself without JavaScript
+        self.assertContains(response, '<noscript><meta http-equiv="refresh"')
+        self.assertContains(response, 'http-equiv="refresh"', count=1)
+        self.assertEqual(self.r32.game_set.count(), 0)
+        # Clean up
+        job.delete()
+
+    def test_seed_games_failed_job(self):
+        """If seeding failed, say so, and try again next time"""
+        SeedingJob.objects.create(the_round=self.r32,
+                                  status=SeedingStatus.FAILED,
+                                  error='Test failure')
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeding_progress.html')
+        self.assertContains(response, 'Test failure')
+        self.assertEqual(self.r32.game_set.count(), 0)
+        self.assertFalse(SeedingJob.objects.filter(the_round=self.r32).exists())
+
+    def test_seed_games_stale_job(self):
+        """A seeding whose worker has stopped reporting progress should be treated as failed"""
+        job = SeedingJob.objects.create(the_round=self.r32, best_fitness=123)
+        job.heartbeat -= timedelta(seconds=settings.SEEDING_JOB_TIMEOUT + 1)
+        job.save(update_fields=['heartbeat'])
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games_status',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertEqual(response.json()['status'], SeedingStatus.FAILED)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeding_progress.html')
+        self.assertContains(response, 'Seeding stopped responding')
+        # Seeding will be started again next time
+        self.assertFalse(SeedingJob.objects.filter(the_round=self.r32).exists())
+
+    def test_seeding_job_fail_if_stale(self):
+        job = SeedingJob.objects.create(the_round=self.r32)
+        self.assertIs(False, job.fail_if_stale())
+        job.heartbeat -= timedelta(seconds=settings.SEEDING_JOB_TIMEOUT + 1)
+        job.save(update_fields=['heartbeat'])
+        # Progress reported since the job was read
+        SeedingJob.objects.filter(pk=job.pk).update(heartbeat=timezone.now())
+        self.assertIs(False, job.fail_if_stale())
+        self.assertEqual(job.status, SeedingStatus.RUNNING)
+        SeedingJob.objects.filter(pk=job.pk).update(heartbeat=job.heartbeat)
+        self.assertIs(True, job.fail_if_stale())
+        self.assertEqual(job.status, SeedingStatus.FAILED)
+        # Clean up
+        job.delete()
+
+    @override_settings(SEEDING_JOB_WORKERS=1)
+    def test_seed_games_in_background(self):
+        """With SEEDING_JOB_WORKERS set, seeding should be passed to the thread pool"""
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        with patch('tournament.round_views._seeding_thread_pool') as mock_pool:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get(reverse('seed_games',
+                                                   args=(self.t3.pk, 2)),
+                                           secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeding_progress.html')
+        job = SeedingJob.objects.get(the_round=self.r32)
+        mock_pool.return_value.submit.assert_called_once_with(round_views._run_seeding_job_in_thread, job.pk)
+        # Now do what the thread would do
+        round_views._run_seeding_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, SeedingStatus.FINISHED)
+        self.assertIsNotNone(job.best_fitness)
+        self.assertEqual(len(job.result), 1)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeded_games.html')
+        self.assertEqual(self.r32.game_set.count(), 1)
+        # Clean up
+        self.r32.game_set.all().delete()
+
+    def test_seed_games_job_discarded(self):
+        """Changing who is playing should discard any seeding"""
+        SeedingJob.objects.create(the_round=self.r32)
+        rp = self.r32.roundplayer_set.get(player=self.p9)
+        rp.game_count = 0
+        rp.save(update_fields=['game_count'])
+        self.assertFalse(SeedingJob.objects.filter(the_round=self.r32).exists())
+        # Clean up
+        rp.game_count = 1
+        rp.save(update_fields=['game_count'])
+
+    def test_seed_games_status_not_logged_in(self):
+        response = self.client.get(reverse('seed_games_status',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertEqual(response.status_code, 302)
+
+    def test_seed_games_status_no_job(self):
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games_status',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertEqual(response.status_code, 404)
+
+    def test_seed_games_status(self):
+        job = SeedingJob.objects.create(the_round=self.r32, best_fitness=42)
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games_status',
+                                           args=(self.t3.pk, 2)),
+                                   secure=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['status'], SeedingStatus.RUNNING)
+        self.assertEqual(data['best_fitness'], 42)
+        self.assertIs(data['accept_requested'], False)
+        # Clean up
+        job.delete()
+
+    def test_seed_games_accept(self):
+        job = SeedingJob.objects.create(the_round=self.r32)
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.post(reverse('seed_games_accept',
+                                            args=(self.t3.pk, 2)),
+                                    secure=True)
+        self.assertRedirects(response, reverse('seed_games', args=(self.t3.pk, 2)),
+                             fetch_redirect_response=False)
+        job.refresh_from_db()
+        self.assertIs(job.accept_requested, True)
+        # Clean up
+        job.delete()
+
     def test_seed_games_auto_good_number_with_doublers(self):
         """13 players, one playing two games, AUTO power assignment"""
         self.assertEqual(self.r11.game_set.count(), 0)
@@ -1531,6 +1730,29 @@ class RoundViewTests(TestCase):
         self.rp112.game_count = 0
         self.rp112.save(update_fields=['game_count'])
 
+    @override_settings(SEEDER_METHOD='ANNEAL', SEEDER_ITERATIONS=1000)
+    def test_seed_games_anneal_with_doublers(self):
+        """13 players, one playing two games, seeded by simulated annealing"""
+        self.assertEqual(self.r11.game_set.count(), 0)
+        # Tweak initial data for this test
+        self.rp112.game_count = 1
+        self.rp112.save(update_fields=['game_count'])
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(reverse('seed_games',
+                                           args=(self.t1.pk, 1)),
+                                   secure=True)
+        self.assertTemplateUsed(response, 'rounds/seeded_games.html')
+        # Two Games should have been created
+        g_qs = self.t1.round_numbered(1).game_set
+        self.assertEqual(g_qs.count(), 2)
+        # with seven GamePlayers
+        for g in g_qs.all():
+            self.assertEqual(g.gameplayer_set.count(), 7)
+        # Clean up
+        g_qs.all().delete()
+        self.rp112.game_count = 0
+        self.rp112.save(update_fields=['game_count'])
+
     def test_seed_games_with_teams(self):
         """14 players, AUTO power assignment"""
         self.assertEqual(self.r11.game_set.count(), 0)
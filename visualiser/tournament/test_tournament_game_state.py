@@ -307,3 +307,26 @@ class TournamentGameStateTests(TestCase):
         tgs = TournamentGameState(g)
         year = tgs.last_full_year()
         self.assertEqual(year, 1907)
+
+    # Queries
+    def test_tgs_no_queries_after_creation(self):
+        t = Tournament.objects.get(name='t1')
+        g = t.round_numbered(1).game_set.get(name='g11')
+        tgs = TournamentGameState(g)
+        with self.assertNumQueries(0):
+            for system in G_SCORING_SYSTEMS:
+                with self.subTest(system=system.name):
+                    system.scores(tgs)
+
+    def test_tgs_prefetched(self):
+        t = Tournament.objects.get(name='t1')
+        g = Game.objects.filter(the_round__tournament=t,
+                                name='g11').prefetch_related('centrecount_set',
+                                                             'drawproposal_set__drawing_powers').get()
+        powers = list(GreatPower.objects.all())
+        with self.assertNumQueries(0):
+            tgs = TournamentGameState(g, powers=powers)
+        self.assertEqual(tgs.dot_count(self.germany), 18)
+        self.assertEqual(tgs.dot_count(self.germany, year=1905), 13)
+        self.assertEqual(tgs.soloer(), self.germany)
+        self.assertEqual(tgs.year_eliminated(self.austria), 1904)
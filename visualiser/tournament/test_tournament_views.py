@@ -18,6 +18,7 @@ import uuid
 import warnings
 from datetime import date, datetime, time, timedelta
 from datetime import timezone as datetime_timezone
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 from django.contrib.auth.models import Permission, User
@@ -339,6 +340,9 @@ class TournamentViewTests(TestCase):
         CentreCount.objects.create(power=cls.italy, game=g42, year=1903, count=4)
         CentreCount.objects.create(power=cls.russia, game=g42, year=1903, count=19)
         CentreCount.objects.create(power=cls.turkey, game=g42, year=1903, count=1)
+        # The Games aren't scored, so just store the supply centre counts
+        for g in Game.objects.all():
+            g.update_gameplayer_sc_counts()
 
         # Hopefully this isn't the pk for any Tournament
         cls.INVALID_T_PK = 99999
@@ -688,6 +692,63 @@ class TournamentViewTests(TestCase):
         self.assertNotContains(response, 'Handicap')
         self.assertTemplateUsed(response, 'tournaments/scores.html')
 
+    def test_scores_conditional_get(self):
+        """Scores page shouldn't be regenerated if nothing has changed"""
+        url = reverse('tournament_scores', args=(self.t1.pk,))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag = response['ETag']
+        with patch('tournament.models.Tournament.positions_and_scores') as mock_pas:
+            response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        mock_pas.assert_not_called()
+        # A different user may see a different page
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.client.logout()
+        # Any change to the Tournament's data should change the page
+        tp = self.t1.tournamentplayer_set.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            tp.save()
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_get_permissions(self):
+        """Pages should be regenerated when the user's permissions change"""
+        url = reverse('tournament_scores', args=(self.t1.pk,))
+        self.client.login(username=self.USERNAME1, password=self.PWORD1)
+        response = self.client.get(url, secure=True)
+        etag = response['ETag']
+        self.u1.user_permissions.add(Permission.objects.get(name='Can change round'))
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        # Clean up
+        self.client.logout()
+        self.u1.user_permissions.clear()
+
+    def test_conditional_get_game_urls(self):
+        """Pages should be regenerated once game URLs can be shown"""
+        url = reverse('tournament_detail', args=(self.t1.pk,))
+        self.t1.delay_game_url_publication = True
+        with self.captureOnCommitCallbacks(execute=True):
+            self.t1.save(update_fields=['delay_game_url_publication'])
+        response = self.client.get(url, secure=True)
+        etag = response['ETag']
+        # Nothing in the database changes when the delay expires
+        with patch('tournament.models.date') as mock_date:
+            mock_date.today.return_value = self.t1.end_date + timedelta(days=2)
+            response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        # Clean up
+        self.t1.delay_game_url_publication = False
+        self.t1.save(update_fields=['delay_game_url_publication'])
+
     def test_scores_old(self):
         """Scores page for an in-progress Tournament"""
         self.assertIs(True, self.t1.tournament_scoring_system_obj().uses_round_scores)
@@ -2435,6 +2496,29 @@ class TournamentViewTests(TestCase):
         self.t4.round_scoring_system = rss
         self.t4.save()
 
+    def test_api_conditional_get(self):
+        url = reverse('api_tournament', args=(1, self.t4.pk,))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with patch('tournament.models.Tournament.positions_and_scores') as mock_pas:
+            response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        mock_pas.assert_not_called()
+        # Changes to Game data should change the result
+        g = self.t4.round_numbered(1).game_set.first()
+        gp = g.gameplayer_set.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            gp.save()
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_get_unknown_tournament(self):
+        response = self.client.get(reverse('tournament_scores', args=(self.t4.pk + 100,)),
+                                   secure=True,
+                                   HTTP_IF_NONE_MATCH='"0-0-en"')
+        self.assertEqual(response.status_code, 404)
+
     def test_api_invalid_version(self):
         response = self.client.get(reverse('api_tournament', args=(7, self.t4.pk,)),
                                    secure=True)
@@ -18,29 +18,55 @@
 This module contains the interface between the game scoring code and the tournament database.
 """
 
-from tournament.diplomacy import FIRST_YEAR, WINNING_SCS, GreatPower
+from operator import itemgetter
+
+from tournament.diplomacy import FIRST_YEAR, WINNING_SCS, reference_data
 from tournament.game_scoring import DotCountUnknown, GameState, InvalidYear
 
 
 class TournamentGameState(GameState):
     """
     Abstraction of a single Game in a Tournament, for scoring purposes.
+
+    All the CentreCounts and any passed DrawProposal for the Game are read
+    when the object is created, so that scoring doesn't need any further
+    database queries. If the Game was retrieved with
+    prefetch_related('centrecount_set', 'drawproposal_set__drawing_powers'),
+    no queries are needed at all.
     """
 
-    def __init__(self, game, year=None):
+    def __init__(self, game, year=None, powers=None):
         """Create the object corresponding to the specific Game.
 
         If year is provided, the state is calculated as of that year.
         Otherwise, the current/final state is used.
+        powers is an optional list of all the GreatPowers.
         """
         self.game = game
-        self.scs = game.centrecount_set.order_by()
-        self.draw = game.passed_draw()
+        if powers is None:
+            powers = list(reference_data.great_powers())
+        self.powers = powers
+        powers_by_id = {p.id: p for p in powers}
+        # Dict, keyed by year, of dicts, keyed by power, of centre counts
+        self.sc_counts = {}
+        for cc in game.centrecount_set.all():
+            self.sc_counts.setdefault(cc.year, {})[powers_by_id[cc.power_id]] = cc.count
+        self.draw = None
+        for dp in game.drawproposal_set.all():
+            if dp.passed:
+                self.draw = dp
+                break
+        if self.draw is not None:
+            self.draw_powers = self.draw.powers()
         if year is None:
-            self.final_year = self.scs.order_by('-year')[0].year
+            self.final_year = max(self.sc_counts.keys())
         else:
             self.final_year = year
-        self.final_year_scs = self.scs.filter(year=self.final_year).order_by('-count')
+        # List of (power, count) 2-tuples for the final year, highest count first
+        final_counts = self.sc_counts.get(self.final_year, {})
+        self.final_year_scs = sorted([(p, final_counts[p]) for p in powers if p in final_counts],
+                                     key=itemgetter(1),
+                                     reverse=True)
 
     def _validate_year(self, year):
         """Check that the year is reasonable. Raise InvalidYear if it isn't."""
@@ -50,23 +76,22 @@ class TournamentGameState(GameState):
 
     def all_powers(self):
         """Returns an iterable of all the powers."""
-        return GreatPower.objects.all()
+        return self.powers
 
     def soloer(self):
         """Returns the power that soloed the game or was conceded to, or None."""
-        if self.final_year_scs[0].count >= WINNING_SCS:
-            return self.final_year_scs[0].power
+        if self.final_year_scs[0][1] >= WINNING_SCS:
+            return self.final_year_scs[0][0]
         if self.draw is not None:
-            draw_powers = self.draw.powers()
-            if len(draw_powers) == 1:
-                return draw_powers[0]
+            if len(self.draw_powers) == 1:
+                return self.draw_powers[0]
         return None
 
     def survivors(self):
         """
         Returns an iterable of the subset of powers that are still alive.
         """
-        return [sc.power for sc in self.final_year_scs.filter(count__gt=0)]
+        return [p for p, count in self.final_year_scs if count > 0]
 
     def powers_in_draw(self):
         """
@@ -76,16 +101,15 @@ class TournamentGameState(GameState):
         If there is no passed draw vote or concession, returns survivors().
         """
         if self.draw is not None:
-            return self.draw.powers()
+            return self.draw_powers
         return self.survivors()
 
     def solo_year(self):
         """Returns the year in which a solo occurred, or None."""
-        top = self.final_year_scs[0]
-        if top.count >= WINNING_SCS:
-            return top.year
+        if self.final_year_scs[0][1] >= WINNING_SCS:
+            return self.final_year
         if self.draw is not None:
-            if len(self.draw.powers()) == 1:
+            if len(self.draw_powers) == 1:
                 return self.draw.year
         return None
 
@@ -93,29 +117,31 @@ class TournamentGameState(GameState):
         """
         Returns the number of powers that own the specified number of supply centres.
         """
-        return self.final_year_scs.filter(count=centres).count()
+        return len([p for p, count in self.final_year_scs if count == centres])
 
     def highest_dot_count(self):
         """Returns the number of supply centres owned by the strongest power(s)."""
-        return self.final_year_scs[0].count
+        return self.final_year_scs[0][1]
 
     def dot_count(self, power, year=None):
         """Returns the number of supply centres owned by the specified power."""
-        if year is not None:
+        if year is None:
+            year = self.final_year
+        else:
             self._validate_year(year)
-            try:
-                return self.scs.filter(year=year).get(power=power).count
-            # We can't import CentreCount here
-            except BaseException as e:
-                raise DotCountUnknown from e
-        return self.final_year_scs.get(power=power).count
+        try:
+            return self.sc_counts[year][power]
+        except KeyError as e:
+            raise DotCountUnknown(f'{power} in {year}') from e
 
     def year_eliminated(self, power):
         """Returns the year in which the specified power was eliminated, or None."""
-        try:
-            return self.scs.filter(power=power, count=0, year__lte=self.final_year).order_by('year').first().year
-        except AttributeError:
-            return None
+        for year in sorted(self.sc_counts.keys()):
+            if year > self.final_year:
+                break
+            if self.sc_counts[year].get(power) == 0:
+                return year
+        return None
 
     def last_full_year(self):
         """Returns the last year for which SCs have been entered."""
@@ -19,13 +19,12 @@ Tournament Views for the Diplomacy Tournament Visualiser.
 """
 
 import csv
-import io
+import zlib
 from io import StringIO
 
-import matplotlib.figure as figure
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
+from asgiref.sync import sync_to_async
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
 from django.core.exceptions import ValidationError
@@ -34,20 +33,25 @@ from django.db import IntegrityError, transaction
 from django.forms import modelformset_factory
 from django.forms.formsets import formset_factory
 from django.http import (Http404, HttpResponse, HttpResponseRedirect,
-                         JsonResponse)
+                         JsonResponse, StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
-from tournament.diplomacy import GameSet, GreatPower
+from tournament import graphs, live
+from tournament.diplomacy import reference_data
 from tournament.email import send_roll_call_emails
 from tournament.forms import (AwardForm, BaseAwardsFormset,
                               BasePlayerRoundScoreFormset,
                               BaseTeamsFormset, EnableCheckInForm,
                               HandicapForm, PlayerRoundScoreForm, PrefsForm,
                               SeederBiasForm, TeamForm)
-from tournament.models import (Award, GamePlayer, InvalidPreferenceList, RoundPlayer,
-                               SeederBias, Team, Tournament, TournamentPlayer)
+from tournament.models import (Award, GamePlayer, GameVersion, InvalidPreferenceList,
+                               RoundPlayer, SeederBias, Team, Tournament,
+                               TournamentPlayer, TournamentVersion)
 from tournament.news import news
 
 
@@ -104,8 +108,83 @@ def get_modifiable_tournament_or_404(pk, user):
     raise Http404
 
 
+def add_live_url(context, redirect_url_name, refresh_url_name, tournament_id, game_name=None):
+    """
+    Have a self-refreshing page reload when its Tournament or Game changes, rather than on a timer.
+
+    Does nothing if live updates are disabled, or if the page refreshes to a different page
+    (redirect_url_name is not refresh_url_name).
+    """
+    if (not settings.LIVE_UPDATES) or (redirect_url_name != refresh_url_name):
+        return
+    if game_name is None:
+        context['live_url'] = reverse('tournament_events', args=(tournament_id,))
+    else:
+        context['live_url'] = reverse('game_events', args=(tournament_id, game_name))
+
+
+def event_stream(channel):
+    """Response with a stream of server-sent events for the specified live channel"""
+    response = StreamingHttpResponse(live.events(channel), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the events
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _permissions_key(user):
+    """Short string that changes whenever the user's permissions do"""
+    if user.is_superuser:
+        return 'su'
+    perms = ','.join(sorted(user.get_all_permissions()))
+    return format(zlib.crc32(perms.encode()), 'x')
+
+
+def _etag(request, tournament_version, *versions):
+    """
+    ETag for a page generated from data with the specified TournamentVersion and GameVersions.
+
+    Pages also depend on who is looking at them and what they're allowed to do,
+    in which language, and on whether game URLs are shown yet, which depends on the date.
+    Returns None if any version is None.
+    """
+    versions = (tournament_version,) + versions
+    if None in versions:
+        return None
+    version_str = '.'.join(str(v.version) for v in versions)
+    urls = int(tournament_version.tournament.show_game_urls())
+    user = request.user
+    return f'"{version_str}-{urls}-{user.pk or 0}-{_permissions_key(user)}-{get_language()}"'
+
+
+def tournament_etag(request, tournament_id, *args, **kwargs):
+    """ETag for a page that shows data from the specified Tournament"""
+    return _etag(request, TournamentVersion.for_tournament(tournament_id))
+
+
+def game_etag(request, tournament_id, game_name, *args, **kwargs):
+    """ETag for a page that shows data from the specified Game and its Tournament"""
+    return _etag(request,
+                 TournamentVersion.for_tournament(tournament_id),
+                 GameVersion.for_game(tournament_id, game_name))
+
+
+def conditional_view(etag_func):
+    """
+    Decorator for read-only views, to answer conditional GETs when the data hasn't changed.
+
+    etag_func is called with the view's arguments, and should return the ETag
+    of the page, without doing the work of generating it.
+    Browsers are told to check every time, so that changes are seen straight away.
+    """
+    def decorator(view):
+        return cache_control(no_cache=True)(condition(etag_func=etag_func)(view))
+    return decorator
+
+
 # Tournament views
 
+@conditional_view(tournament_etag)
 def tournament_simple(request, tournament_id, template, context={}):
     """Just render the specified template with the tournament"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
@@ -113,6 +192,7 @@ def tournament_simple(request, tournament_id, template, context={}):
     return render(request, f'tournaments/{template}.html', context)
 
 
+@conditional_view(tournament_etag)
 def tournament_scores(request,
                       tournament_id,
                       refresh=False,
@@ -125,8 +205,7 @@ def tournament_scores(request,
     tps = list(t.tournamentplayer_set.order_by('-score',
                                                'player__last_name',
                                                'player__first_name').select_related('player'))
-    # Round number is start-time order, so preserve that explicitly.
-    rds = list(t.round_set.order_by('start'))
+    rds = t.ordered_rounds()
     if t.show_current_scores:
         # Grab the tournament scores and positions, all "if it ended now"
         t_positions_and_scores = t.positions_and_scores()
@@ -134,7 +213,7 @@ def tournament_scores(request,
         # Get the scores after the last finished Round, if any
         finished_round = next((rd for rd in reversed(rds) if rd.is_finished), None)
         if finished_round:
-            t_positions_and_scores = t.positions_and_scores(after_round_num=rds.index(finished_round) + 1)
+            t_positions_and_scores = t.positions_and_scores(after_round_num=finished_round.number())
         else:
             # After Round 0, everyone had a score of zero
             t_positions_and_scores = t.positions_and_scores(after_round_num=0)
@@ -169,6 +248,7 @@ def tournament_scores(request,
         context['refresh'] = True
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name, args=(tournament_id,))
+        add_live_url(context, redirect_url_name, 'tournament_scores_refresh', tournament_id)
     # Display scores either with round scores or game scores, as appropriate
     if t.tournament_scoring_system_obj().uses_round_scores:
         template = 'tournaments/scores.html'
@@ -177,6 +257,7 @@ def tournament_scores(request,
     return render(request, template, context)
 
 
+@conditional_view(tournament_etag)
 def team_scores(request,
                 tournament_id,
                 refresh=False,
@@ -227,50 +308,31 @@ def team_scores(request,
         context['refresh'] = True
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name, args=(tournament_id,))
+        add_live_url(context, redirect_url_name, 'team_scores_refresh', tournament_id)
     return render(request, 'tournaments/team_scores.html', context)
 
 
+@conditional_view(tournament_etag)
 def graph(request, tournament_id):
     """Score graph for the specified tournament, as a PNG image"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
-    with io.BytesIO() as f:
-        # plot the scores
-        fig = figure.Figure()
-        ax = fig.subplots()
-        rounds = t.round_set.all()
-        # Get scores for each round in a suitable format
-        all_scores = {}
-        for tp in t.tournamentplayer_set.order_by('player'):
-            all_scores[tp.player] = []
-        max_score = 0.0
-        for n, r in enumerate(rounds, start=1):
-            if r.show_scores():
-                for p, (rank, score) in t.positions_and_scores(after_round_num=n).items():
-                    all_scores[p].append((n, score))
-                    if rank == 1:
-                        max_score = score
-        # This gives us 40 distinct colors
-        ax.set_prop_cycle('color', plt.get_cmap('tab20b').colors + plt.get_cmap('tab20c').colors)
-        # Add a line for each player
-        for player in all_scores.keys():
-            player_scores = all_scores[player]
-            ax.plot([r for r, s in player_scores],
-                    [s for r, s in player_scores],
-                    label=str(player),
-                    linewidth=2)
-        ax.axis([1, n, 0.0, max_score])
-        # Ticks at whole numbers of rounds
-        ax.xaxis.set_major_locator(ticker.MultipleLocator(1))
-        ax.set_xlabel(_('Round'))
-        ax.set_ylabel(_('Score'))
-        # Place the legend to the right of the graph
-        ax.legend(bbox_to_anchor=(1.04, 1), borderaxespad=0)
-        # Save it, auto-expanding the area to include the legend
-        fig.savefig(f, format='png', bbox_inches="tight")
-        graphic = f.getvalue()
-    return HttpResponse(graphic, content_type="image/png")
+    return HttpResponse(graphs.tournament_graph(t), content_type="image/png")
 
 
+@conditional_view(tournament_etag)
+def graph_data(request, tournament_id):
+    """The data for the score graph for the specified tournament, as JSON, for the browser to draw"""
+    t = get_visible_tournament_or_404(tournament_id, request.user)
+    return HttpResponse(graphs.tournament_graph_json(t), content_type='application/json')
+
+
+async def tournament_events(request, tournament_id):
+    """Server-sent events telling display screens that a tournament has changed"""
+    t = await sync_to_async(get_visible_tournament_or_404)(tournament_id, request.user)
+    return event_stream(live.tournament_channel(t.pk))
+
+
+@conditional_view(tournament_etag)
 def tournament_score_graph(request,
                            tournament_id,
                            refresh=False,
@@ -280,15 +342,18 @@ def tournament_score_graph(request,
     if t.is_finished and (redirect_url_name == 'tournament_score_graph_refresh'):
         # Don't bother refreshing if nothing can change
         refresh = False
-    context = {'tournament': t}
+    context = {'tournament': t,
+               'draw_in_browser': settings.DRAW_GRAPHS_IN_BROWSER}
     if refresh:
         context['refresh'] = True
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name,
                                           args=(tournament_id, ))
+        add_live_url(context, redirect_url_name, 'tournament_score_graph_refresh', tournament_id)
     return render(request, 'tournaments/score_graph.html', context)
 
 
+@conditional_view(tournament_etag)
 def tournament_game_results(request,
                             tournament_id,
                             refresh=False,
@@ -300,7 +365,7 @@ def tournament_game_results(request,
         refresh = False
     tps = list(t.tournamentplayer_set.order_by('player__last_name',
                                                'player__first_name').select_related('player'))
-    rds = list(t.round_set.order_by('start'))
+    rds = t.ordered_rounds()
     rounds = list(range(1, len(rds) + 1))
 
     gp_map = {}
@@ -311,7 +376,8 @@ def tournament_game_results(request,
                                             game__the_round_id__in=round_ids).select_related(
                                                 'game__the_round',
                                                 'power',
-                                                'player').order_by('game')
+                                                'player',
+                                                'best_country_rank').order_by('game')
         for gp in all_gps:
             gp_map.setdefault((gp.player_id, gp.game.the_round_id), []).append(gp)
 
@@ -330,9 +396,11 @@ def tournament_game_results(request,
         context['refresh'] = True
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name, args=(tournament_id,))
+        add_live_url(context, redirect_url_name, 'tournament_game_results_refresh', tournament_id)
     return render(request, 'tournaments/game_results.html', context)
 
 
+@conditional_view(tournament_etag)
 def tournament_best_countries(request,
                               tournament_id,
                               refresh=False,
@@ -360,7 +428,7 @@ def tournament_best_countries(request,
         else:
             gps = t.best_countries(whole_list=True, after_round_num=0)
     # Move players with "best country" awards to the head of their respective list
-    for p in GreatPower.objects.all():
+    for p in reference_data.great_powers():
         # Find the GamePlayers for the Players given this award at this Tournament
         for award in t.awards.filter(power=p):
             gameplayers = []
@@ -380,10 +448,10 @@ def tournament_best_countries(request,
         except ValueError:
             pass
     # We have to just pick a set here. Avalon Hill is most common in North America
-    set_powers = GameSet.objects.get(name='Avalon Hill').setpower_set.order_by('power').select_related('power')
+    set_powers = reference_data.set_powers(reference_data.game_set(name='Avalon Hill'))
     # TODO Sort set_powers alphabetically by translated power.name
     # How many rows do we need?
-    row_count = max((len(l) for l in (gps[power] for power in GreatPower.objects.all())))
+    row_count = max((len(l) for l in (gps[power] for power in reference_data.great_powers())))
     rows = []
     # Add a row at a time, containing the best remaining results for each power
     for i in range(row_count):
@@ -400,6 +468,7 @@ def tournament_best_countries(request,
         context['refresh'] = True
         context['redirect_time'] = REFRESH_TIME
         context['redirect_url'] = reverse(redirect_url_name, args=(tournament_id,))
+        add_live_url(context, redirect_url_name, 'tournament_best_countries_refresh', tournament_id)
     return render(request, 'tournaments/best_countries.html', context)
 
 
@@ -497,10 +566,9 @@ def enter_scores(request, tournament_id):
 def self_check_in_control(request, tournament_id):
     """Provide a form to control self-check-in for each round"""
     t = get_modifiable_tournament_or_404(tournament_id, request.user)
-    round_set = t.round_set.all()
     enable_data = {}
-    for num, r in enumerate(round_set.all(), 1):
-        enable_data[f'round_{num}'] = r.enable_check_in
+    for r in t.ordered_rounds():
+        enable_data[f'round_{r.number()}'] = r.enable_check_in
     form = EnableCheckInForm(request.POST or None,
                              tournament=t,
                              initial=enable_data)
@@ -761,6 +829,7 @@ def enter_handicaps(request, tournament_id):
                    'formset': formset})
 
 
+@conditional_view(tournament_etag)
 def teams(request, tournament_id):
     """Show the registered teams"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
@@ -845,6 +914,7 @@ def enter_teams(request, tournament_id):
                    'formset': formset})
 
 
+@conditional_view(tournament_etag)
 def api(request, tournament_id, version):
     """JSON API to retrieve data"""
     if version != 1:
@@ -885,14 +955,26 @@ def api(request, tournament_id, version):
                        'games': games}
     results = []
     p_and_s = t.positions_and_scores()
+    standings = t.standings()
     for player, res in p_and_s.items():
         entry = {'player_name': str(player),
                  'player_wdr_id': player.wdr_player_id,
                  'ranking': res[0],
                  'score': res[1],
-                 'score_breakdown': []}
+                 'score_breakdown': [],
+                 'standings': []}
         if entry['ranking'] == Tournament.UNRANKED:
             entry['ranking'] = None
+        # Position and tournament score after each round
+        for num, r in enumerate(rds, 1):
+            if (r not in standings) or (player not in standings[r]):
+                continue
+            rank, score = standings[r][player]
+            if rank == Tournament.UNRANKED:
+                rank = None
+            entry['standings'].append({'round': num,
+                                       'ranking': rank,
+                                       'score': score})
         rps = player.roundplayer_set.order_by('player')
         for num, r in enumerate(rds, 1):
             try:
@@ -922,6 +1004,7 @@ def api(request, tournament_id, version):
     return JsonResponse(data)
 
 
+@conditional_view(tournament_etag)
 def round_index(request, tournament_id):
     """Display a list of rounds of a tournament"""
     t = get_visible_tournament_or_404(tournament_id, request.user)
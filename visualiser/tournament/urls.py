@@ -66,6 +66,8 @@ round_patterns = [
     path('get_seven/', round_views.get_seven, name='get_seven'),
     path('scores/', round_views.round_scores, name='round_scores'),
     path('seed_games/', round_views.seed_games, name='seed_games'),
+    path('seed_games/status/', round_views.seed_games_status, name='seed_games_status'),
+    path('seed_games/accept/', round_views.seed_games_accept, name='seed_games_accept'),
     path('create_games/', round_views.create_games, name='create_games'),
     path('create_games/<slug:pool_slug>/', round_views.create_games,
          name='create_games_in_pool'),
@@ -91,10 +93,13 @@ game_patterns = [
          {'refresh': True}, name='game_sc_chart_refresh'),
     # This is just the graph image
     path('graph/', game_views.graph, name='graph_img_scs'),
+    # and the data for the browser to draw it
+    path('graph/data/', game_views.graph_data, name='graph_data_scs'),
     # This is the page showing the graph
     path('sc_graph/', game_views.game_sc_graph, name='game_sc_graph'),
     path('sc_graph_refresh/', game_views.game_sc_graph,
          {'refresh': True}, name='game_sc_graph_refresh'),
+    path('events/', game_views.game_events, name='game_events'),
     path('enter_scs/', game_views.sc_counts, name='enter_scs'),
     path('sc_owners/', game_views.game_sc_owners, name='game_sc_owners'),
     path('sc_owners_refresh/', game_views.game_sc_owners,
@@ -211,11 +216,14 @@ tournament_patterns = [
          {'refresh': True}, name='team_scores_refresh'),
     # This is just the graph image
     path('graph/', tournament_views.graph, name='graph_img_score'),
+    # and the data for the browser to draw it
+    path('graph/data/', tournament_views.graph_data, name='graph_data_score'),
     # This is the page showing the graph
     path('score_graph/', tournament_views.tournament_score_graph,
          name='tournament_score_graph'),
     path('score_graph_refresh/', tournament_views.tournament_score_graph,
          {'refresh': True}, name='tournament_score_graph_refresh'),
+    path('events/', tournament_views.tournament_events, name='tournament_events'),
     path('game_results/', tournament_views.tournament_game_results,
          name='tournament_game_results'),
     path('game_results_refresh/', tournament_views.tournament_game_results,
@@ -40,7 +40,7 @@ from tournament.models import (NO_SCORING_SYSTEM_STR, Award, CentreCount,
                                DrawProposal, Game, GameImage, GamePlayer, Pool,
                                Preference, Round, RoundPlayer, SeederBias,
                                SupplyCentreOwnership, Team, Tournament,
-                               TournamentPlayer)
+                               TournamentPlayer, deferred_score_updates)
 from tournament.players import (InvalidWDRId, Player, PlayerAward,
                                 PlayerGameResult, PlayerTournamentRanking,
                                 WDDPlayer, WDRBackground, WDRNotAccessible)
@@ -295,6 +295,7 @@ def add_bs_profile_urls(dry_run=False):
     print(f'{mismatches} mismatches detected')
 
 
+@deferred_score_updates()
 def populate_missed_years(game, dry_run=False):
     """
     For a game on Backstabbr, check for missing years and fill them in.
@@ -326,6 +327,8 @@ def populate_missed_years(game, dry_run=False):
                 game.create_or_update_sc_counts_from_ownerships(year)
             else:
                 _sc_counts_to_cc(game, year, sc_counts)
+            # Rescored once, when the deferred_score_updates() context exits
+            game.update_scores()
 
 
 # Reports - Summarise data
@@ -496,17 +499,18 @@ def fix_round_players(the_round, dry_run=False):
             if not dry_run:
                 rp.delete()
     # Check for missing RoundPlayers
-    for g in game_set.all():
-        for gp in g.gameplayer_set.all():
-            if not RoundPlayer.objects.filter(player=gp.player).exists():
-                print(f'Missing RoundPlayer {gp.player} - adding\n')
-                if not dry_run:
-                    RoundPlayer.objects.create(player=gp.player,
-                                               the_round=the_round)
-        # Trigger a score recalculation
-        print(f'Saving game {g} to trigger score recalculation\n')
-        if not dry_run:
-            g.save()
+    with deferred_score_updates():
+        for g in game_set.all():
+            for gp in g.gameplayer_set.all():
+                if not RoundPlayer.objects.filter(player=gp.player).exists():
+                    print(f'Missing RoundPlayer {gp.player} - adding\n')
+                    if not dry_run:
+                        RoundPlayer.objects.create(player=gp.player,
+                                                   the_round=the_round)
+            # Trigger a score recalculation
+            print(f'Flagging game {g} for score recalculation\n')
+            if not dry_run:
+                g.update_scores()
 
 
 def clean_best_country_awards(dry_run=False):
@@ -655,19 +659,22 @@ def clone_tournament(t):
                                        game_count=rp.game_count,
                                        sandboxer=rp.sandboxer,
                                        tournament_score=rp.tournament_score)
-        for g in r.game_set.order_by():
+        games = list(r.game_set.order_by())
+        new_games = []
+        for g in games:
             pool = None
             if g.pool:
                 pool = new_r.pool_set.get(name=g.pool.name)
-            new_g = Game.objects.create(name=g.name,
-                                        started_at=g.started_at,
-                                        is_finished=g.is_finished,
-                                        is_top_board=g.is_top_board,
-                                        the_round=new_r,
-                                        pool=pool,
-                                        the_set=g.the_set,
-                                        external_url=g.external_url,
-                                        notes=g.notes)
+            new_games.append(Game(name=g.name,
+                                  started_at=g.started_at,
+                                  is_finished=g.is_finished,
+                                  is_top_board=g.is_top_board,
+                                  the_round=new_r,
+                                  pool=pool,
+                                  the_set=g.the_set,
+                                  external_url=g.external_url,
+                                  notes=g.notes))
+        for g, new_g in zip(games, Game.objects.bulk_create_games(new_games)):
             for gp in g.gameplayer_set.order_by():
                 GamePlayer.objects.create(player=gp.player,
                                           game=new_g,
@@ -675,7 +682,9 @@ def clone_tournament(t):
                                           tie_break_rank=gp.tie_break_rank,
                                           score=gp.score,
                                           score_dropped=gp.score_dropped,
-                                          after_action_report=gp.after_action_report)
+                                          after_action_report=gp.after_action_report,
+                                          final_scs=gp.final_scs,
+                                          year_eliminated=gp.year_eliminated)
             for dp in g.drawproposal_set.order_by():
                 new_dp = DrawProposal.objects.create(game=new_g,
                                                      year=dp.year,
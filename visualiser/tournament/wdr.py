@@ -24,7 +24,7 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 
-from tournament.diplomacy import GreatPower
+from tournament.diplomacy import reference_data
 
 
 WDR_NETLOC = 'www.world-diplomacy-reference.com'
@@ -78,17 +78,15 @@ def wdr_tournament_as_json(wdr_tournament_id):
     return page.json()
 
 
-_GPCache = {}
+_WDR_POWER_ABBREVIATIONS = {"Austria": "A",
+                            "England": "E",
+                            "France": "F",
+                            "Germany": "G",
+                            "Italy": "I",
+                            "Russia": "R",
+                            "Turkey": "T"}
 
 
 def wdr_power_name_to_greatpower(name):
     """Map a WDR power name to a GreatPower object"""
-    if len(_GPCache) == 0:
-        _GPCache["Austria"] = GreatPower.objects.get(abbreviation="A")
-        _GPCache["England"] = GreatPower.objects.get(abbreviation="E")
-        _GPCache["France"] = GreatPower.objects.get(abbreviation="F")
-        _GPCache["Germany"] = GreatPower.objects.get(abbreviation="G")
-        _GPCache["Italy"] = GreatPower.objects.get(abbreviation="I")
-        _GPCache["Russia"] = GreatPower.objects.get(abbreviation="R")
-        _GPCache["Turkey"] = GreatPower.objects.get(abbreviation="T")
-    return _GPCache[name]
+    return reference_data.great_power(abbreviation=_WDR_POWER_ABBREVIATIONS[name])
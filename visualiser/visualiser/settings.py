@@ -19,6 +19,33 @@ BASE_DIR = Path(__file__).resolve(strict=True).parents[1]
 # consider conforming to https://foundation.wikimedia.org/wiki/Policy:Wikimedia_Foundation_User-Agent_Policy
 USER_AGENT = 'DipvisBot/0.0 (https://github.com/UEWBot/dipvis/; user@example.com)'
 
+# Game seeding
+# Seeding method - 'BOARD', or 'ANNEAL' for simulated annealing,
+# which uses all of SEEDER_TIME_LIMIT (or SEEDER_ITERATIONS swaps, with no time limit)
+SEEDER_METHOD = 'BOARD'
+# Number of independent seedings to try for each round, keeping the best
+SEEDER_STARTS = 10
+# Number of processes to spread those seedings over
+SEEDER_WORKERS = 1
+# Maximum time to spend seeding a round, in seconds (None for no limit)
+SEEDER_TIME_LIMIT = None
+# Number of swaps to try when ANNEAL seeding with no time limit
+SEEDER_ITERATIONS = 100000
+# Number of threads to seed rounds in the background (0 to seed while the TD waits)
+SEEDING_JOB_WORKERS = 0
+# Seconds without progress after which a seeding job is assumed to have died
+SEEDING_JOB_TIMEOUT = 3600
+
+# Display screens
+# Push changes to self-refreshing pages with server-sent events, rather than
+# reloading them on a timer. Needs the site to be served via ASGI
+LIVE_UPDATES = False
+# Rendered graphs are kept in the default cache, which is per-process unless CACHES says otherwise.
+# Number of threads to draw graphs in the background as soon as their data changes (0 to draw them when first asked for)
+GRAPH_PRERENDER_WORKERS = 0
+# Have the browser draw graphs from their data, rather than showing images drawn on the server
+DRAW_GRAPHS_IN_BROWSER = False
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/1.6/howto/deployment/checklist/
 